@@ -7,7 +7,8 @@ replacing them with proper English equivalents.
 """
 
 import json
-import re
+
+from vocab_normalize import character_normalizer
 
 def clean_characters(text):
     """
@@ -19,51 +20,7 @@ def clean_characters(text):
     Returns:
         Cleaned string with proper English characters
     """
-    if not isinstance(text, str):
-        return text
-    
-    # Character mappings for common encoding issues
-    char_replacements = {
-        'Õ': "'",      # Curly apostrophe/single quote
-        'Ó': '"',      # Opening double quote  
-        'Ò': '"',      # Closing double quote
-        'Þ': 'fi',     # Ligature for 'fi'
-        'ß': 'fl',     # Ligature for 'fl'
-        'È': 'A',      # Accented A
-        'É': 'E',      # Accented E
-        'Í': 'I',      # Accented I
-        'Ñ': '-',      # En dash
-        'Ð': '-',      # Em dash
-        '¥': 'Y',      # Yen symbol used as Y
-        '†': '+',      # Dagger symbol
-        '‡': '++',     # Double dagger
-        '…': '...',    # Ellipsis
-        '•': '*',      # Bullet point
-        '‚': ',',      # Single low quote
-        '„': '"',      # Double low quote
-        ''': "'",      # Left single quote
-        ''': "'",      # Right single quote
-        '"': '"',      # Left double quote
-        '"': '"',      # Right double quote
-        '–': '-',      # En dash
-        '—': '-',      # Em dash
-        '©': '(c)',    # Copyright
-        '®': '(r)',    # Registered
-        '™': '(tm)',   # Trademark
-    }
-    
-    # Apply character replacements
-    for old_char, new_char in char_replacements.items():
-        text = text.replace(old_char, new_char)
-    
-    # Handle any remaining non-ASCII characters
-    # Replace with closest ASCII equivalent or remove
-    text = re.sub(r'[^\x00-\x7F]+', '', text)
-    
-    # Clean up any double spaces that might have been created
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    return character_normalizer.clean(text)
 
 def clean_vocabulary_file(input_file, output_file):
     """
@@ -1,10 +1,6 @@
 import json
-import re
 
-def remove_greek_letters(text):
-    # Greek letters range: \u0370 to \u03FF and \u1F00 to \u1FFF for extended
-    greek_pattern = re.compile(r'[\u0370-\u03FF\u1F00-\u1FFF]')
-    return greek_pattern.sub('', text)
+from vocab_normalize import remove_greek_letters
 
 def clean_vocab_file(input_path, output_path):
     with open(input_path, 'r') as f:
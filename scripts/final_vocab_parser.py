@@ -2,39 +2,37 @@
 
 import json
 import re
+import shutil
+import tempfile
 from collections import defaultdict
+from functools import lru_cache
 
-def parse_sat_vocabulary():
+from vocab_stream import JsonArrayWriter, iter_page_lines, iter_pages
+
+def parse_sat_vocabulary(input_file='extracted_text.json'):
     """Parse SAT vocabulary from extracted PDF text."""
+    return list(iter_sat_vocabulary(input_file))
+
+def iter_sat_vocabulary(input_file='extracted_text.json'):
+    """Yield SAT vocabulary entries as the extracted pages are streamed in."""
     
-    # Load extracted text
-    with open('extracted_text.json', 'r', encoding='utf-8') as f:
-        text_data = json.load(f)
-    
-    # Combine all text
-    full_text = ""
-    for page in text_data:
-        full_text += page['text'] + "\n"
-    
-    # Split into lines and clean
-    lines = [line.strip() for line in full_text.split('\n') if line.strip()]
+    # Stream lines page by page instead of combining all text
+    lines = (line.strip() for _, line in iter_page_lines(iter_pages(input_file)))
     
     # Parse vocabulary entries
-    entries = []
     current_word = None
     current_pos = None
     current_definition = None
     current_example = None
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for line in lines:
+        if not line:
+            continue
         
         # Skip headers and single letters
         if ('SAT Vocabulary' in line or 
             line in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ' or 
             len(line) <= 2):
-            i += 1
             continue
         
         # Check if this is a word entry (single word, lowercase)
@@ -42,21 +40,9 @@ def parse_sat_vocabulary():
             len(line.split()) <= 2 and 
             len(line) >= 3):
             
-            # Save previous entry if complete
+            # Emit previous entry if complete
             if current_word and current_definition:
-                entries.append({
-                    'word': current_word,
-                    'part_of_speech': normalize_pos(current_pos or 'unknown'),
-                    'definition': clean_definition(current_definition),
-                    'example': clean_example(current_example or ''),
-                    'difficulty': assess_difficulty(current_word, current_definition or ''),
-                    'category': categorize_word(current_word, current_definition or ''),
-                    'word_length': len(current_word),
-                    'syllable_count': count_syllables(current_word),
-                    'etymology': guess_etymology(current_word),
-                    'memory_aid': create_memory_aid(current_word),
-                    'learning_tips': generate_learning_tips(current_word, current_definition or '')
-                })
+                yield build_entry(current_word, current_pos, current_definition, current_example)
             
             # Start new entry
             current_word = line.lower().strip()
@@ -81,26 +67,29 @@ def parse_sat_vocabulary():
             # If no definition yet and this looks like one
             elif not current_definition and len(line) > 10 and not line.startswith('('):
                 current_definition = line
-        
-        i += 1
     
     # Don't forget the last entry
     if current_word and current_definition:
-        entries.append({
-            'word': current_word,
-            'part_of_speech': normalize_pos(current_pos or 'unknown'),
-            'definition': clean_definition(current_definition),
-            'example': clean_example(current_example or ''),
-            'difficulty': assess_difficulty(current_word, current_definition or ''),
-            'category': categorize_word(current_word, current_definition or ''),
-            'word_length': len(current_word),
-            'syllable_count': count_syllables(current_word),
-            'etymology': guess_etymology(current_word),
-            'memory_aid': create_memory_aid(current_word),
-            'learning_tips': generate_learning_tips(current_word, current_definition or '')
-        })
-    
-    return entries
+        yield build_entry(current_word, current_pos, current_definition, current_example)
+
+def build_entry(word, pos, definition, example):
+    """Assemble a complete vocabulary entry."""
+    features = word_features(word)
+    # Lowercase the word and definition once for both the difficulty and category scans
+    text = (word + ' ' + definition).lower() if definition else ''
+    return {
+        'word': word,
+        'part_of_speech': normalize_pos(pos or 'unknown'),
+        'definition': clean_definition(definition),
+        'example': clean_example(example or ''),
+        'difficulty': difficulty_level(features.word_score + definition_score(text)),
+        'category': categorize_text(text),
+        'word_length': features.length,
+        'syllable_count': features.syllables,
+        'etymology': features.etymology,
+        'memory_aid': features.memory_aid,
+        'learning_tips': list(features.learning_tips)
+    }
 
 def clean_definition(definition):
     """Clean up definition text."""
@@ -408,8 +397,8 @@ def clean_definition(definition):
     if not definition:
         return ""
     
-    definition = re.sub(r'\s+', ' ', definition).strip()
-    definition = re.sub(r'\([nvadj.]+\)', '', definition).strip()
+    definition = WHITESPACE.sub(' ', definition).strip()
+    definition = POS_MARKER.sub('', definition).strip()
     
     # Remove any leading/trailing punctuation artifacts
     definition = definition.strip('.,;:')
@@ -420,22 +409,79 @@ def clean_example(example):
     """Clean up example text."""
     if not example:
         return ""
-    return re.sub(r'\s+', ' ', example).strip()
+    return WHITESPACE.sub(' ', example).strip()
 
 def normalize_pos(pos_str):
     """Normalize part of speech."""
-    mapping = {
-        'v.': 'verb',
-        'n.': 'noun',
-        'adj.': 'adjective',
-        'adv.': 'adverb'
-    }
-    return mapping.get(pos_str.lower(), 'unknown')
+    return POS_NAMES.get(pos_str.lower(), 'unknown')
+
+# Cleaning patterns and part-of-speech names, built once rather than per entry
+WHITESPACE = re.compile(r'\s+')
+POS_MARKER = re.compile(r'\([nvadj.]+\)')
+POS_NAMES = {
+    'v.': 'verb',
+    'n.': 'noun',
+    'adj.': 'adjective',
+    'adv.': 'adverb'
+}
+
+# Morphology and scoring tables shared by the feature extractor and scorers
+VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+VOWEL_SPLIT = re.compile(r'([aeiouy]+)')
+COMPLEX_ENDINGS = ('tion', 'sion', 'ous', 'ious', 'eous', 'ance', 'ence', 'ment', 'ity')
+COMPLEX_PREFIXES = ('circum', 'contra', 'extra', 'inter', 'super', 'trans')
+HARD_DEFINITION_WORDS = ('complex', 'intricate', 'sophisticated', 'profound', 'arcane', 'esoteric')
+EASY_DEFINITION_WORDS = ('simple', 'basic', 'common', 'clear', 'plain')
+COMMON_SAT_WORDS = frozenset(['analyze', 'assess', 'compare', 'contrast', 'define', 'evaluate', 'identify', 'interpret'])
+LATIN_SUFFIXES = ('tion', 'sion', 'ous', 'ious', 'ic', 'ity', 'ate')
+GREEK_ROOTS = ('graph', 'phon', 'log', 'psych', 'phil', 'soph')
+FRENCH_SUFFIXES = ('ance', 'ence', 'ment', 'age')
+GERMANIC_SUFFIXES = ('ness', 'ful', 'less', 'ship')
+CONFUSIONS = {
+    'affect': 'effect', 'illicit': 'elicit', 'allusion': 'illusion',
+    'compliment': 'complement', 'discrete': 'discreet'
+}
+
+# Category keywords, in priority order, compiled to one alternation per category
+CATEGORY_KEYWORDS = [
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in [
+        ('emotions_psychology', ['feel', 'emotion', 'mood', 'happy', 'sad', 'angry', 'fear', 'love', 'joy', 'passion', 'delight']),
+        ('cognition_intellect', ['think', 'mind', 'reason', 'logic', 'understand', 'analyze', 'consider', 'wisdom']),
+        ('social_relationships', ['social', 'people', 'friend', 'group', 'community', 'society', 'relationship']),
+        ('actions_behavior', ['do', 'make', 'act', 'perform', 'create', 'build', 'move', 'go', 'come']),
+        ('appearance_aesthetics', ['beautiful', 'ugly', 'look', 'attractive', 'elegant', 'aesthetic', 'artistic']),
+        ('morality_ethics', ['good', 'evil', 'right', 'wrong', 'virtue', 'moral', 'ethical', 'honest']),
+    ]
+]
+
+class WordFeatures:
+    """Word-level features computed once and shared by scoring and learning aids."""
+    
+    __slots__ = ('word', 'length', 'syllables', 'syllable_split', 'etymology',
+                 'complex_ending', 'complex_prefix', 'memory_aid', 'word_score', 'learning_tips')
+    
+    def __init__(self, word):
+        self.word = word
+        self.length = len(word)
+        self.syllables = count_syllables(word)
+        self.syllable_split = split_syllables(word)
+        self.etymology = guess_etymology(word)
+        self.complex_ending = word.endswith(COMPLEX_ENDINGS)
+        self.complex_prefix = word.startswith(COMPLEX_PREFIXES)
+        self.memory_aid = create_memory_aid(word)
+        self.word_score = word_score(word, self)
+        self.learning_tips = tuple(generate_learning_tips(word, '', self))
+
+@lru_cache(maxsize=65536)
+def word_features(word):
+    """Return the (memoized) features of a word."""
+    return WordFeatures(word)
 
 def count_syllables(word):
     """Count syllables in word."""
     word = word.lower().replace(' ', '')
-    vowel_groups = len(re.findall(r'[aeiouy]+', word))
+    vowel_groups = len(VOWEL_GROUPS.findall(word))
     
     # Adjust for silent e
     if word.endswith('e') and vowel_groups > 1:
@@ -448,45 +494,49 @@ def count_syllables(word):
     
     return max(1, vowel_groups)
 
-def assess_difficulty(word, definition):
+def assess_difficulty(word, definition, features=None):
     """Assess difficulty level."""
+    features = features or word_features(word)
+    text = (word + ' ' + definition).lower() if definition else ''
+    return difficulty_level(features.word_score + definition_score(text))
+
+def word_score(word, features):
+    """Difficulty points that depend only on the word."""
     score = 0
     
     # Length scoring
-    length = len(word)
+    length = features.length
     if length >= 12: score += 4
     elif length >= 9: score += 3  
     elif length >= 7: score += 2
     elif length >= 5: score += 1
     
     # Syllable scoring
-    syllables = count_syllables(word)
-    score += max(0, syllables - 2)
+    score += max(0, features.syllables - 2)
     
     # Morphological complexity
-    complex_endings = ['tion', 'sion', 'ous', 'ious', 'eous', 'ance', 'ence', 'ment', 'ity']
-    if any(word.endswith(ending) for ending in complex_endings):
+    if features.complex_ending:
         score += 2
         
-    complex_prefixes = ['circum', 'contra', 'extra', 'inter', 'super', 'trans']
-    if any(word.startswith(prefix) for prefix in complex_prefixes):
+    if features.complex_prefix:
         score += 1
     
-    # Definition complexity
-    if definition:
-        text = (word + ' ' + definition).lower()
-        hard_words = ['complex', 'intricate', 'sophisticated', 'profound', 'arcane', 'esoteric']
-        easy_words = ['simple', 'basic', 'common', 'clear', 'plain']
-        
-        score += sum(2 for hw in hard_words if hw in text)
-        score -= sum(1 for ew in easy_words if ew in text)
-    
     # Common SAT words are easier
-    common_sat = ['analyze', 'assess', 'compare', 'contrast', 'define', 'evaluate', 'identify', 'interpret']
-    if word in common_sat:
+    if word in COMMON_SAT_WORDS:
         score -= 2
     
-    # Return difficulty
+    return score
+
+def definition_score(text):
+    """Difficulty points for the lowercased word and definition text."""
+    if not text:
+        return 0
+    score = sum(2 for hw in HARD_DEFINITION_WORDS if hw in text)
+    score -= sum(1 for ew in EASY_DEFINITION_WORDS if ew in text)
+    return score
+
+def difficulty_level(score):
+    """Map a difficulty score to its level."""
     if score >= 8: return 'hard'
     elif score >= 4: return 'medium'
     else: return 'easy'
@@ -495,42 +545,26 @@ def categorize_word(word, definition):
     """Categorize by semantic meaning."""
     if not definition:
         return 'general'
-    
-    text = (word + ' ' + definition).lower()
-    
-    # Category keywords
-    emotion_words = ['feel', 'emotion', 'mood', 'happy', 'sad', 'angry', 'fear', 'love', 'joy', 'passion', 'delight']
-    thinking_words = ['think', 'mind', 'reason', 'logic', 'understand', 'analyze', 'consider', 'wisdom']
-    social_words = ['social', 'people', 'friend', 'group', 'community', 'society', 'relationship']
-    action_words = ['do', 'make', 'act', 'perform', 'create', 'build', 'move', 'go', 'come']
-    appearance_words = ['beautiful', 'ugly', 'look', 'attractive', 'elegant', 'aesthetic', 'artistic']
-    moral_words = ['good', 'evil', 'right', 'wrong', 'virtue', 'moral', 'ethical', 'honest']
-    
-    if any(word in text for word in emotion_words):
-        return 'emotions_psychology'
-    elif any(word in text for word in thinking_words):
-        return 'cognition_intellect'
-    elif any(word in text for word in social_words):
-        return 'social_relationships'
-    elif any(word in text for word in action_words):
-        return 'actions_behavior'
-    elif any(word in text for word in appearance_words):
-        return 'appearance_aesthetics'
-    elif any(word in text for word in moral_words):
-        return 'morality_ethics'
-    else:
-        return 'general'
+    return categorize_text((word + ' ' + definition).lower())
+
+def categorize_text(text):
+    """Categorize lowercased word and definition text."""
+    # First category with any keyword in the text wins
+    for category, keywords in CATEGORY_KEYWORDS:
+        if keywords.search(text):
+            return category
+    return 'general'
 
 def guess_etymology(word):
     """Guess word etymology."""
     # Common patterns
-    if any(word.endswith(suffix) for suffix in ['tion', 'sion', 'ous', 'ious', 'ic', 'ity', 'ate']):
+    if word.endswith(LATIN_SUFFIXES):
         return 'Latin'
-    elif any(pattern in word for pattern in ['graph', 'phon', 'log', 'psych', 'phil', 'soph']):
+    elif any(pattern in word for pattern in GREEK_ROOTS):
         return 'Greek'
-    elif any(word.endswith(suffix) for suffix in ['ance', 'ence', 'ment', 'age']):
+    elif word.endswith(FRENCH_SUFFIXES):
         return 'French'
-    elif any(word.endswith(suffix) for suffix in ['ness', 'ful', 'less', 'ship']):
+    elif word.endswith(GERMANIC_SUFFIXES):
         return 'Germanic'
     else:
         return 'Mixed/Unknown'
@@ -552,39 +586,36 @@ def create_memory_aid(word):
     elif word.startswith('trans'): return "TRANS- = across"
     else: return f"Break down '{word}' into parts"
 
-def generate_learning_tips(word, definition):
+def generate_learning_tips(word, definition, features=None):
     """Generate learning tips."""
+    features = features or word_features(word)
     tips = []
     
     # Syllable tip for long words
-    if count_syllables(word) >= 4:
-        tips.append(f"Break into syllables: {'-'.join(split_syllables(word))}")
+    if features.syllables >= 4:
+        tips.append(f"Break into syllables: {'-'.join(features.syllable_split)}")
     
     # Etymology tip
-    etymology = guess_etymology(word)
+    etymology = features.etymology
     if etymology != 'Mixed/Unknown':
         tips.append(f"Has {etymology} origins")
     
     # Common confusion warning
-    confusions = {
-        'affect': 'effect', 'illicit': 'elicit', 'allusion': 'illusion',
-        'compliment': 'complement', 'discrete': 'discreet'
-    }
-    if word in confusions:
-        tips.append(f"Don't confuse with '{confusions[word]}'")
+    if word in CONFUSIONS:
+        tips.append(f"Don't confuse with '{CONFUSIONS[word]}'")
     
     return tips[:3]  # Max 3 tips
 
 def split_syllables(word):
     """Basic syllable splitting for learning aid."""
     # Simple approach - split on vowel groups
-    parts = re.split(r'([aeiouy]+)', word.lower())
+    parts = VOWEL_SPLIT.split(word.lower())
     syllables = []
     current = ""
     
-    for part in parts:
+    for index, part in enumerate(parts):
         current += part
-        if re.search(r'[aeiouy]', part):  # If contains vowel
+        if index % 2:  # Odd parts are the captured vowel groups
             syllables.append(current)
             current = ""
     
@@ -600,60 +631,75 @@ def split_syllables(word):
 if __name__ == "__main__":
     print("Parsing SAT vocabulary from PDF...")
     
-    entries = parse_sat_vocabulary()
-    
-    print(f"Successfully parsed {len(entries)} vocabulary entries")
-    
     # Create comprehensive output
     difficulty_dist = defaultdict(int)
     category_dist = defaultdict(int)
     pos_dist = defaultdict(int)
-    
-    for entry in entries:
-        difficulty_dist[entry['difficulty']] += 1
-        category_dist[entry['category']] += 1
-        pos_dist[entry['part_of_speech']] += 1
-    
-    # Final output structure
-    final_output = {
-        "metadata": {
-            "title": "SAT Vocabulary - Complete Educational Dataset",
-            "description": "Comprehensive SAT vocabulary list with difficulty assessment, categorization, and learning aids for educational platforms",
-            "version": "1.0",
-            "source": "SAT Vocabulary Full PDF - 1000 Most Common SAT Words",
-            "total_entries": len(entries),
-            "created_for": "Educational learning platform",
-            "features_included": [
-                "difficulty_assessment", "semantic_categorization", "etymology_analysis",
-                "memory_aids", "learning_tips", "syllable_breakdown", "part_of_speech",
-                "example_sentences", "word_length_analysis"
-            ],
-            "difficulty_system": {
-                "easy": "Short words (≤6 chars), simple concepts, common usage",
-                "medium": "Moderate length (7-9 chars), academic terms, some complexity", 
-                "hard": "Long words (≥10 chars), complex concepts, specialized usage"
+    total_entries = 0
+    total_word_length = 0
+    total_syllables = 0
+    
+    # Entries are spooled to disk as they are parsed, so only the statistics
+    # stay in memory until the final document is assembled
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as spool:
+        vocabulary_writer = JsonArrayWriter(spool, depth=1)
+        
+        for entry in iter_sat_vocabulary():
+            vocabulary_writer.write(entry)
+            total_entries += 1
+            total_word_length += entry['word_length']
+            total_syllables += entry['syllable_count']
+            difficulty_dist[entry['difficulty']] += 1
+            category_dist[entry['category']] += 1
+            pos_dist[entry['part_of_speech']] += 1
+        
+        vocabulary_writer.close()
+        
+        print(f"Successfully parsed {total_entries} vocabulary entries")
+        
+        # Final output structure
+        final_output = {
+            "metadata": {
+                "title": "SAT Vocabulary - Complete Educational Dataset",
+                "description": "Comprehensive SAT vocabulary list with difficulty assessment, categorization, and learning aids for educational platforms",
+                "version": "1.0",
+                "source": "SAT Vocabulary Full PDF - 1000 Most Common SAT Words",
+                "total_entries": total_entries,
+                "created_for": "Educational learning platform",
+                "features_included": [
+                    "difficulty_assessment", "semantic_categorization", "etymology_analysis",
+                    "memory_aids", "learning_tips", "syllable_breakdown", "part_of_speech",
+                    "example_sentences", "word_length_analysis"
+                ],
+                "difficulty_system": {
+                    "easy": "Short words (≤6 chars), simple concepts, common usage",
+                    "medium": "Moderate length (7-9 chars), academic terms, some complexity", 
+                    "hard": "Long words (≥10 chars), complex concepts, specialized usage"
+                }
+            },
+            "statistics": {
+                "total_words": total_entries,
+                "difficulty_distribution": dict(difficulty_dist),
+                "category_distribution": dict(category_dist),
+                "part_of_speech_distribution": dict(pos_dist),
+                "average_word_length": round(total_word_length / total_entries, 1),
+                "average_syllable_count": round(total_syllables / total_entries, 1)
             }
-        },
-        "statistics": {
-            "total_words": len(entries),
-            "difficulty_distribution": dict(difficulty_dist),
-            "category_distribution": dict(category_dist),
-            "part_of_speech_distribution": dict(pos_dist),
-            "average_word_length": round(sum(entry['word_length'] for entry in entries) / len(entries), 1),
-            "average_syllable_count": round(sum(entry['syllable_count'] for entry in entries) / len(entries), 1)
-        },
-        "vocabulary": entries
-    }
-    
-    # Save to JSON file
-    with open('sat_vocabulary_educational.json', 'w', encoding='utf-8') as f:
-        json.dump(final_output, f, indent=2, ensure_ascii=False)
+        }
+        
+        # Save to JSON file, appending the spooled vocabulary array
+        header = json.dumps(final_output, indent=2, ensure_ascii=False)
+        spool.seek(0)
+        with open('sat_vocabulary_educational.json', 'w', encoding='utf-8') as f:
+            f.write(header[:-2] + ',\n  "vocabulary": ')
+            shutil.copyfileobj(spool, f)
+            f.write('\n}')
     
     # Print summary
     print("\n" + "="*50)
     print("SAT VOCABULARY PROCESSING COMPLETE")
     print("="*50)
-    print(f"📚 Total vocabulary entries: {len(entries)}")
+    print(f"📚 Total vocabulary entries: {total_entries}")
     print(f"📊 Difficulty breakdown:")
     print(f"   • Easy: {difficulty_dist['easy']} words")
     print(f"   • Medium: {difficulty_dist['medium']} words") 
@@ -6,36 +6,52 @@ This script parses the extracted text from SAT vocabulary and generates a struct
 containing words, their definitions, and examples.
 """
 
+import argparse
 import json
 import re
-from typing import List, Dict, Any, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
 
-def parse_vocabulary_data(input_file: str, output_file: str) -> None:
+import vocab_normalize
+from vocab_cache import LRUCache, content_hash, source_version
+from vocab_normalize import parser_normalizer
+from vocab_stream import iter_pages
+from vocab_tokenizer import RawEntry, tokenize_page
+
+DEFAULT_CACHE_FILE = 'sat_vocab_parser.cache.json'
+
+# Changes whenever the parsing or cleaning code changes, invalidating cached pages
+PARSER_VERSION = source_version([__file__, tokenize_page.__code__.co_filename, vocab_normalize.__file__])
+
+class ParsedPage(NamedTuple):
+    """Entries parsed from one page plus the unparsed text at either end."""
+    page: int
+    entries: List[Dict[str, Any]]
+    head: str  # text before the first entry, possibly the end of a straddling entry
+    tail: str  # text after the last entry, possibly the start of a straddling entry
+
+def parse_vocabulary_data(input_file: str, output_file: str, workers: int = 1,
+                          cache_file: Optional[str] = None, cache_size: int = 10000) -> None:
     """
     Parse vocabulary data from extracted text and generate structured JSON.
     
     Args:
         input_file: Path to the input JSON file containing extracted text
         output_file: Path to the output JSON file to write structured vocabulary
+        workers: Number of worker processes used to parse pages
+        cache_file: Optional path of a page cache so unchanged pages are not reparsed
+        cache_size: Maximum number of pages kept in the cache
     """
     
-    # Load the extracted text data
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    cache = LRUCache(cache_file, max_entries=cache_size) if cache_file else None
     
-    vocabulary_list = []
+    # Stream the extracted text one page at a time
+    vocabulary_list = collect_vocabulary(iter_pages(input_file), workers, cache)
     
-    for page_data in data:
-        text = page_data.get('text', '')
-        page_number = page_data.get('page', 0)
-        
-        # Extract vocabulary entries from this page
-        entries = extract_vocabulary_entries(text)
-        
-        for entry in entries:
-            if entry:  # Only add non-empty entries
-                entry['page'] = page_number
-                vocabulary_list.append(entry)
+    if cache is not None:
+        cache.save()
+        print(cache.stats_line('Page cache'))
     
     # Remove duplicates based on word
     unique_vocab = []
@@ -57,6 +73,168 @@ def parse_vocabulary_data(input_file: str, output_file: str) -> None:
     print(f"Successfully parsed {len(unique_vocab)} vocabulary words")
     print(f"Output written to: {output_file}")
 
+def collect_vocabulary(pages: Iterable[Dict[str, Any]], workers: int = 1,
+                       cache: Optional[LRUCache] = None) -> List[Dict[str, Any]]:
+    """
+    Parse pages, optionally in a process pool, and stitch entries across page breaks.
+    
+    Pages are merged strictly in input order, so the result is identical for
+    any number of workers.
+    
+    Args:
+        pages: Page dicts with 'page' and 'text' keys
+        workers: Number of worker processes (1 parses in this process)
+        cache: Optional cache of previously parsed pages, updated in place
+        
+    Returns:
+        List of vocabulary entry dictionaries in page order
+    """
+    vocabulary_list = []
+    previous = None
+    lookup = (lambda page_data: cached_page(cache, page_data)) if cache is not None else None
+    
+    for page_data, parsed, from_cache in map_pages(parse_page, pages, workers, lookup=lookup):
+        if cache is not None and not from_cache:
+            cache.put(page_cache_key(page_data.get('text', '')), page_to_cache(parsed))
+        
+        # Recover entries that start on the previous page and end on this one
+        if previous is not None:
+            vocabulary_list.extend(stitch_pages(previous, parsed))
+        vocabulary_list.extend(parsed.entries)
+        previous = parsed
+    
+    return vocabulary_list
+
+def page_cache_key(text: str) -> str:
+    """Cache key for a page: its text hash combined with the parser version."""
+    return content_hash(PARSER_VERSION, text)
+
+def page_to_cache(parsed: ParsedPage) -> Dict[str, Any]:
+    """Serialize a parsed page without its page number, which is not part of the key."""
+    return {
+        'entries': [{k: v for k, v in entry.items() if k != 'page'} for entry in parsed.entries],
+        'head': parsed.head,
+        'tail': parsed.tail
+    }
+
+def cached_page(cache: LRUCache, page_data: Dict[str, Any]) -> Optional[ParsedPage]:
+    """Rebuild a ParsedPage from the cache, or return None on a miss."""
+    cached = cache.get(page_cache_key(page_data.get('text', '')))
+    if cached is None:
+        return None
+    
+    page_number = page_data.get('page', 0)
+    entries = [dict(entry, page=page_number) for entry in cached['entries']]
+    return ParsedPage(page_number, entries, cached['head'], cached['tail'])
+
+def map_pages(func: Callable, pages: Iterable[Dict[str, Any]], workers: int,
+              chunk_size: int = 16,
+              lookup: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Iterator[Tuple[Dict[str, Any], Any, bool]]:
+    """
+    Apply func to every page, in order, using up to ``workers`` processes.
+    
+    Pages are sent to workers in chunks to amortize inter-process overhead,
+    and only a bounded window of chunks is in flight at once so that
+    streamed input is never fully materialized. When ``lookup`` returns a
+    result for a page, func is skipped for it.
+    
+    Yields:
+        (page_data, result, from_lookup) tuples in input order
+    """
+    def resolve(page_data):
+        found = lookup(page_data) if lookup else None
+        return page_data, found
+    
+    if workers <= 1:
+        for page_data, found in map(resolve, pages):
+            if found is not None:
+                yield page_data, found, True
+            else:
+                yield page_data, func(page_data), False
+        return
+    
+    def collect(chunk, future):
+        computed = iter(future.result() if future else [])
+        for page_data, found in chunk:
+            if found is not None:
+                yield page_data, found, True
+            else:
+                yield page_data, next(computed), False
+    
+    def submit(chunk):
+        misses = [page_data for page_data, found in chunk if found is None]
+        future = executor.submit(_map_chunk, func, misses) if misses else None
+        return chunk, future
+    
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        chunk = []
+        for item in map(resolve, pages):
+            chunk.append(item)
+            if len(chunk) < chunk_size:
+                continue
+            pending.append(submit(chunk))
+            chunk = []
+            if len(pending) >= window:
+                yield from collect(*pending.popleft())
+        if chunk:
+            pending.append(submit(chunk))
+        while pending:
+            yield from collect(*pending.popleft())
+
+def _map_chunk(func: Callable, chunk: List[Dict[str, Any]]) -> List[Any]:
+    """Worker-side helper for map_pages."""
+    return [func(page_data) for page_data in chunk]
+
+def parse_page(page_data: Dict[str, Any]) -> ParsedPage:
+    """
+    Parse a single page, keeping the boundary text needed for stitching.
+    
+    Args:
+        page_data: Page dict with 'page' and 'text' keys
+        
+    Returns:
+        ParsedPage with the page's entries and its head and tail fragments
+    """
+    text = page_data.get('text', '')
+    page_number = page_data.get('page', 0)
+    
+    entries = []
+    first_start = len(text)
+    last_end = 0
+    
+    for raw in tokenize_page(text, page_number, min_example_length=20):
+        first_start = min(first_start, raw.start)
+        last_end = raw.end
+        entry = build_entry(raw)
+        if entry:  # Only add valid entries
+            entries.append(entry)
+    
+    if not last_end:
+        # Nothing parsed; the whole page may belong to a straddling entry
+        return ParsedPage(page_number, entries, text, text)
+    
+    return ParsedPage(page_number, entries, text[:first_start], text[last_end:])
+
+def stitch_pages(previous: ParsedPage, current: ParsedPage) -> List[Dict[str, Any]]:
+    """
+    Parse the text spanning a page break.
+    
+    Entries are attributed to the page their headword appears on.
+    """
+    fragment = previous.tail + '\n' + current.head
+    entries = []
+    
+    for raw in tokenize_page(fragment, previous.page, min_example_length=20):
+        entry = build_entry(raw)
+        if entry:
+            if raw.start >= len(previous.tail):
+                entry['page'] = current.page
+            entries.append(entry)
+    
+    return entries
+
 def extract_vocabulary_entries(text: str) -> List[Dict[str, Any]]:
     """
     Extract vocabulary entries from a text block.
@@ -69,36 +247,48 @@ def extract_vocabulary_entries(text: str) -> List[Dict[str, Any]]:
     """
     entries = []
     
-    # More precise pattern to match vocabulary entries
-    # Look for: newline + single word + newline + (part_of_speech) + newline + definition + (example)
-    pattern = r'\n([a-z]+)\s*\n\s*(\([^)]+\))\s*\n\s*([^(]+?)\s*(\([^)]{20,}\))'
-    
-    matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL | re.IGNORECASE)
-    
-    for match in matches:
-        word = match.group(1).strip()
-        part_of_speech = match.group(2).strip()
-        definition = match.group(3).strip()
-        example = match.group(4).strip()
-        
-        # Clean up the extracted parts
-        word = clean_word(word)
-        part_of_speech = clean_part_of_speech(part_of_speech)
-        definition = clean_definition(definition)
-        example = clean_example(example)
-        
-        # Validate that this looks like a real vocabulary entry
-        if is_valid_entry(word, part_of_speech, definition, example):
-            entry = {
-                'word': word,
-                'part_of_speech': part_of_speech,
-                'definition': definition,
-                'example': example
-            }
+    # Walk the page once: newline + single word + newline + (part_of_speech) + newline + definition + (example)
+    for raw in tokenize_page(text, min_example_length=20):
+        entry = build_entry(raw)
+        if entry:
+            del entry['page']
             entries.append(entry)
     
     return entries
 
+def build_entry(raw: RawEntry) -> Optional[Dict[str, Any]]:
+    """
+    Clean a raw tokenizer record and return it as an entry if it is valid.
+    
+    Args:
+        raw: Record emitted by the tokenizer
+        
+    Returns:
+        Vocabulary entry dictionary, or None if the record is not a real entry
+    """
+    word = raw.word.strip()
+    part_of_speech = raw.part_of_speech.strip()
+    definition = raw.definition.strip()
+    example = raw.example.strip()
+    
+    # Clean up the extracted parts
+    word = clean_word(word)
+    part_of_speech = clean_part_of_speech(part_of_speech)
+    definition = clean_definition(definition)
+    example = clean_example(example)
+    
+    # Validate that this looks like a real vocabulary entry
+    if not is_valid_entry(word, part_of_speech, definition, example):
+        return None
+    
+    return {
+        'word': word,
+        'part_of_speech': part_of_speech,
+        'definition': definition,
+        'example': example,
+        'page': raw.page
+    }
+
 def clean_characters(text: str) -> str:
     """
     Replace unusual characters with their English equivalents.
@@ -109,42 +299,7 @@ def clean_characters(text: str) -> str:
     Returns:
         Cleaned string with proper English characters
     """
-    if not isinstance(text, str):
-        return text
-    
-    # Character mappings for common encoding issues
-    char_replacements = {
-        'Õ': "'",      # Curly apostrophe/single quote
-        'Ó': '"',      # Opening double quote  
-        'Ò': '"',      # Closing double quote
-        'Þ': 'fi',     # Ligature for 'fi'
-        'ß': 'fl',     # Ligature for 'fl'
-        'È': 'A',      # Accented A
-        'É': 'E',      # Accented E
-        'Í': 'I',      # Accented I
-        'Ñ': '-',      # En dash
-        'Ð': '-',      # Em dash
-        '…': '...',    # Ellipsis
-        '•': '*',      # Bullet point
-        ''': "'",      # Left single quote
-        ''': "'",      # Right single quote
-        '"': '"',      # Left double quote
-        '"': '"',      # Right double quote
-        '–': '-',      # En dash
-        '—': '-',      # Em dash
-    }
-    
-    # Apply character replacements
-    for old_char, new_char in char_replacements.items():
-        text = text.replace(old_char, new_char)
-    
-    # Handle any remaining non-ASCII characters by removing them
-    text = re.sub(r'[^\x00-\x7F]+', '', text)
-    
-    # Clean up any double spaces that might have been created
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    return parser_normalizer.clean(text)
 
 def clean_word(word: str) -> str:
     """Clean and normalize a vocabulary word."""
@@ -248,11 +403,24 @@ def is_valid_entry(word: str, part_of_speech: str, definition: str, example: str
 
 def main():
     """Main function to run the vocabulary parser."""
+    arg_parser = argparse.ArgumentParser(description="Parse extracted SAT vocabulary text into JSON.")
+    arg_parser.add_argument('--workers', type=int, default=1,
+                            help="number of processes used to parse pages (default: 1)")
+    arg_parser.add_argument('--cache', default=DEFAULT_CACHE_FILE,
+                            help=f"page cache file (default: {DEFAULT_CACHE_FILE})")
+    arg_parser.add_argument('--cache-size', type=int, default=10000,
+                            help="maximum number of cached pages (default: 10000)")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="reparse every page without reading or writing the cache")
+    args = arg_parser.parse_args()
+    
     input_file = 'extracted_text.json'
     output_file = 'sat_vocabulary_parsed.json'
+    cache_file = None if args.no_cache else args.cache
     
     try:
-        parse_vocabulary_data(input_file, output_file)
+        parse_vocabulary_data(input_file, output_file, workers=args.workers,
+                              cache_file=cache_file, cache_size=args.cache_size)
     except FileNotFoundError:
         print(f"Error: Could not find input file '{input_file}'")
         print("Please make sure the file exists in the current directory.")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests for VocabularyQuery.run_batch."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from vocab_query import VocabularyQuery
+
+ENTRIES = [
+    {'word': 'abase', 'part_of_speech': 'verb', 'definition': 'To humiliate, degrade',
+     'example': 'The deposed leader was abased before his conqueror.', 'page': 1,
+     'categories': ['general'], 'difficulty': 'medium', 'syllable_count': 2, 'word_length': 5},
+    {'word': 'abate', 'part_of_speech': 'verb', 'definition': 'To reduce, lessen',
+     'example': 'The storm abated after the hurricane moved inland.', 'page': 1,
+     'categories': ['general'], 'difficulty': 'easy', 'syllable_count': 2, 'word_length': 5},
+    {'word': 'abdicate', 'part_of_speech': 'verb', 'definition': 'To give up a position',
+     'example': 'The king abdicated the throne to marry a commoner.', 'page': 1,
+     'categories': ['politics_government'], 'difficulty': 'hard', 'syllable_count': 3, 'word_length': 8},
+]
+
+
+class RunBatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        handle, cls.vocab_file = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            json.dump(ENTRIES, f)
+        cls.vq = VocabularyQuery(cls.vocab_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.vocab_file)
+
+    def test_bad_queries_do_not_affect_the_rest_of_the_chunk(self):
+        queries = [
+            {'id': 1, 'op': 'word', 'word': 'abate'},
+            {'id': 2, 'op': 'word', 'word': 123},
+            {'id': 3, 'op': 'autocomplete', 'prefix': 5},
+            '{"id": 4, "op": "autocomplete", "prefix": "ab"}',
+            'not json',
+            {'id': 6, 'op': 'lookup', 'words': ['abase', 'missing']},
+            {'id': 7, 'op': 'nonexistent'},
+            {'id': 8, 'op': 'difficulty', 'difficulty': 'hard'},
+        ]
+        responses = list(self.vq.run_batch(queries))
+
+        self.assertEqual([response['id'] for response in responses], [1, 2, 3, 4, None, 6, 7, 8])
+        for response in (responses[1], responses[2], responses[4], responses[6]):
+            self.assertIn('error', response)
+            self.assertNotIn('result', response)
+        self.assertEqual([entry['word'] for entry in responses[0]['result']], ['abate'])
+        self.assertEqual(responses[3]['result'], ['abase', 'abate', 'abdicate'])
+        self.assertEqual(list(responses[5]['result']), ['abase', 'missing'])
+        self.assertEqual(responses[5]['result']['missing'], [])
+        self.assertEqual([entry['word'] for entry in responses[7]['result']], ['abdicate'])
+
+    def test_lookup_of_a_bare_string_is_an_error(self):
+        responses = list(self.vq.run_batch([
+            {'id': 1, 'op': 'lookup', 'words': 'abc'},
+            {'id': 2, 'op': 'lookup', 'words': ['abate', 7]},
+            {'id': 3, 'op': 'lookup', 'words': ['abate']},
+        ]))
+        for response in responses[:2]:
+            self.assertIn('error', response)
+            self.assertNotIn('result', response)
+        self.assertEqual([entry['word'] for entry in responses[2]['result']['abate']], ['abate'])
+
+    def test_malformed_sampling_arguments_are_errors(self):
+        queries = [
+            {'op': 'random', 'count': '2'},
+            {'op': 'random', 'count': 2.5},
+            {'op': 'random', 'count': -1},
+            {'op': 'random', 'weights': {'difficulty': 3}},
+            {'op': 'random', 'weights': {'difficulty': {'hard': 'heavy'}}},
+            {'op': 'random', 'weights': {'difficulty': {'hard': -1}}},
+            {'op': 'random', 'weights': [['difficulty', {'hard': 2}]]},
+            {'op': 'random', 'count': 2, 'seed': 1, 'weights': {'difficulty': {'hard': 3}}},
+        ]
+        responses = list(self.vq.run_batch(queries))
+        for query, response in zip(queries[:-1], responses):
+            with self.assertRaises(ValueError):
+                self.vq.execute(query)
+            self.assertIn('error', response)
+        self.assertEqual(len(responses[-1]['result']), 2)
+
+    def test_responses_match_execute(self):
+        queries = [{'id': n, 'op': 'syllables', 'syllable_count': 2} for n in range(3)]
+        expected = self.vq.execute({'op': 'syllables', 'syllable_count': 2})
+        for response in self.vq.run_batch(queries, chunk_size=2):
+            self.assertEqual(response['result'], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Tests for loading the persistent LRU cache from disk."""
+
+import os
+import tempfile
+import unittest
+
+from vocab_cache import LRUCache
+
+
+class LoadTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def load(self, text):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return LRUCache(self.path)
+
+    def test_saved_entries_are_loaded(self):
+        cache = LRUCache(self.path)
+        cache.put('key', {'entries': []})
+        cache.save()
+        self.assertEqual(LRUCache(self.path).get('key'), {'entries': []})
+
+    def test_malformed_files_load_as_empty(self):
+        for text in ('', '{', '[]', '[["key", {}]]', '{"entries": 1}', '"text"', 'null'):
+            with self.subTest(text=text):
+                cache = self.load(text)
+                self.assertEqual(len(cache.entries), 0)
+                self.assertIsNone(cache.get('entries'))
+
+
+if __name__ == '__main__':
+    unittest.main()
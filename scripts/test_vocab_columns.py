@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for entries that leave out optional fields, across the vocabulary stores."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from vocab_columns import VocabularyColumns, complete_entry
+from vocab_query import VocabularyQuery
+from vocab_sqlite import SQLiteVocabularyQuery, create_database
+
+ENTRY = {'word': 'abate', 'part_of_speech': 'verb', 'definition': 'To reduce, lessen',
+         'example': 'The storm abated after the hurricane moved inland.', 'page': 3,
+         'categories': ['general'], 'difficulty': 'easy', 'syllable_count': 2, 'word_length': 5}
+# No page or example, which the parsers do not always provide
+SPARSE_ENTRY = {'word': 'abdicate', 'part_of_speech': 'verb', 'definition': 'To give up a position',
+                'categories': ['politics_government'], 'difficulty': 'hard', 'syllable_count': 3,
+                'word_length': 8, 'definition_number': 1}
+
+
+class CompleteEntryTest(unittest.TestCase):
+    def test_complete_entry_is_returned_as_is(self):
+        self.assertIs(complete_entry(ENTRY), ENTRY)
+
+    def test_optional_fields_are_defaulted_on_a_copy(self):
+        completed = complete_entry(SPARSE_ENTRY)
+        self.assertEqual(completed['page'], 0)
+        self.assertEqual(completed['example'], '')
+        self.assertEqual(completed['definition_number'], 1)
+        self.assertNotIn('page', SPARSE_ENTRY)
+
+    def test_missing_required_field_is_a_value_error(self):
+        entry = dict(ENTRY)
+        del entry['difficulty']
+        with self.assertRaisesRegex(ValueError, 'difficulty'):
+            complete_entry(entry)
+
+
+class VocabularyColumnsTest(unittest.TestCase):
+    def test_append_and_replace_sparse_entries(self):
+        columns = VocabularyColumns([ENTRY, SPARSE_ENTRY])
+        self.assertEqual(dict(columns[1]), complete_entry(SPARSE_ENTRY))
+        columns[0] = SPARSE_ENTRY
+        self.assertEqual(columns[0]['page'], 0)
+        self.assertEqual(columns[0]['definition_number'], 1)
+
+    def test_rejected_entry_leaves_the_store_unchanged(self):
+        columns = VocabularyColumns([ENTRY])
+        entry = dict(ENTRY)
+        del entry['word_length']
+        with self.assertRaises(ValueError):
+            columns.append(entry)
+        with self.assertRaises(ValueError):
+            columns[0] = entry
+        self.assertEqual(len(columns), 1)
+        self.assertEqual(dict(columns[0]), ENTRY)
+        self.assertEqual(len(columns.word_lengths), len(columns.words))
+
+
+class StoresTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.vocab_file = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            json.dump([ENTRY], f)
+        handle, self.database = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        create_database(self.database, [ENTRY])
+
+    def tearDown(self):
+        os.remove(self.vocab_file)
+        os.remove(self.database)
+
+    def test_every_store_accepts_sparse_entries(self):
+        sqlite_query = SQLiteVocabularyQuery(self.database)
+        stores = [VocabularyQuery(self.vocab_file), VocabularyQuery(self.vocab_file, columnar=True), sqlite_query]
+        for vq in stores:
+            entry_id = vq.add_entry(SPARSE_ENTRY)
+            self.assertEqual(dict(vq.search_senses('abdicate')[0]), complete_entry(SPARSE_ENTRY))
+            vq.update_entry(entry_id, dict(SPARSE_ENTRY, difficulty='medium'))
+            self.assertEqual(vq.search_senses('abdicate')[0]['page'], 0)
+        sqlite_query.close()
+
+    def test_every_store_rejects_entries_missing_required_fields(self):
+        entry = dict(SPARSE_ENTRY)
+        del entry['categories']
+        sqlite_query = SQLiteVocabularyQuery(self.database)
+        stores = [VocabularyQuery(self.vocab_file), VocabularyQuery(self.vocab_file, columnar=True), sqlite_query]
+        for vq in stores:
+            with self.assertRaises(ValueError):
+                vq.add_entry(entry)
+            with self.assertRaises(ValueError):
+                vq.update_entry(0, entry)
+            self.assertEqual(len(vq.search_senses('abate')), 1)
+            self.assertEqual(vq.search_senses('abdicate'), [])
+            self.assertEqual(vq.get_statistics()['total_words'], 1)
+        sqlite_query.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Tests for facet bitmaps and filter evaluation."""
+
+import unittest
+
+from vocab_facets import FACETS, FacetIndex
+
+
+class EmptyFacetTest(unittest.TestCase):
+    def test_facet_without_values_matches_nothing(self):
+        index = FacetIndex({'difficulty': {'hard': [0, 2]}}, 3)
+        self.assertEqual(index.evaluate('category:general'), 0)
+        self.assertEqual(index.evaluate('difficulty:hard AND NOT pos:noun'), 0b101)
+
+    def test_bitmaps_read_back_keep_every_facet(self):
+        index = FacetIndex.from_bitmaps({'difficulty': {'hard': 0b101}}, 3)
+        self.assertEqual(list(index.bitmaps), list(FACETS))
+        self.assertEqual(index.evaluate('length:12+'), 0)
+        self.assertEqual(index.counts(index.all)['category'], {})
+
+    def test_unknown_facet_is_still_rejected(self):
+        with self.assertRaises(ValueError):
+            FacetIndex({}, 3).evaluate('colour:red')
+
+
+if __name__ == '__main__':
+    unittest.main()
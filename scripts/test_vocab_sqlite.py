@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Tests for SQLiteVocabularyQuery's handling of query arguments."""
+
+import os
+import tempfile
+import unittest
+
+from vocab_sqlite import SQLiteVocabularyQuery, create_database
+
+ENTRY = {'word': 'abate', 'part_of_speech': 'verb', 'definition': 'To reduce, lessen',
+         'example': 'The storm abated after the hurricane moved inland.', 'page': 1,
+         'categories': ['general'], 'difficulty': 'easy', 'syllable_count': 2, 'word_length': 5}
+
+
+class QueryArgumentsTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.database = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        create_database(self.database, [ENTRY])
+        self.vq = SQLiteVocabularyQuery(self.database)
+
+    def tearDown(self):
+        self.vq.close()
+        os.remove(self.database)
+
+    def test_unbindable_arguments_are_value_errors(self):
+        calls = [
+            lambda: self.vq.search_by_syllables([1]),
+            lambda: self.vq.search_by_word_length(min_length={'a': 1}),
+            lambda: self.vq.search_by_syllables(1 << 64),
+            lambda: self.vq.search_text('reduce', k=1 << 64),
+            lambda: self.vq.faceted_search('pos:verb', limit=[1]),
+            lambda: self.vq.remove_entry(1 << 64),
+        ]
+        for call in calls:
+            with self.assertRaises(ValueError):
+                call()
+
+    def test_batch_reports_bad_arguments_per_query(self):
+        responses = list(self.vq.run_batch([
+            {'id': 1, 'op': 'syllables', 'syllable_count': [1]},
+            {'id': 2, 'op': 'search', 'query': 'reduce', 'k': 10 ** 30},
+            {'id': 3, 'op': 'syllables', 'syllable_count': 2},
+        ]))
+        self.assertIn('error', responses[0])
+        self.assertIn('error', responses[1])
+        self.assertEqual([entry['word'] for entry in responses[2]['result']], ['abate'])
+
+
+if __name__ == '__main__':
+    unittest.main()
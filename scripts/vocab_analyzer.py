@@ -7,9 +7,11 @@ This script analyzes the categorized vocabulary data and provides detailed insig
 
 import json
 from collections import defaultdict, Counter
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
 
-def analyze_vocabulary_data(vocab_data: List[Dict]) -> Dict[str, Any]:
+from vocab_columns import VocabularyColumns
+
+def analyze_vocabulary_data(vocab_data: Sequence[Dict]) -> Dict[str, Any]:
     """Analyze categorized vocabulary data and generate insights."""
     
     analysis = {
@@ -177,7 +179,7 @@ def main():
     try:
         # Load categorized vocabulary data
         with open(input_file, 'r', encoding='utf-8') as f:
-            vocab_data = json.load(f)
+            vocab_data = VocabularyColumns(json.load(f))
         
         # Analyze the data
         analysis = analyze_vocabulary_data(vocab_data)
@@ -201,7 +203,7 @@ def main():
         }
         
         with open('vocabulary_analysis_report.json', 'w', encoding='utf-8') as f:
-            json.dump(analysis_output, f, indent=2, ensure_ascii=False)
+            json.dump(analysis_output, f, indent=2, ensure_ascii=False, default=dict)
         
         print(f"\n💾 Detailed analysis saved to: vocabulary_analysis_report.json")
         
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Multi-Pattern Keyword Automaton
+
+An Aho-Corasick automaton that reports which of a fixed set of patterns occur
+anywhere in a text (as substrings, overlaps included) in a single left-to-right
+scan. The vocabulary categorizer compiles its taxonomy into one of these so a
+definition is read once instead of once per keyword.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class KeywordAutomaton:
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Args:
+            patterns: Non-empty strings to search for; duplicates share one id
+        """
+        self.patterns: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for pattern in patterns:
+            if not pattern:
+                raise ValueError("Patterns must be non-empty")
+            if pattern not in self.ids:
+                self.ids[pattern] = len(self.patterns)
+                self.patterns.append(pattern)
+
+        # Trie of pattern prefixes; state 0 is the root
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.outputs: List[Set[int]] = [set()]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][char] = next_state
+                    self.transitions.append({})
+                    self.outputs.append(set())
+                state = next_state
+            self.outputs[state].add(pattern_id)
+
+        self._compile()
+
+    def _compile(self) -> None:
+        """
+        Turn the trie into a deterministic automaton.
+
+        Failure links are resolved breadth-first and folded into the transition
+        tables, so scanning never follows a failure link: a missing transition
+        always means "back to the root". Each state's outputs include those of
+        its failure chain.
+        """
+        failure = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+
+        while queue:
+            state = queue.popleft()
+            fallback = self.transitions[failure[state]]
+            self.outputs[state] |= self.outputs[failure[state]]
+
+            children = list(self.transitions[state].items())
+            # Inherit the fallback state's moves that this state does not override
+            for char, target in fallback.items():
+                self.transitions[state].setdefault(char, target)
+            for char, child in children:
+                failure[child] = fallback.get(char, 0)
+                queue.append(child)
+
+        # Frozen outputs are cheap to test and to merge while scanning
+        self.outputs = [frozenset(output) for output in self.outputs]
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Return the ids of every pattern that occurs in text."""
+        transitions = self.transitions
+        outputs = self.outputs
+        found: Set[int] = set()
+        state = 0
+
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+    def find(self, text: str) -> Set[str]:
+        """Return every pattern that occurs in text."""
+        return {self.patterns[pattern_id] for pattern_id in self.find_ids(text)}
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Batch Vocabulary Queries
+
+Runs a JSONL file of query requests (one {"op": ..., ...} object per line,
+as accepted by VocabularyQuery.execute) through VocabularyQuery.run_batch and
+writes one JSONL response per request, in input order:
+
+    python3 vocab_batch.py queries.jsonl -o results.jsonl
+    cat queries.jsonl | python3 vocab_batch.py - > results.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from vocab_query import VocabularyQuery
+from vocab_sqlite import SQLiteVocabularyQuery
+
+
+def main():
+    """Answer every query in a JSONL file, streaming responses as JSONL."""
+    arg_parser = argparse.ArgumentParser(description="Run a JSONL file of SAT vocabulary queries.")
+    arg_parser.add_argument('queries', help="JSONL file of requests, or - for standard input")
+    arg_parser.add_argument('-o', '--output', help="JSONL file for responses (default: standard output)")
+    arg_parser.add_argument('--vocab-file', default='sat_vocabulary_categorized.json',
+                            help="Categorized vocabulary to query")
+    arg_parser.add_argument('--columnar', action='store_true',
+                            help="Hold the vocabulary in a compact columnar store")
+    arg_parser.add_argument('--snapshot', help="Snapshot from vocab_snapshot.py to map instead of the vocabulary file")
+    arg_parser.add_argument('--database', help="SQLite database from vocab_sqlite.py to query instead")
+    arg_parser.add_argument('--chunk-size', type=int, default=10000,
+                            help="Queries grouped together to share lookups")
+    args = arg_parser.parse_args()
+
+    try:
+        if args.database:
+            vq = SQLiteVocabularyQuery(args.database)
+        else:
+            vq = VocabularyQuery(args.vocab_file, columnar=args.columnar, snapshot_file=args.snapshot)
+        queries = sys.stdin if args.queries == '-' else open(args.queries, 'r', encoding='utf-8')
+        output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+        start_time = time.time()
+        count = 0
+        errors = 0
+        with queries, output:
+            lines = (line for line in queries if line.strip())
+            for response in vq.run_batch(lines, args.chunk_size):
+                output.write(json.dumps(response, ensure_ascii=False, default=dict) + '\n')
+                count += 1
+                errors += 'error' in response
+
+        elapsed = time.time() - start_time
+        # Keep standard output pure JSONL
+        print(f"Answered {count} queries ({errors} errors) in {elapsed:.2f}s "
+              f"({count / elapsed if elapsed else 0:.0f} queries/s)", file=sys.stderr)
+    except FileNotFoundError as e:
+        print(f"Error: {e.filename} not found.", file=sys.stderr)
+    except json.JSONDecodeError as e:
+        print(f"Error parsing {args.vocab_file}: {e}", file=sys.stderr)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
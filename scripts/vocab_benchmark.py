@@ -0,0 +1,813 @@
+#!/usr/bin/env python3
+"""
+Vocabulary Toolchain Benchmarks
+
+This script times the vocabulary scripts on synthetic worst-case inputs.
+Run it with the name of a benchmark, or without arguments to run them all:
+
+    python3 vocab_benchmark.py tokenizer
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict
+
+import final_vocab_parser
+from sat_vocab_parser import collect_vocabulary
+from vocab_columns import VocabularyColumns
+from vocab_normalize import CHARACTER_REPLACEMENTS, character_normalizer, remove_greek_letters
+from vocab_categorizer import VocabularyCategorizer
+from vocab_facets import LENGTH_BUCKETS, SYLLABLE_BUCKETS, FacetIndex
+from vocab_fuzzy import FuzzyIndex
+from vocab_query import VocabularyQuery
+from vocab_search import BM25Index, tokenize
+from vocab_snapshot import write_snapshot
+from vocab_sqlite import SQLiteVocabularyQuery, create_database
+from vocab_stats import VocabularyStats
+from vocab_stream import iter_pages
+from vocab_tokenizer import tokenize_page
+
+# The per-page pattern the parsers used before vocab_tokenizer existed
+LEGACY_ENTRY_PATTERN = re.compile(
+    r'\n([a-z]+)\s*\n\s*(\([^)]+\))\s*\n\s*([^(]+?)\s*(\([^)]{20,}\))',
+    re.MULTILINE | re.DOTALL | re.IGNORECASE
+)
+
+
+def legacy_clean_characters(text):
+    """character_cleaner.clean_characters as it was before vocab_normalize."""
+    if not isinstance(text, str):
+        return text
+    for old_char, new_char in CHARACTER_REPLACEMENTS.items():
+        text = text.replace(old_char, new_char)
+    text = re.sub(r'[^\x00-\x7F]+', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_remove_greek_letters(text):
+    """clean_greek.remove_greek_letters as it was before vocab_normalize."""
+    greek_pattern = re.compile(r'[\u0370-\u03FF\u1F00-\u1FFF]')
+    return greek_pattern.sub('', text)
+
+
+def legacy_categorize_word(categories, word, definition, example):
+    """VocabularyCategorizer.categorize_word as it was before the keyword automaton."""
+    matched = []
+    text_to_analyze = f"{word} {definition} {example}".lower()
+    for category_name, category_data in categories.items():
+        score = 0
+        for keyword in category_data['keywords']:
+            if keyword in text_to_analyze:
+                score += 2
+        for pattern in category_data['patterns']:
+            if pattern in text_to_analyze:
+                score += 3
+        if score >= 3:
+            matched.append(category_name)
+    return matched or ['general']
+
+
+def time_call(func: Callable, *args, repeat: int = 3) -> float:
+    """Return the best wall-clock time of ``repeat`` calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def whitespace_run_page(size: int) -> str:
+    """A few headwords, each followed by a page-long blank run and no part of speech."""
+    return ('\nabase' + '\n \n' * (size // 12)) * 4
+
+
+def unclosed_pos_page(size: int) -> str:
+    """Headwords whose part of speech only closes at the very end of the page."""
+    block = '\nabase \n \n(v. '
+    return block * max(1, size // len(block)) + ')x'
+
+
+def well_formed_page(size: int) -> str:
+    """Ordinary entries, for a baseline."""
+    block = ('\nabase \n \n(v.)\n \n \nto humiliate, degrade \n \n'
+             '(After being overthrown and abased, the deposed leader bowed.)\n ')
+    return block * max(1, size // len(block))
+
+
+def synthetic_vocabulary(count: int, seed: int = 0) -> list:
+    """
+    Categorized entries resampled from sat_vocabulary_categorized.json, with
+    unique headwords (a real word plus a letter suffix) so lookups stay exact.
+    """
+    with open('sat_vocabulary_categorized.json', 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    rng = random.Random(seed)
+    vocabulary = []
+    for number in range(count):
+        entry = dict(rng.choice(entries))
+        suffix = ''
+        while number:
+            number, letter = divmod(number, 26)
+            suffix += chr(ord('a') + letter)
+        entry['word'] += suffix
+        entry['word_length'] = len(entry['word'])
+        vocabulary.append(entry)
+    return vocabulary
+
+
+def pseudo_words(count: int, seed: int = 0) -> list:
+    """Distinct pronounceable pseudo-words, for dictionaries larger than the real one."""
+    rng = random.Random(seed)
+    syllables = [consonant + vowel for consonant in 'bcdfghjklmnprstvwz' for vowel in 'aeiou']
+    syllables += ['str', 'ion', 'ous', 'ate', 'ent', 'al']
+    words = {}
+    while len(words) < count:
+        words[''.join(rng.choice(syllables) for _ in range(rng.randint(2, 6)))] = None
+    return list(words)
+
+
+def benchmark_tokenizer() -> None:
+    """Compare the legacy entry regex and vocab_tokenizer on the real and on pathological pages."""
+    print("Tokenizer: legacy regex vs vocab_tokenizer")
+    print(f"{'page':<16}{'chars':>10}{'regex (ms)':>14}{'tokenizer (ms)':>16}")
+
+    with open('extracted_text.json', 'r', encoding='utf-8') as f:
+        texts = [page['text'] for page in json.load(f)]
+    # The parsers read every match's groups, so the regex is timed doing the same
+    legacy = time_call(lambda: [[match.groups() for match in LEGACY_ENTRY_PATTERN.finditer(text)]
+                                for text in texts], repeat=20)
+    tokenizer = time_call(lambda: [list(tokenize_page(text)) for text in texts], repeat=20)
+    print(f"{'corpus':<16}{sum(map(len, texts)):>10}{legacy * 1000:>14.2f}{tokenizer * 1000:>16.2f}")
+
+    for name, build in [('well-formed', well_formed_page),
+                        ('whitespace-run', whitespace_run_page),
+                        ('unclosed-pos', unclosed_pos_page)]:
+        for size in [5_000, 10_000, 20_000, 40_000]:
+            page = build(size)
+            legacy = time_call(lambda: list(LEGACY_ENTRY_PATTERN.finditer(page)))
+            tokenizer = time_call(lambda: list(tokenize_page(page)))
+            print(f"{name:<16}{len(page):>10}{legacy * 1000:>14.2f}{tokenizer * 1000:>16.2f}")
+    print("Doubling the page should roughly double the tokenizer time;"
+          " the legacy regex grows quadratically on the malformed pages.")
+
+
+def benchmark_parallel_parse(copies: int = 50) -> None:
+    """Time sat_vocab_parser page parsing on a multi-thousand-page corpus."""
+    with open('extracted_text.json', 'r', encoding='utf-8') as f:
+        pages = json.load(f)
+
+    corpus = [{'page': i + 1, 'text': page['text']}
+              for i, page in enumerate(pages * copies)]
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(corpus, f)
+        corpus_file = f.name
+
+    try:
+        print(f"Parallel parsing: {len(corpus)} pages")
+        print(f"{'workers':<10}{'seconds':>10}{'speedup':>10}")
+
+        serial_time = None
+        serial_result = None
+        worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+        for workers in worker_counts:
+            start = time.perf_counter()
+            result = collect_vocabulary(iter_pages(corpus_file), workers)
+            elapsed = time.perf_counter() - start
+
+            if serial_time is None:
+                serial_time, serial_result = elapsed, result
+            elif result != serial_result:
+                print(f"  {workers} workers produced different output than the serial run!")
+            print(f"{workers:<10}{elapsed:>10.2f}{serial_time / elapsed:>9.2f}x")
+    finally:
+        os.remove(corpus_file)
+
+
+def benchmark_normalizer(rounds: int = 20) -> None:
+    """Time per-field character cleaning on the shipped datasets."""
+    fields = []
+    with open('sat_vocabulary_parsed.json', 'r', encoding='utf-8') as f:
+        for entry in json.load(f):
+            fields.extend([entry['word'], entry['definition'], entry['example']])
+    with open('extracted_text.json', 'r', encoding='utf-8') as f:
+        for page in json.load(f):
+            fields.extend(page['text'].split('\n'))
+    fields = fields * rounds
+
+    print(f"Normalizer: {len(fields)} fields")
+    print(f"{'function':<24}{'legacy (us/field)':>20}{'shared (us/field)':>20}")
+
+    for name, legacy, shared in [
+        ('clean_characters', legacy_clean_characters, character_normalizer.clean),
+        ('remove_greek_letters', legacy_remove_greek_letters, remove_greek_letters),
+    ]:
+        if [legacy(text) for text in fields] != [shared(text) for text in fields]:
+            print(f"  {name}: outputs differ!")
+        legacy_time = time_call(lambda: [legacy(text) for text in fields])
+        shared_time = time_call(lambda: [shared(text) for text in fields])
+        print(f"{name:<24}{legacy_time / len(fields) * 1e6:>20.2f}{shared_time / len(fields) * 1e6:>20.2f}")
+
+
+def benchmark_features(count: int = 50_000) -> None:
+    """Time final_vocab_parser entry building with cold and warm word features."""
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcdefghilmnoprstuy') for _ in range(rng.randint(4, 14)))
+             for _ in range(count)]
+    definition = 'to humiliate, degrade, or make something complex and plain'
+
+    def build_all():
+        return [final_vocab_parser.build_entry(word, 'v.', definition, '(Example text.)')
+                for word in words]
+
+    print(f"Entry building: {len(words)} synthetic words")
+    print(f"{'features':<10}{'seconds':>10}{'us/entry':>12}")
+    for name in ['cold', 'warm']:
+        if name == 'cold':
+            final_vocab_parser.word_features.cache_clear()
+        elapsed = time_call(build_all, repeat=1)
+        print(f"{name:<10}{elapsed:>10.2f}{elapsed / len(words) * 1e6:>12.2f}")
+
+
+def benchmark_categorizer(copies: int = 200) -> None:
+    """Compare per-keyword substring tests with the compiled taxonomy automaton."""
+    with open('sat_vocabulary_parsed.json', 'r', encoding='utf-8') as f:
+        entries = [(entry['word'], entry['definition'], entry['example'])
+                   for entry in json.load(f)] * copies
+
+    categorizer = VocabularyCategorizer()
+    print(f"Categorizer: {len(entries)} entries")
+
+    legacy_result = [legacy_categorize_word(categorizer.categories, *entry) for entry in entries]
+    if legacy_result != [categorizer.categorize_word(*entry) for entry in entries]:
+        print("  automaton categories differ from the substring tests!")
+
+    legacy_time = time_call(lambda: [legacy_categorize_word(categorizer.categories, *entry)
+                                     for entry in entries], repeat=1)
+    automaton_time = time_call(lambda: [categorizer.categorize_word(*entry)
+                                        for entry in entries], repeat=1)
+    print(f"{'matcher':<12}{'seconds':>10}{'us/entry':>12}")
+    print(f"{'substring':<12}{legacy_time:>10.2f}{legacy_time / len(entries) * 1e6:>12.2f}")
+    print(f"{'automaton':<12}{automaton_time:>10.2f}{automaton_time / len(entries) * 1e6:>12.2f}")
+
+
+def benchmark_matching(copies: int = 200) -> None:
+    """Compare substring and token-set category matching: speed and changed assignments."""
+    with open('sat_vocabulary_parsed.json', 'r', encoding='utf-8') as f:
+        entries = [(entry['word'], entry['definition'], entry['example'])
+                   for entry in json.load(f)]
+
+    substring = VocabularyCategorizer(matching='substring')
+    tokens = VocabularyCategorizer(matching='tokens')
+    corpus = entries * copies
+
+    print(f"Category matching: {len(corpus)} entries")
+    print(f"{'mode':<12}{'seconds':>10}{'us/entry':>12}")
+    for name, categorizer in [('substring', substring), ('tokens', tokens)]:
+        elapsed = time_call(lambda: [categorizer.categorize_word(*entry) for entry in corpus], repeat=1)
+        print(f"{name:<12}{elapsed:>10.2f}{elapsed / len(corpus) * 1e6:>12.2f}")
+
+    changed_words = 0
+    added, removed = Counter(), Counter()
+    for entry in entries:
+        before = set(substring.categorize_word(*entry))
+        after = set(tokens.categorize_word(*entry))
+        if before != after:
+            changed_words += 1
+            added.update(after - before)
+            removed.update(before - after)
+
+    print(f"\nWords whose categories change: {changed_words} of {len(entries)}")
+    print(f"Category assignments removed: {sum(removed.values())}, added: {sum(added.values())}")
+    print(f"{'category':<24}{'removed':>10}{'added':>10}")
+    for category in sorted(set(added) | set(removed), key=lambda c: -(added[c] + removed[c])):
+        print(f"{category:<24}{removed[category]:>10}{added[category]:>10}")
+
+
+def benchmark_difficulty(rows: int = 1_000_000) -> None:
+    """Compare scalar and NumPy difficulty scoring on a million-row dataset."""
+    with open('sat_vocabulary_parsed.json', 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    # Resample the real entries, giving most of them an inflected headword
+    rng = random.Random(0)
+    endings = ['', '', 'ly', 'ness', 'ation', 'ed', 'ous', 'ity']
+    dataset = []
+    for _ in range(rows):
+        entry = rng.choice(entries)
+        dataset.append(dict(entry, word=entry['word'] + rng.choice(endings)))
+
+    categorizer = VocabularyCategorizer()
+    print(f"Difficulty scoring: {len(dataset)} entries")
+
+    start = time.perf_counter()
+    scalar = [categorizer.assess_difficulty(entry['word'], entry['definition'], entry['part_of_speech'])
+              for entry in dataset]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = categorizer.assess_difficulty_batch(dataset)
+    vectorized_time = time.perf_counter() - start
+
+    if scalar != vectorized:
+        print("  vectorized difficulties differ from the scalar path!")
+    print(f"{'path':<12}{'seconds':>10}{'rows/s':>14}")
+    print(f"{'scalar':<12}{scalar_time:>10.2f}{len(dataset) / scalar_time:>14,.0f}")
+    print(f"{'vectorized':<12}{vectorized_time:>10.2f}{len(dataset) / vectorized_time:>14,.0f}")
+
+
+def benchmark_process(copies: int = 100) -> None:
+    """Time VocabularyCategorizer.process_vocabulary with 1..N worker processes."""
+    with open('sat_vocabulary_parsed.json', 'r', encoding='utf-8') as f:
+        dataset = json.load(f) * copies
+
+    categorizer = VocabularyCategorizer()
+    print(f"Processing vocabulary: {len(dataset)} entries")
+    print(f"{'workers':<10}{'seconds':>10}{'speedup':>10}")
+
+    serial_time = None
+    serial_result = None
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        result = categorizer.process_vocabulary(dataset, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        if serial_time is None:
+            serial_time, serial_result = elapsed, result
+        elif result != serial_result:
+            print(f"  {workers} workers produced different output than the serial run!")
+        print(f"{workers:<10}{elapsed:>10.2f}{serial_time / elapsed:>9.2f}x")
+
+
+def benchmark_indexes(queries: int = 200) -> None:
+    """Weigh VocabularyQuery index build time against per-query savings over full scans."""
+    print("Query indexes: build cost vs per-query savings")
+    print(f"{'words':>10}{'build (ms)':>12}{'scan (ms)':>12}{'index (ms)':>12}{'break-even':>12}")
+
+    for size in [1_000, 100_000, 1_000_000]:
+        vocabulary = synthetic_vocabulary(size)
+        build = time_call(lambda: VocabularyQuery(vocabulary=vocabulary), repeat=1)
+        query = VocabularyQuery(vocabulary=vocabulary)
+
+        lookups = [('difficulty', 'hard'), ('category', 'Emotions_Feelings'),
+                   ('pos', 'verb'), ('syllables', 3)]
+        rounds = max(1, queries * 1000 // size)
+
+        def scan_all():
+            for _ in range(rounds):
+                [w for w in vocabulary if w['difficulty'] == 'hard']
+                [w for w in vocabulary if 'emotions_feelings' in [c.lower() for c in w['categories']]]
+                [w for w in vocabulary if w['part_of_speech'] == 'verb']
+                [w for w in vocabulary if w['syllable_count'] == 3]
+
+        def index_all():
+            for _ in range(rounds):
+                query.search_by_difficulty('hard')
+                query.search_by_category('Emotions_Feelings')
+                query.search_by_part_of_speech('verb')
+                query.search_by_syllables(3)
+
+        per_query = rounds * len(lookups)
+        scan = time_call(scan_all, repeat=1) / per_query
+        index = time_call(index_all, repeat=1) / per_query
+        break_even = build / (scan - index) if scan > index else float('inf')
+        print(f"{size:>10}{build * 1000:>12.1f}{scan * 1000:>12.3f}{index * 1000:>12.3f}"
+              f"{break_even:>11.1f}q")
+        del vocabulary, query
+    print("break-even: queries after which the indexes have paid for their build time")
+
+
+def benchmark_lookup(size: int = 100_000, lookups: int = 10_000) -> None:
+    """Compare a full-scan headword lookup with VocabularyQuery's word index."""
+    vocabulary = synthetic_vocabulary(size)
+    query = VocabularyQuery(vocabulary=vocabulary)
+    rng = random.Random(1)
+    words = [rng.choice(vocabulary)['word'].upper() for _ in range(lookups)]
+
+    def scan(word):
+        for entry in vocabulary:
+            if entry['word'].lower() == word.lower():
+                return entry
+        return None
+
+    sample = words[:20]
+    scan_time = time_call(lambda: [scan(word) for word in sample], repeat=1) / len(sample)
+    index_time = time_call(lambda: [query.search_word(word) for word in words]) / len(words)
+    bulk_time = time_call(lambda: query.lookup_many(words)) / len(words)
+
+    print(f"Word lookup: {size} words")
+    print(f"{'method':<16}{'us/lookup':>12}")
+    print(f"{'scan':<16}{scan_time * 1e6:>12.2f}")
+    print(f"{'search_word':<16}{index_time * 1e6:>12.2f}")
+    print(f"{'lookup_many':<16}{bulk_time * 1e6:>12.2f}")
+
+
+def benchmark_autocomplete(size: int = 1_000_000, words: int = 2_000) -> None:
+    """Measure keystroke-by-keystroke autocomplete latency on a large dictionary."""
+    vocabulary = synthetic_vocabulary(size)
+    start = time.perf_counter()
+    query = VocabularyQuery(vocabulary=vocabulary)
+    print(f"Autocomplete: {size} words (indexes built in {time.perf_counter() - start:.2f}s)")
+
+    rng = random.Random(2)
+    typed = [rng.choice(vocabulary)['word'] for _ in range(words)]
+    print(f"{'filter':<10}{'keystrokes':>12}{'p50 (us)':>10}{'p99 (us)':>10}{'max (us)':>10}")
+    for difficulty in [None, 'hard']:
+        latencies = []
+        for word in typed:
+            for end in range(1, len(word) + 1):
+                start = time.perf_counter()
+                query.autocomplete(word[:end], 10, difficulty)
+                latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[len(latencies) * 99 // 100] * 1e6
+        print(f"{difficulty or 'none':<10}{len(latencies):>12}{p50:>10.1f}{p99:>10.1f}{latencies[-1] * 1e6:>10.1f}")
+
+
+def benchmark_fuzzy(size: int = 1_000_000, queries: int = 1_000) -> None:
+    """Build, persist and query the misspelling index on a large dictionary."""
+    words = sorted(pseudo_words(size))
+    print(f"Fuzzy lookup: {len(words)} words")
+
+    start = time.perf_counter()
+    index = FuzzyIndex(words)
+    print(f"  build: {time.perf_counter() - start:.1f}s, {len(index.slots)} delete keys")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'fuzzy.index')
+        start = time.perf_counter()
+        index.save(path)
+        print(f"  save: {time.perf_counter() - start:.1f}s ({os.path.getsize(path) / 1e6:.0f} MB)")
+        start = time.perf_counter()
+        index = FuzzyIndex.load(path)
+        print(f"  load: {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(3)
+    print(f"{'typos':<8}{'p50 (ms)':>10}{'p99 (ms)':>10}{'matches':>10}")
+    for typos in [1, 2]:
+        latencies = []
+        matches = 0
+        for _ in range(queries):
+            term = list(rng.choice(words))
+            for _ in range(typos):
+                term[rng.randrange(len(term))] = rng.choice('xyzq')
+            start = time.perf_counter()
+            matches += len(index.lookup(''.join(term)))
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(f"{typos:<8}{latencies[len(latencies) // 2] * 1000:>10.2f}"
+              f"{latencies[len(latencies) * 99 // 100] * 1000:>10.2f}{matches / queries:>10.1f}")
+
+
+def benchmark_bm25(size: int = 100_000, queries: int = 200) -> None:
+    """Build, persist and query the definition/example index against a full scan."""
+    vocabulary = synthetic_vocabulary(size)
+    print(f"BM25 search: {size} entries")
+
+    start = time.perf_counter()
+    index = BM25Index(vocabulary)
+    print(f"  build: {time.perf_counter() - start:.1f}s, "
+          f"{len(index.fields['definition'].slots)} definition terms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'text.index')
+        start = time.perf_counter()
+        index.save(path)
+        print(f"  save: {time.perf_counter() - start:.1f}s ({os.path.getsize(path) / 1e6:.0f} MB)")
+        start = time.perf_counter()
+        index = BM25Index.load(path)
+        print(f"  load: {time.perf_counter() - start:.1f}s")
+
+    # Two-word queries and phrases taken from real definitions
+    rng = random.Random(4)
+    term_queries = []
+    phrase_queries = []
+    while len(phrase_queries) < queries:
+        tokens = tokenize(rng.choice(vocabulary)['definition'])
+        if len(tokens) >= 2:
+            position = rng.randrange(len(tokens) - 1)
+            term_queries.append(' '.join(rng.sample(tokens, 2)))
+            phrase_queries.append(f'"{tokens[position]} {tokens[position + 1]}"')
+
+    def scan(query):
+        # Tokenize every entry and rank all of them; what a search would cost without the index
+        terms = set(tokenize(query))
+        scores = []
+        for entry_id, entry in enumerate(vocabulary):
+            hits = sum(token in terms for token in tokenize(entry['definition']))
+            if hits:
+                scores.append((hits, entry_id))
+        return sorted(scores, reverse=True)[:10]
+
+    sample = term_queries[:3]
+    scan_time = time_call(lambda: [scan(query) for query in sample], repeat=1) / len(sample)
+    print(f"{'method':<16}{'ms/query':>12}")
+    print(f"{'scan':<16}{scan_time * 1000:>12.2f}")
+    for label, batch in [('terms', term_queries), ('phrases', phrase_queries)]:
+        elapsed = time_call(lambda: [index.search(query) for query in batch]) / len(batch)
+        print(f"{label:<16}{elapsed * 1000:>12.2f}")
+
+
+def benchmark_facets(size: int = 1_000_000, rounds: int = 5) -> None:
+    """Compare a compound filter with facet counts as list scans and as bitmaps."""
+    vocabulary = synthetic_vocabulary(size)
+    query = VocabularyQuery(vocabulary=vocabulary)
+    build = time_call(lambda: FacetIndex({
+        'difficulty': query.difficulty_index, 'category': query.category_index,
+        'pos': query.pos_index,
+        'syllables': {label: query.syllable_column.iter_ids(low, high) for label, low, high in SYLLABLE_BUCKETS},
+        'length': {label: query.length_column.iter_ids(low, high) for label, low, high in LENGTH_BUCKETS},
+    }, size), repeat=1)
+    print(f"Facet filter: {size} entries, bitmaps built in {build:.2f}s")
+
+    def scan():
+        matches = [w for w in vocabulary if w['difficulty'] == 'hard']
+        matches = [w for w in matches if 'emotions_feelings' in [c.lower() for c in w['categories']]]
+        matches = [w for w in matches if w['part_of_speech'] != 'noun']
+        counts = Counter()
+        for word in matches:
+            counts[('pos', word['part_of_speech'])] += 1
+            counts[('syllables', word['syllable_count'])] += 1
+            counts.update(('category', c) for c in word['categories'])
+        return matches, counts
+
+    filter_query = 'difficulty:hard AND category:emotions_feelings AND NOT pos:noun'
+    scan_time = time_call(scan, repeat=rounds)
+    filter_time = time_call(lambda: query.facets.evaluate(filter_query), repeat=rounds)
+    faceted_time = time_call(lambda: query.faceted_search(filter_query), repeat=rounds)
+    print(f"{'method':<24}{'ms/query':>12}")
+    print(f"{'scan + count':<24}{scan_time * 1000:>12.1f}")
+    print(f"{'bitmap filter':<24}{filter_time * 1000:>12.1f}")
+    print(f"{'faceted_search':<24}{faceted_time * 1000:>12.1f}")
+
+
+def legacy_random_words(vocabulary, count=10, difficulty=None, category=None):
+    """VocabularyQuery.random_words before per-filter pools: filter every call, then sample."""
+    filtered_words = vocabulary
+    if difficulty:
+        filtered_words = [w for w in filtered_words if w['difficulty'] == difficulty.lower()]
+    if category:
+        filtered_words = [w for w in filtered_words
+                          if category.lower() in [c.lower() for c in w['categories']]]
+    return random.sample(filtered_words, min(count, len(filtered_words)))
+
+
+def benchmark_sampling(size: int = 100_000, sets: int = 100_000) -> None:
+    """Generate practice sets of 10 words, filtered and weighted, from a large vocabulary."""
+    vocabulary = synthetic_vocabulary(size)
+    query = VocabularyQuery(vocabulary=vocabulary)
+    print(f"Practice sets: {sets} sets of 10 from {size} entries")
+
+    cases = [
+        ('unfiltered', {}),
+        ('hard', {'difficulty': 'hard'}),
+        ('hard+emotions', {'difficulty': 'hard', 'category': 'emotions_feelings'}),
+        ('weighted', {'weights': {'difficulty': {'hard': 3.0}, 'category': {'general': 0.5}}}),
+        ('hard+weighted', {'difficulty': 'hard', 'weights': {'category': {'emotions_feelings': 4.0}}}),
+    ]
+    print(f"{'filters':<16}{'legacy (s)':>12}{'pooled (s)':>12}{'seeded (s)':>12}{'first call (ms)':>17}")
+    for label, options in cases:
+        legacy = ''
+        if 'weights' not in options:
+            # The legacy version rescans the vocabulary per set; time a sample and scale up
+            sample = 50
+            elapsed = time_call(lambda: [legacy_random_words(vocabulary, 10, options.get('difficulty'),
+                                                             options.get('category'))
+                                         for _ in range(sample)], repeat=1)
+            legacy = f"{elapsed * sets / sample:.1f}"
+        first = time_call(lambda: query.random_words(10, seed=0, **options), repeat=1)
+        pooled = time_call(lambda: [query.random_words(10, **options) for _ in range(sets)], repeat=1)
+        seeded = time_call(lambda: [query.random_words(10, seed=number, **options)
+                                    for number in range(sets)], repeat=1)
+        print(f"{label:<16}{legacy:>12}{pooled:>12.2f}{seeded:>12.2f}{first * 1000:>17.1f}")
+    print("legacy: extrapolated from 50 sets; first call includes building pools and alias tables")
+
+
+def legacy_get_statistics(vocabulary):
+    """VocabularyQuery.get_statistics before incremental stats: rescan every entry."""
+    total_words = len(vocabulary)
+    difficulty_counts = {}
+    category_counts = {}
+    pos_counts = {}
+    for word in vocabulary:
+        difficulty = word['difficulty']
+        difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
+        for category in word['categories']:
+            category_counts[category] = category_counts.get(category, 0) + 1
+        pos = word['part_of_speech']
+        pos_counts[pos] = pos_counts.get(pos, 0) + 1
+    return {
+        'total_words': total_words,
+        'difficulty_distribution': difficulty_counts,
+        'category_distribution': category_counts,
+        'part_of_speech_distribution': pos_counts,
+        'average_word_length': sum(w['word_length'] for w in vocabulary) / total_words,
+        'average_syllables': sum(w['syllable_count'] for w in vocabulary) / total_words
+    }
+
+
+def benchmark_stats(size: int = 1_000_000, mutations: int = 2_000) -> None:
+    """Time get_statistics as a rescan and incrementally, plus the cost of mutations."""
+    vocabulary = synthetic_vocabulary(size)
+    query = VocabularyQuery(vocabulary=vocabulary)
+    print(f"Statistics: {size} entries")
+
+    rescan = time_call(legacy_get_statistics, vocabulary)
+    incremental = time_call(query.get_statistics)
+    half = size // 2
+    merge = time_call(lambda: VocabularyStats(vocabulary[:half]) + VocabularyStats(vocabulary[half:]), repeat=1)
+    print(f"{'operation':<24}{'time (ms)':>12}")
+    print(f"{'rescan':<24}{rescan * 1000:>12.1f}")
+    print(f"{'get_statistics':<24}{incremental * 1000:>12.3f}")
+    print(f"{'count 2 shards + merge':<24}{merge * 1000:>12.1f}")
+
+    rng = random.Random(5)
+    extra = synthetic_vocabulary(mutations, seed=1)
+    adds = time_call(lambda: [query.add_entry(entry) for entry in extra], repeat=1)
+    updates = time_call(lambda: [query.update_entry(rng.randrange(size), entry) for entry in extra], repeat=1)
+    removes = time_call(lambda: [query.remove_entry(rng.randrange(size)) for _ in extra], repeat=1)
+    for label, elapsed in [('add_entry', adds), ('update_entry', updates), ('remove_entry', removes)]:
+        print(f"{label:<24}{elapsed / mutations * 1000:>12.3f}")
+
+
+def benchmark_batch(size: int = 100_000, queries: int = 20_000) -> None:
+    """Compare run_batch with calling the query methods one by one."""
+    vocabulary = synthetic_vocabulary(size)
+    query = VocabularyQuery(vocabulary=vocabulary)
+    rng = random.Random(6)
+    # Nightly-job style mix: mostly word lookups (popular words repeat), some category and filter pulls
+    popular = [rng.choice(vocabulary)['word'] for _ in range(queries // 10)]
+    categories = sorted(query.category_index)
+    requests = []
+    for number in range(queries):
+        kind = rng.random()
+        if kind < 0.8:
+            request = {'op': 'word', 'word': rng.choice(popular)}
+        elif kind < 0.9:
+            request = {'op': 'category', 'category': rng.choice(categories)}
+        else:
+            request = {'op': 'difficulty', 'difficulty': rng.choice(['easy', 'medium', 'hard'])}
+        request['id'] = number
+        requests.append(request)
+
+    def one_by_one():
+        methods = {'word': query.search_senses, 'category': query.search_by_category,
+                   'difficulty': query.search_by_difficulty}
+        return [methods[request['op']](request[request['op']]) for request in requests]
+
+    single = time_call(one_by_one, repeat=1)
+    batched = time_call(lambda: list(query.run_batch(requests)), repeat=1)
+    lines = [json.dumps(request) for request in requests]
+    from_jsonl = time_call(lambda: list(query.run_batch(lines)), repeat=1)
+    print(f"Batch queries: {queries} queries on {size} entries")
+    print(f"{'method':<20}{'queries/s':>12}")
+    print(f"{'one by one':<20}{queries / single:>12.0f}")
+    print(f"{'run_batch':<20}{queries / batched:>12.0f}")
+    print(f"{'run_batch (JSONL)':<20}{queries / from_jsonl:>12.0f}")
+
+
+def benchmark_columns(size: int = 1_000_000) -> None:
+    """Compare the memory held by a list of entry dicts with a VocabularyColumns store."""
+    # Round-trip through JSON, as json.load would, so no entry shares strings with another
+    lines = [json.dumps(entry) for entry in synthetic_vocabulary(size)]
+    tracemalloc.start()
+
+    baseline = tracemalloc.get_traced_memory()[0]
+    vocabulary = [json.loads(line) for line in lines]
+    dict_bytes = tracemalloc.get_traced_memory()[0] - baseline
+
+    start = time.perf_counter()
+    columns = VocabularyColumns(vocabulary)
+    convert_time = time.perf_counter() - start
+    del vocabulary
+    column_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    sample = random.Random(7).sample(range(size), 10_000)
+    row_time = time_call(lambda: [columns[entry_id]['difficulty'] for entry_id in sample])
+    print(f"Columnar store: {size} entries (conversion {convert_time:.2f}s, "
+          f"{row_time / len(sample) * 1e6:.2f}us per row field read)")
+    print(f"{'store':<16}{'MB':>10}{'bytes/entry':>14}")
+    print(f"{'list of dicts':<16}{dict_bytes / 1e6:>10.0f}{dict_bytes / size:>14.0f}")
+    print(f"{'columns':<16}{column_bytes / 1e6:>10.0f}{column_bytes / size:>14.0f}")
+
+
+def benchmark_snapshot(sizes: tuple = (10_000, 100_000, 1_000_000)) -> None:
+    """Compare startup from the pretty-printed JSON file with mapping a snapshot."""
+    print("Cold start: construct VocabularyQuery and answer one lookup (build = JSON load + snapshot write)")
+    print(f"{'entries':>10}{'JSON MB':>10}{'JSON s':>10}{'snap MB':>10}{'snap ms':>10}{'build s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'vocabulary.json')
+        snapshot_path = os.path.join(directory, 'vocabulary.snap')
+        for size in sizes:
+            vocabulary = synthetic_vocabulary(size)
+            word = vocabulary[size // 2]['word']
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(vocabulary, f, indent=2, ensure_ascii=False)
+            del vocabulary
+
+            from_json = time_call(lambda: VocabularyQuery(json_path).search_word(word), repeat=1)
+            write_time = time_call(lambda: write_snapshot(VocabularyQuery(json_path), snapshot_path), repeat=1)
+            from_snapshot = time_call(lambda: VocabularyQuery(snapshot_file=snapshot_path).search_word(word))
+            print(f"{size:>10}{os.path.getsize(json_path) / 1e6:>10.0f}{from_json:>10.2f}"
+                  f"{os.path.getsize(snapshot_path) / 1e6:>10.0f}{from_snapshot * 1000:>10.1f}{write_time:>10.1f}")
+
+
+def benchmark_sqlite(size: int = 100_000, rounds: int = 200) -> None:
+    """Compare loading and querying the SQLite backend with the in-memory JSON path."""
+    vocabulary = synthetic_vocabulary(size)
+    rng = random.Random(8)
+    words = [entry['word'] for entry in rng.sample(vocabulary, rounds)]
+    categories = sorted({category for entry in vocabulary[:1000] for category in entry['categories']})
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'vocabulary.json')
+        database_path = os.path.join(directory, 'vocabulary.db')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(vocabulary, f, indent=2, ensure_ascii=False)
+
+        start = time.perf_counter()
+        memory = VocabularyQuery(json_path)
+        json_load = time.perf_counter() - start
+        start = time.perf_counter()
+        create_database(database_path, vocabulary)
+        database_load = time.perf_counter() - start
+        start = time.perf_counter()
+        database = SQLiteVocabularyQuery(database_path)
+        database_open = time.perf_counter() - start
+        memory.text_index
+
+        print(f"SQLite backend: {size} entries ({os.path.getsize(database_path) / 1e6:.0f} MB database)")
+        print(f"  JSON load + index build: {json_load:.2f}s")
+        print(f"  database bulk load: {database_load:.2f}s ({size / database_load:.0f} entries/s), "
+              f"open: {database_open * 1000:.1f}ms")
+
+        queries = {
+            'word': lambda query, number: query.search_senses(words[number]),
+            'autocomplete': lambda query, number: query.autocomplete(words[number][:3]),
+            'fuzzy': lambda query, number: query.search_fuzzy(words[number][:-1] + 'q'),
+            'text search': lambda query, number: query.search_text(words[number][:4] + ' leader'),
+            'random (hard)': lambda query, number: query.random_words(10, 'hard', seed=number),
+            'category': lambda query, number: query.search_by_category(categories[number % len(categories)]),
+            'facets': lambda query, number: query.faceted_search('difficulty:hard AND NOT pos:noun', 20),
+            'stats': lambda query, number: query.get_statistics(),
+        }
+        print(f"{'query':<16}{'memory ms':>12}{'sqlite ms':>12}")
+        for name, run in queries.items():
+            count = rounds if name not in ('category', 'facets', 'stats') else 10
+            # The first call builds anything lazily built (fuzzy index, sampling pools)
+            run(memory, 0)
+            run(database, 0)
+            memory_time = time_call(lambda: [run(memory, number) for number in range(count)], repeat=1)
+            database_time = time_call(lambda: [run(database, number) for number in range(count)], repeat=1)
+            print(f"{name:<16}{memory_time / count * 1000:>12.3f}{database_time / count * 1000:>12.3f}")
+        database.close()
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    'tokenizer': benchmark_tokenizer,
+    'parallel': benchmark_parallel_parse,
+    'normalizer': benchmark_normalizer,
+    'features': benchmark_features,
+    'categorizer': benchmark_categorizer,
+    'matching': benchmark_matching,
+    'difficulty': benchmark_difficulty,
+    'process': benchmark_process,
+    'indexes': benchmark_indexes,
+    'lookup': benchmark_lookup,
+    'autocomplete': benchmark_autocomplete,
+    'fuzzy': benchmark_fuzzy,
+    'bm25': benchmark_bm25,
+    'facets': benchmark_facets,
+    'sampling': benchmark_sampling,
+    'stats': benchmark_stats,
+    'batch': benchmark_batch,
+    'columns': benchmark_columns,
+    'snapshot': benchmark_snapshot,
+    'sqlite': benchmark_sqlite,
+}
+
+
+def main():
+    """Run the benchmarks named on the command line (all by default)."""
+    names = sys.argv[1:] or list(BENCHMARKS)
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Persistent LRU Cache
+
+A small JSON-backed key/value store used by the vocabulary scripts to skip
+work whose inputs have not changed between runs. Entries are kept in
+least-recently-used order and the oldest are evicted once the cache grows
+past its size limit.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+
+def content_hash(*parts: str) -> str:
+    """Return a stable hex digest of the given strings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def source_version(paths: Iterable[str]) -> str:
+    """Return a digest of source files, so edits to them invalidate cached results."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class LRUCache:
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        Args:
+            path: JSON file the cache is loaded from and saved to
+            max_entries: Maximum number of entries kept after eviction
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compute_seconds = 0.0
+        self.computed = 0
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache from disk, starting empty if it is missing, unreadable or malformed."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        # Every caller stores JSON objects, so anything else is a cache written by something else
+        if isinstance(data, dict) and all(isinstance(value, dict) for value in data.values()):
+            self.entries = OrderedDict(data)
+        else:
+            self.entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, marking it most recently used."""
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON object, evicting least recently used entries."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def record_compute(self, count: int, seconds: float) -> None:
+        """Note that computing ``count`` missed values took ``seconds``, to estimate time saved."""
+        self.computed += count
+        self.compute_seconds += seconds
+
+    def save(self) -> None:
+        """Write the cache to disk atomically, oldest entries first."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def stats_line(self, label: str = 'Cache') -> str:
+        """Summarize hits, misses and evictions for this run."""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups) * 100 if lookups else 0.0
+        line = (f"{label}: {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+                f"{self.evictions} evicted, {len(self.entries)} stored")
+        if self.computed:
+            # Assume hits would have cost as much as the values computed this run
+            saved = self.hits * self.compute_seconds / self.computed
+            line += f", ~{saved:.2f}s saved"
+        return line
@@ -7,13 +7,104 @@ This script analyzes SAT vocabulary words and assigns:
 2. Difficulty levels (easy, medium, hard) based on various factors
 """
 
+import argparse
 import json
 import re
-from typing import List, Dict, Any, Set
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Dict, Any, Optional, Set, Tuple
 from collections import defaultdict
 
+from vocab_automaton import KeywordAutomaton
+from vocab_cache import LRUCache, content_hash, source_version
+from vocab_text import stem_token
+
+try:
+    import numpy as np
+except ImportError:  # the vectorized difficulty path is optional
+    np = None
+
+DEFAULT_CACHE_FILE = 'vocab_categorizer.cache.json'
+
+# Changes whenever the categorizing or scoring code changes, invalidating cached entries
+CATEGORIZER_VERSION = source_version([__file__, KeywordAutomaton.find_ids.__code__.co_filename,
+                                      stem_token.__code__.co_filename])
+
+# How category keywords are matched against a definition and example
+MATCHING_MODES = ('substring', 'tokens')
+
+# Phrases that mark a definition as complex
+COMPLEX_INDICATORS = [
+    'characterized by', 'pertaining to', 'in accordance with', 'with respect to',
+    'philosophical', 'metaphysical', 'theoretical', 'conceptual', 'abstract',
+    'extremely', 'excessively', 'profoundly', 'inherently', 'fundamentally'
+]
+# Letter combinations suggesting a Latin or Greek origin
+LATIN_GREEK_INDICATORS = ['ph', 'ch', 'th', 'qu', 'x', 'z']
+# Parts of speech that add nothing to the difficulty score
+BASIC_PARTS_OF_SPEECH = ['n.', 'v.', 'adj.']
+DIFFICULTY_LEVELS = ['easy', 'medium', 'hard']
+
+# Substring-any tests over the lists above, as single regex searches
+_COMPLEX_INDICATOR = re.compile('|'.join(map(re.escape, COMPLEX_INDICATORS)))
+_LATIN_GREEK_INDICATOR = re.compile('|'.join(map(re.escape, LATIN_GREEK_INDICATORS)))
+_VOWEL_CODES = [ord(vowel) for vowel in 'aeiouy']
+
+_TOKEN = re.compile(r'[a-z]+')
+
+
+class _CodePoints:
+    """
+    A list of strings joined with NUL separators, as a NumPy array of code points.
+    
+    Row i occupies codes[starts[i]:starts[i] + lengths[i]] and is followed by a
+    0 code, so per-row reductions never see an empty segment.
+    """
+    
+    def __init__(self, texts: List[str]):
+        self.text = '\0'.join(texts) + '\0'
+        self.lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        self.starts = np.cumsum(self.lengths + 1) - (self.lengths + 1)
+        self.codes = np.frombuffer(self.text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    
+    def sum(self, mask) -> 'np.ndarray':
+        """Count the True positions of a code-aligned mask in each row."""
+        if not len(self.starts):
+            return np.zeros(0, dtype=np.int64)
+        return np.add.reduceat(mask, self.starts, dtype=np.int64)
+    
+    def count_runs(self, mask) -> 'np.ndarray':
+        """Count the maximal runs of True positions in each row."""
+        run_starts = mask.copy()
+        run_starts[1:] &= ~mask[:-1]
+        return self.sum(run_starts)
+    
+    def last_codes(self) -> 'np.ndarray':
+        """Return each row's final code point, or 0 for empty rows."""
+        return np.where(self.lengths > 0, self.codes[self.starts + self.lengths - 1], 0)
+    
+    def contains(self, pattern) -> 'np.ndarray':
+        """Flag the rows in which a regex (that cannot match NUL) finds a match."""
+        found = np.zeros(len(self.starts), dtype=bool)
+        positions = [match.start() for match in pattern.finditer(self.text)]
+        if positions:
+            found[np.searchsorted(self.starts, positions, side='right') - 1] = True
+        return found
+
+
 class VocabularyCategorizer:
-    def __init__(self):
+    def __init__(self, matching: str = 'substring'):
+        """
+        Args:
+            matching: 'substring' scores keywords found anywhere in the text;
+                'tokens' scores keywords that equal a whole (stemmed) word and
+                patterns that start a word
+        """
+        if matching not in MATCHING_MODES:
+            raise ValueError(f"Unknown matching mode '{matching}'. Available: {', '.join(MATCHING_MODES)}")
+        self.matching = matching
+        
         # Define semantic categories based on common SAT vocabulary themes
         self.categories = {
             'emotions_feelings': {
@@ -107,6 +198,69 @@ class VocabularyCategorizer:
         # Syllable patterns for difficulty assessment
         self.prefixes = ['un', 're', 'in', 'dis', 'en', 'non', 'over', 'mis', 'sub', 'pre', 'inter', 'fore', 'de', 'trans', 'super', 'semi', 'anti', 'mid', 'under']
         self.suffixes = ['ing', 'ed', 'er', 'est', 'ly', 'ion', 'tion', 'ation', 'ness', 'ment', 'ful', 'less', 'able', 'ible', 'ous', 'ious', 'al', 'ial', 'ic', 'ive', 'ity', 'ty']
+        
+        self.compile_taxonomy()
+
+    def compile_taxonomy(self) -> None:
+        """
+        Compile every category keyword and pattern into one keyword automaton.
+        
+        Call this again after editing self.categories.
+        """
+        self.category_names = list(self.categories)
+        # For each distinct string, the (category index, score) of every listing
+        listings = defaultdict(list)
+        for index, category_data in enumerate(self.categories.values()):
+            for keyword in category_data['keywords']:
+                listings[keyword].append((index, 2))
+            for pattern in category_data['patterns']:
+                listings[pattern].append((index, 3))
+        
+        self.taxonomy_automaton = KeywordAutomaton(listings)
+        self.taxonomy_hits = [listings[text] for text in self.taxonomy_automaton.patterns]
+        
+        # Token mode: keywords keyed by stem, patterns by the word prefix they match
+        keyword_stems = defaultdict(list)
+        pattern_prefixes = defaultdict(list)
+        for index, category_data in enumerate(self.categories.values()):
+            for keyword in category_data['keywords']:
+                keyword_stems[stem_token(keyword)].append((index, 2))
+            for pattern in category_data['patterns']:
+                pattern_prefixes[pattern].append((index, 3))
+        
+        self.keyword_stem_ids = {stem: i for i, stem in enumerate(keyword_stems)}
+        self.pattern_ids = {pattern: len(keyword_stems) + i for i, pattern in enumerate(pattern_prefixes)}
+        self.token_hits = list(keyword_stems.values()) + list(pattern_prefixes.values())
+        self.pattern_lengths = sorted({len(pattern) for pattern in pattern_prefixes})
+        # Distinct words seen so far -> ids of the stems and patterns they match
+        self.token_cache = {}
+
+    def taxonomy_version(self) -> str:
+        """
+        Digest of everything an entry's result depends on besides the entry itself:
+        the categories' keywords and patterns, the difficulty word lists, the
+        matching mode and the code.
+        """
+        taxonomy = json.dumps([self.categories, self.common_words, self.prefixes, self.suffixes],
+                              sort_keys=True)
+        return content_hash(CATEGORIZER_VERSION, self.matching, taxonomy)[:16]
+
+    def entry_cache_key(self, entry: Dict, version: str) -> str:
+        """Cache key for an entry: the fields it is scored on plus the taxonomy version."""
+        return content_hash(version, entry.get('word', ''), entry.get('definition', ''),
+                            entry.get('example', ''), entry.get('part_of_speech', ''))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Ship only the taxonomy and word lists; the compiled tables are rebuilt
+        state = self.__dict__.copy()
+        for name in ('category_names', 'taxonomy_automaton', 'taxonomy_hits', 'keyword_stem_ids',
+                     'pattern_ids', 'token_hits', 'pattern_lengths', 'token_cache'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.compile_taxonomy()
 
     def count_syllables(self, word: str) -> int:
         """Estimate syllable count for difficulty assessment."""
@@ -145,14 +299,8 @@ class VocabularyCategorizer:
         words_in_def = definition.lower().split()
         
         # Check for complex vocabulary in definition
-        complex_indicators = [
-            'characterized by', 'pertaining to', 'in accordance with', 'with respect to',
-            'philosophical', 'metaphysical', 'theoretical', 'conceptual', 'abstract',
-            'extremely', 'excessively', 'profoundly', 'inherently', 'fundamentally'
-        ]
-        
         definition_lower = definition.lower()
-        has_complex_language = any(indicator in definition_lower for indicator in complex_indicators)
+        has_complex_language = any(indicator in definition_lower for indicator in COMPLEX_INDICATORS)
         
         # Length and structure analysis
         avg_word_length = sum(len(word) for word in words_in_def) / len(words_in_def) if words_in_def else 0
@@ -166,25 +314,19 @@ class VocabularyCategorizer:
 
     def categorize_word(self, word: str, definition: str, example: str) -> List[str]:
         """Categorize a word based on its definition and example."""
-        categories = []
         text_to_analyze = f"{word} {definition} {example}".lower()
         
-        for category_name, category_data in self.categories.items():
-            score = 0
-            
-            # Check keywords
-            for keyword in category_data['keywords']:
-                if keyword in text_to_analyze:
-                    score += 2
-            
-            # Check patterns
-            for pattern in category_data['patterns']:
-                if pattern in text_to_analyze:
-                    score += 3
-            
-            # Add category if score is high enough
-            if score >= 3:
-                categories.append(category_name)
+        if self.matching == 'tokens':
+            scores = self._token_scores(text_to_analyze)
+        else:
+            # One scan finds every keyword and pattern present in the text
+            scores = [0] * len(self.category_names)
+            for text_id in self.taxonomy_automaton.find_ids(text_to_analyze):
+                for index, score in self.taxonomy_hits[text_id]:
+                    scores[index] += score
+        
+        # Add categories whose score is high enough, in taxonomy order
+        categories = [name for name, score in zip(self.category_names, scores) if score >= 3]
         
         # Default category if no matches
         if not categories:
@@ -192,6 +334,34 @@ class VocabularyCategorizer:
         
         return categories
 
+    def _token_ids(self, token: str) -> frozenset:
+        """Return the ids of the keyword stem and patterns a single word matches."""
+        ids = {self.pattern_ids[token[:length]] for length in self.pattern_lengths
+               if token[:length] in self.pattern_ids}
+        stem_id = self.keyword_stem_ids.get(stem_token(token))
+        if stem_id is not None:
+            ids.add(stem_id)
+        return frozenset(ids)
+
+    def _token_scores(self, text: str) -> List[int]:
+        """Score categories by intersecting the text's word set with the taxonomy."""
+        token_cache = self.token_cache
+        
+        # Each keyword stem and pattern counts once, however often it occurs
+        hit_ids = set()
+        for token in set(_TOKEN.findall(text)):
+            ids = token_cache.get(token)
+            if ids is None:
+                ids = token_cache[token] = self._token_ids(token)
+            if ids:
+                hit_ids |= ids
+        
+        scores = [0] * len(self.category_names)
+        for hit_id in hit_ids:
+            for index, score in self.token_hits[hit_id]:
+                scores[index] += score
+        return scores
+
     def assess_difficulty(self, word: str, definition: str, part_of_speech: str) -> str:
         """Assess difficulty level of a vocabulary word."""
         difficulty_score = 0
@@ -228,15 +398,14 @@ class VocabularyCategorizer:
             difficulty_score += 2
         
         # Factor 5: Part of speech complexity
-        if part_of_speech in ['n.', 'v.', 'adj.']:
+        if part_of_speech in BASIC_PARTS_OF_SPEECH:
             difficulty_score += 0
         else:  # adverbs, complex forms
             difficulty_score += 1
         
         # Factor 6: Etymology/origin indicators
         word_lower = word.lower()
-        latin_greek_indicators = ['ph', 'ch', 'th', 'qu', 'x', 'z']
-        if any(indicator in word_lower for indicator in latin_greek_indicators):
+        if any(indicator in word_lower for indicator in LATIN_GREEK_INDICATORS):
             if len(word) > 6:  # Only for longer words
                 difficulty_score += 1
         
@@ -252,29 +421,215 @@ class VocabularyCategorizer:
         else:
             return 'hard'
 
-    def process_vocabulary(self, vocab_data: List[Dict]) -> List[Dict]:
-        """Process vocabulary data and add categories and difficulty."""
+    def difficulty_features(self, vocab_data: List[Dict], chunk_size: int = 65536) -> Dict[str, Any]:
+        """
+        Build one NumPy column per assess_difficulty factor for a whole dataset.
+        
+        Words and definitions are scanned as NUL-joined code point arrays, so
+        syllables, definition word lengths and indicator phrases are found with
+        array operations instead of per-entry Python loops.
+        
+        Args:
+            vocab_data: Parsed vocabulary entries
+            chunk_size: Entries converted to arrays at a time, bounding memory use
+        
+        Returns:
+            Dict of equal-length arrays: word_length, syllables, complex_morphology,
+            complex_language, definition_word_length, advanced_pos, latin_greek, common
+        """
+        if np is None:
+            raise ImportError("NumPy is required for vectorized difficulty scoring")
+        
+        chunks = [self._difficulty_features_chunk(vocab_data[start:start + chunk_size])
+                  for start in range(0, len(vocab_data), chunk_size)]
+        if not chunks:
+            chunks = [self._difficulty_features_chunk([])]
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+    def _difficulty_features_chunk(self, vocab_data: List[Dict]) -> Dict[str, Any]:
+        common = set(self.common_words['easy'])
+        words = [entry.get('word', '') for entry in vocab_data]
+        words_lower = [word.lower() for word in words]
+        syllable_words = _CodePoints([word.strip() for word in words_lower])
+        definitions = _CodePoints([entry.get('definition', '').lower() for entry in vocab_data])
+        
+        # Complex morphology means at least two matching affixes in total;
+        # count them with one dict lookup per affix length, once per distinct word
+        prefixes = defaultdict(int)
+        for prefix in self.prefixes:
+            prefixes[prefix] += 1
+        suffixes = defaultdict(int)
+        for suffix in self.suffixes:
+            suffixes[suffix] += 1
+        prefix_lengths = sorted({len(prefix) for prefix in prefixes})
+        suffix_lengths = sorted({len(suffix) for suffix in suffixes})
+        
+        def affix_count(word):
+            length = len(word)
+            return (sum([prefixes.get(word[:n], 0) for n in prefix_lengths if n <= length])
+                    + sum([suffixes.get(word[-n:], 0) for n in suffix_lengths if n <= length]))
+        
+        morphology = {word: affix_count(word) >= 2 for word in set(words_lower)}
+        
+        # Syllables: vowel groups, less a silent final 'e', at least one
+        vowel_groups = syllable_words.count_runs(np.isin(syllable_words.codes, _VOWEL_CODES))
+        silent_e = syllable_words.last_codes() == ord('e')
+        syllables = np.maximum(1, vowel_groups - (silent_e & (vowel_groups > 1)))
+        
+        # Definition words as str.split() sees them: runs of non-whitespace
+        codes = definitions.codes
+        unique_codes = np.unique(codes).tolist()
+        whitespace = [code for code in unique_codes if chr(code).isspace()]
+        text = ~np.isin(codes, whitespace) & (codes != 0)
+        definition_chars = definitions.sum(text)
+        definition_words = definitions.count_runs(text)
+        
+        size = len(vocab_data)
+        return {
+            'word_length': np.fromiter(map(len, words), dtype=np.int64, count=size),
+            'syllables': syllables,
+            'complex_morphology': np.fromiter(map(morphology.__getitem__, words_lower),
+                                              dtype=bool, count=size),
+            'complex_language': definitions.contains(_COMPLEX_INDICATOR),
+            'definition_word_length': np.divide(definition_chars, definition_words,
+                                                out=np.zeros(size), where=definition_words > 0),
+            'advanced_pos': np.fromiter((entry.get('part_of_speech', '') not in BASIC_PARTS_OF_SPEECH
+                                         for entry in vocab_data), dtype=bool, count=size),
+            'latin_greek': _CodePoints(words_lower).contains(_LATIN_GREEK_INDICATOR),
+            'common': np.fromiter((word in common for word in words_lower), dtype=bool, count=size),
+        }
+
+    def assess_difficulty_batch(self, vocab_data: List[Dict]) -> List[str]:
+        """Vectorized assess_difficulty for every entry; results match the scalar path."""
+        return self.score_difficulty(self.difficulty_features(vocab_data))
+
+    def score_difficulty(self, columns: Dict[str, Any]) -> List[str]:
+        """Turn difficulty_features columns into difficulty levels."""
+        word_length = columns['word_length']
+        syllables = columns['syllables']
+        average = columns['definition_word_length']
+        
+        score = (word_length > 4).astype(np.int64) + (word_length > 7)
+        score += (syllables > 2).astype(np.int64) + (syllables > 3)
+        score += 2 * columns['complex_morphology']
+        score += np.where(columns['complex_language'] | (average > 6), 2, average > 4.5)
+        score += columns['advanced_pos']
+        score += columns['latin_greek'] & (word_length > 6)
+        score -= 2 * columns['common']
+        
+        levels = (score > 2).astype(np.int64) + (score > 5)
+        return np.array(DIFFICULTY_LEVELS)[levels].tolist()
+
+    def process_vocabulary(self, vocab_data: List[Dict], vectorized: bool = False,
+                           workers: int = 1, chunk_size: int = 2000,
+                           cache: Optional[LRUCache] = None) -> List[Dict]:
+        """
+        Process vocabulary data and add categories and difficulty.
+        
+        Args:
+            vocab_data: Parsed vocabulary entries
+            vectorized: Score difficulty for the whole dataset at once with NumPy
+            workers: Number of processes; entries are processed in chunks and the
+                results merged in input order, so output does not depend on it
+            chunk_size: Entries per chunk sent to a worker process
+            cache: Optional cache of previously processed entries, updated in place;
+                only entries whose key is missing are recomputed
+        """
+        if cache is not None:
+            return self._process_cached(vocab_data, cache, vectorized, workers, chunk_size)
+        if workers <= 1:
+            return self._process_chunk(vocab_data, vectorized)
+        
         processed_vocab = []
         category_stats = defaultdict(int)
         difficulty_stats = defaultdict(int)
         
-        for entry in vocab_data:
+        chunks = [vocab_data[start:start + chunk_size] for start in range(0, len(vocab_data), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            for chunk_vocab, chunk_categories, chunk_difficulties in executor.map(
+                    _process_chunk, chunks, repeat(vectorized)):
+                processed_vocab.extend(chunk_vocab)
+                # Merging in chunk order keeps the serial first-seen key order
+                for category, count in chunk_categories.items():
+                    category_stats[category] += count
+                for difficulty, count in chunk_difficulties.items():
+                    difficulty_stats[difficulty] += count
+        
+        return processed_vocab, dict(category_stats), dict(difficulty_stats)
+
+    def _process_cached(self, vocab_data: List[Dict], cache: LRUCache, vectorized: bool,
+                        workers: int, chunk_size: int) -> Tuple[List[Dict], Dict[str, int], Dict[str, int]]:
+        """Reuse cached results and process only the entries that changed."""
+        version = self.taxonomy_version()
+        keys = [self.entry_cache_key(entry, version) for entry in vocab_data]
+        cached = [cache.get(key) for key in keys]
+        
+        misses = [entry for entry, result in zip(vocab_data, cached) if result is None]
+        computed = iter([])
+        if misses:
+            start = time.perf_counter()
+            computed = iter(self.process_vocabulary(misses, vectorized, workers, chunk_size)[0])
+            cache.record_compute(len(misses), time.perf_counter() - start)
+        
+        processed_vocab = []
+        category_stats = defaultdict(int)
+        difficulty_stats = defaultdict(int)
+        
+        for entry, key, result in zip(vocab_data, keys, cached):
+            if result is None:
+                enhanced_entry = next(computed)
+                cache.put(key, {
+                    'categories': enhanced_entry['categories'],
+                    'difficulty': enhanced_entry['difficulty'],
+                    'syllable_count': enhanced_entry['syllable_count']
+                })
+            else:
+                enhanced_entry = entry.copy()
+                enhanced_entry['categories'] = result['categories']
+                enhanced_entry['difficulty'] = result['difficulty']
+                enhanced_entry['syllable_count'] = result['syllable_count']
+                enhanced_entry['word_length'] = len(entry.get('word', ''))
+            
+            processed_vocab.append(enhanced_entry)
+            
+            # Update statistics
+            for category in enhanced_entry['categories']:
+                category_stats[category] += 1
+            difficulty_stats[enhanced_entry['difficulty']] += 1
+        
+        return processed_vocab, dict(category_stats), dict(difficulty_stats)
+
+    def _process_chunk(self, vocab_data: List[Dict],
+                       vectorized: bool) -> Tuple[List[Dict], Dict[str, int], Dict[str, int]]:
+        """Categorize and score entries in this process."""
+        processed_vocab = []
+        category_stats = defaultdict(int)
+        difficulty_stats = defaultdict(int)
+        
+        if vectorized:
+            columns = self.difficulty_features(vocab_data)
+            difficulties = self.score_difficulty(columns)
+            syllable_counts = columns['syllables'].tolist()
+        else:
+            difficulties = [self.assess_difficulty(entry.get('word', ''), entry.get('definition', ''),
+                                                   entry.get('part_of_speech', ''))
+                            for entry in vocab_data]
+            syllable_counts = [self.count_syllables(entry.get('word', '')) for entry in vocab_data]
+        
+        for entry, difficulty, syllable_count in zip(vocab_data, difficulties, syllable_counts):
             word = entry.get('word', '')
             definition = entry.get('definition', '')
             example = entry.get('example', '')
-            part_of_speech = entry.get('part_of_speech', '')
             
             # Categorize word
             categories = self.categorize_word(word, definition, example)
             
-            # Assess difficulty
-            difficulty = self.assess_difficulty(word, definition, part_of_speech)
-            
             # Create enhanced entry
             enhanced_entry = entry.copy()
             enhanced_entry['categories'] = categories
             enhanced_entry['difficulty'] = difficulty
-            enhanced_entry['syllable_count'] = self.count_syllables(word)
+            enhanced_entry['syllable_count'] = syllable_count
             enhanced_entry['word_length'] = len(word)
             
             processed_vocab.append(enhanced_entry)
@@ -286,10 +641,38 @@ class VocabularyCategorizer:
         
         return processed_vocab, dict(category_stats), dict(difficulty_stats)
 
+# The categorizer each worker process was started with
+_worker_categorizer = None
+
+def _init_worker(categorizer: VocabularyCategorizer) -> None:
+    """Worker-side initializer for process_vocabulary."""
+    global _worker_categorizer
+    _worker_categorizer = categorizer
+
+def _process_chunk(vocab_data: List[Dict], vectorized: bool) -> Tuple[List[Dict], Dict[str, int], Dict[str, int]]:
+    """Worker-side helper for process_vocabulary."""
+    return _worker_categorizer._process_chunk(vocab_data, vectorized)
+
 def main():
     """Main function to run the vocabulary categorizer."""
+    arg_parser = argparse.ArgumentParser(description="Categorize SAT vocabulary and assess difficulty.")
+    arg_parser.add_argument('--matching', choices=MATCHING_MODES, default='substring',
+                            help="how category keywords are matched (default: substring)")
+    arg_parser.add_argument('--vectorized', action='store_true',
+                            help="score difficulty for all words at once with NumPy")
+    arg_parser.add_argument('--workers', type=int, default=1,
+                            help="number of processes used to process entries (default: 1)")
+    arg_parser.add_argument('--cache', default=DEFAULT_CACHE_FILE,
+                            help=f"entry cache file (default: {DEFAULT_CACHE_FILE})")
+    arg_parser.add_argument('--cache-size', type=int, default=100000,
+                            help="maximum number of cached entries (default: 100000)")
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help="recategorize every entry without reading or writing the cache")
+    args = arg_parser.parse_args()
+    
     input_file = 'sat_vocabulary_parsed.json'
     output_file = 'sat_vocabulary_categorized.json'
+    cache = None if args.no_cache else LRUCache(args.cache, max_entries=args.cache_size)
     
     try:
         # Load vocabulary data
@@ -299,10 +682,15 @@ def main():
         print(f"Processing {len(vocab_data)} vocabulary words...")
         
         # Initialize categorizer
-        categorizer = VocabularyCategorizer()
+        categorizer = VocabularyCategorizer(matching=args.matching)
         
         # Process vocabulary
-        processed_vocab, category_stats, difficulty_stats = categorizer.process_vocabulary(vocab_data)
+        processed_vocab, category_stats, difficulty_stats = categorizer.process_vocabulary(
+            vocab_data, vectorized=args.vectorized, workers=args.workers, cache=cache)
+        
+        if cache is not None:
+            cache.save()
+            print(cache.stats_line('Entry cache'))
         
         # Save processed data
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Columnar Vocabulary Store
+
+Holds categorized vocabulary entries column by column instead of as one dict
+per entry. Repetitive fields (difficulty, part of speech and the category
+list) are dictionary-encoded as small integer codes, numeric fields live in
+typed arrays, and only the free text (word, definition, example) is kept as
+strings. Indexing the store returns a lightweight read-only row view that
+behaves like the entry dict it replaces, so code written for lists of dicts
+runs on it unchanged.
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Fields every categorized entry has, in the order the categorizer writes them
+ENTRY_FIELDS = ('word', 'part_of_speech', 'definition', 'example', 'page',
+                'categories', 'difficulty', 'syllable_count', 'word_length')
+# Fields an entry may leave out, and the value each then takes
+OPTIONAL_FIELDS = {'example': '', 'page': 0}
+_ENTRY_FIELD_SET = frozenset(ENTRY_FIELDS)
+
+
+def complete_entry(entry: Mapping) -> Mapping:
+    """
+    Fill in any OPTIONAL_FIELDS an entry leaves out.
+
+    Returns:
+        entry itself if it has every ENTRY_FIELDS key, otherwise a completed copy
+
+    Raises:
+        ValueError: If the entry lacks a field that is not optional
+    """
+    # Rows of a columnar store always have every field
+    if isinstance(entry, VocabularyRow) or entry.keys() >= _ENTRY_FIELD_SET:
+        return entry
+    missing = [field for field in ENTRY_FIELDS if field not in entry]
+    required = [field for field in missing if field not in OPTIONAL_FIELDS]
+    if required:
+        raise ValueError(f"Vocabulary entry is missing {', '.join(required)}")
+    completed = dict(entry)
+    for field in missing:
+        completed[field] = OPTIONAL_FIELDS[field]
+    return completed
+
+
+class CodedColumn:
+    """A column of repetitive values stored as codes into a table of distinct values."""
+
+    def __init__(self, values: Iterable[Any] = (), codes: Optional[Sequence] = None):
+        """
+        Args:
+            values: Distinct values already coded, in code order
+            codes: Codes already stored (default: none)
+        """
+        self.values: List[Any] = list(values)
+        self.codes_by_value: Dict[Any, int] = {value: code for code, value in enumerate(self.values)}
+        self.codes = array('H') if codes is None else codes
+
+    def encode(self, value: Any) -> int:
+        code = self.codes_by_value.get(value)
+        if code is None:
+            code = self.codes_by_value[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value: Any) -> None:
+        self.codes.append(self.encode(value))
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[self.codes[index]]
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        self.codes[index] = self.encode(value)
+
+
+class VocabularyRow(Mapping):
+    """Read-only view of one entry of a VocabularyColumns store."""
+
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns: 'VocabularyColumns', index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        getter = _FIELD_GETTERS.get(key)
+        if getter is not None:
+            return getter(self._columns, self._index)
+        extra = self._columns.extras.get(self._index)
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        return extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from ENTRY_FIELDS
+        yield from self._columns.extras.get(self._index, ())
+
+    def __len__(self) -> int:
+        return len(ENTRY_FIELDS) + len(self._columns.extras.get(self._index, ()))
+
+    def __repr__(self) -> str:
+        return f"VocabularyRow({dict(self)!r})"
+
+
+# Each field's value for the entry at an index; categories come back as a fresh list
+_FIELD_GETTERS = {
+    'word': lambda columns, index: columns.words[index],
+    'part_of_speech': lambda columns, index: columns.parts_of_speech[index],
+    'definition': lambda columns, index: columns.definitions[index],
+    'example': lambda columns, index: columns.examples[index],
+    'page': lambda columns, index: columns.pages[index],
+    'categories': lambda columns, index: list(columns.categories[index]),
+    'difficulty': lambda columns, index: columns.difficulties[index],
+    'syllable_count': lambda columns, index: columns.syllable_counts[index],
+    'word_length': lambda columns, index: columns.word_lengths[index],
+}
+
+
+class VocabularyColumns(Sequence):
+    def __init__(self, entries: Iterable[Dict] = ()):
+        """
+        Args:
+            entries: Categorized vocabulary entries (dicts with ENTRY_FIELDS,
+                of which OPTIONAL_FIELDS may be left out)
+        """
+        self.words: List[str] = []
+        self.definitions: List[str] = []
+        self.examples: List[str] = []
+        self.pages = array('i')
+        self.syllable_counts = array('H')
+        self.word_lengths = array('H')
+        self.parts_of_speech = CodedColumn()
+        self.difficulties = CodedColumn()
+        # Whole category lists are encoded, since few distinct combinations occur
+        self.categories = CodedColumn()
+        # Fields beyond ENTRY_FIELDS (e.g. definition_number), by index
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        self.extend(entries)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [VocabularyRow(self, position) for position in range(*index.indices(len(self.words)))]
+        if index < 0:
+            index += len(self.words)
+        if not 0 <= index < len(self.words):
+            raise IndexError("vocabulary index out of range")
+        return VocabularyRow(self, index)
+
+    def __iter__(self) -> Iterator[VocabularyRow]:
+        return (VocabularyRow(self, index) for index in range(len(self.words)))
+
+    def column(self, field: str) -> Sequence:
+        """
+        Every entry's value of one of ENTRY_FIELDS, decoded in bulk.
+
+        Text and numeric columns are returned as stored and must not be modified.
+        Categories come back as tuples.
+        """
+        stored = {
+            'word': self.words, 'definition': self.definitions, 'example': self.examples,
+            'page': self.pages, 'syllable_count': self.syllable_counts, 'word_length': self.word_lengths,
+            'part_of_speech': self.parts_of_speech, 'difficulty': self.difficulties,
+            'categories': self.categories,
+        }[field]
+        if isinstance(stored, CodedColumn):
+            values = stored.values
+            return [values[code] for code in stored.codes]
+        return stored
+
+    def append(self, entry: Dict) -> None:
+        """
+        Add an entry (a dict, or a row of any store) at the end.
+
+        Raises:
+            ValueError: If the entry lacks a field that is not optional
+        """
+        entry = complete_entry(entry)
+        self.words.append(entry['word'])
+        self.definitions.append(entry['definition'])
+        self.examples.append(entry['example'])
+        self.pages.append(entry['page'])
+        self.syllable_counts.append(entry['syllable_count'])
+        self.word_lengths.append(entry['word_length'])
+        self.parts_of_speech.append(entry['part_of_speech'])
+        self.difficulties.append(entry['difficulty'])
+        self.categories.append(tuple(entry['categories']))
+        self._set_extras(len(self.words) - 1, entry)
+
+    def extend(self, entries: Iterable[Dict]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def __setitem__(self, index: int, entry: Dict) -> None:
+        """Replace the entry at index (reading entry's values before overwriting)."""
+        if index < 0:
+            index += len(self.words)
+        values = dict(complete_entry(entry))
+        self.words[index] = values['word']
+        self.definitions[index] = values['definition']
+        self.examples[index] = values['example']
+        self.pages[index] = values['page']
+        self.syllable_counts[index] = values['syllable_count']
+        self.word_lengths[index] = values['word_length']
+        self.parts_of_speech[index] = values['part_of_speech']
+        self.difficulties[index] = values['difficulty']
+        self.categories[index] = tuple(values['categories'])
+        self._set_extras(index, values)
+
+    def pop(self) -> Dict:
+        """Remove the last entry, returning it as a dict."""
+        index = len(self.words) - 1
+        entry = dict(self[index])
+        for column in (self.words, self.definitions, self.examples, self.pages,
+                       self.syllable_counts, self.word_lengths, self.parts_of_speech.codes,
+                       self.difficulties.codes, self.categories.codes):
+            column.pop()
+        self.extras.pop(index, None)
+        return entry
+
+    def _set_extras(self, index: int, entry: Dict) -> None:
+        if len(entry) == len(ENTRY_FIELDS):
+            self.extras.pop(index, None)
+            return
+        extra = {key: value for key, value in entry.items() if key not in _FIELD_GETTERS}
+        if extra:
+            self.extras[index] = extra
+        else:
+            self.extras.pop(index, None)
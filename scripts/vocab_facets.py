@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Facet Bitmaps and Filter Queries
+
+Each facet value (a difficulty, category, part of speech, syllable bucket or
+length bucket) is stored as a Python int used as a bitmap over entry ids, so
+compound filters such as
+
+    difficulty:hard AND category:emotions_feelings AND NOT pos:noun
+
+are evaluated with a few bitwise operations, and the count of every facet
+value within the result is a popcount of one AND per value.
+"""
+
+import re
+from functools import reduce
+from operator import and_, or_
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Facets a filter can name; each is present in an index even when no entry has a value for it
+FACETS = ('difficulty', 'category', 'pos', 'syllables', 'length')
+
+# (label, lowest value, highest value) of the bucketed numeric facets
+_OPEN_END = 1 << 31
+SYLLABLE_BUCKETS = (('1', 1, 1), ('2', 2, 2), ('3', 3, 3), ('4', 4, 4), ('5+', 5, _OPEN_END))
+LENGTH_BUCKETS = (('1-5', 1, 5), ('6-7', 6, 7), ('8-9', 8, 9), ('10-11', 10, 11), ('12+', 12, _OPEN_END))
+
+_FILTER_TOKEN = re.compile(r'\(|\)|[^\s()]+')
+# Deepest parenthesis nesting a filter may use; bounds recursion and the SQL the SQLite backend builds
+MAX_FILTER_DEPTH = 16
+
+# Number of set bits in a bitmap; int.bit_count is only available from Python 3.10
+try:
+    _popcount = int.bit_count
+except AttributeError:
+    def _popcount(bitmap: int) -> int:
+        return bin(bitmap).count('1')
+
+# Positions of the set bits in every byte value, for listing a bitmap's ids
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bucket_label(value: int, buckets: Tuple[Tuple[str, int, int], ...]) -> Optional[str]:
+    """Bucket a number falls in, e.g. '8-9' for a word length of 8 in LENGTH_BUCKETS."""
+    for label, low, high in buckets:
+        if low <= value <= high:
+            return label
+    return None
+
+
+def ids_to_bitmap(entry_ids: Iterable[int], size: int) -> int:
+    """Build a bitmap with the given ids (all below size) set."""
+    bits = bytearray((size + 7) // 8)
+    for entry_id in entry_ids:
+        bits[entry_id >> 3] |= 1 << (entry_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def bitmap_ids(bitmap: int) -> Iterator[int]:
+    """Yield the ids set in a bitmap, in ascending order."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for index, byte in enumerate(data):
+        if byte:
+            base = index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+class FacetIndex:
+    def __init__(self, facet_ids: Dict[str, Dict[str, Iterable[int]]], size: int):
+        """
+        Args:
+            facet_ids: Entry ids for every value of every facet
+            size: Number of entries; ids run from 0 to size - 1
+        """
+        self.size = size
+        self.all = (1 << size) - 1
+        self.bitmaps: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        for facet, values in facet_ids.items():
+            self.bitmaps[facet] = {str(value).lower(): ids_to_bitmap(entry_ids, size)
+                                   for value, entry_ids in values.items()}
+
+    @classmethod
+    def from_bitmaps(cls, bitmaps: Dict[str, Dict[str, int]], size: int) -> 'FacetIndex':
+        """An index over bitmaps built earlier, e.g. read back from a snapshot."""
+        index = cls({}, size)
+        index.bitmaps.update(bitmaps)
+        return index
+
+    def add(self, entry_id: int, values: Dict[str, Iterable[str]]) -> None:
+        """Set an entry's bit in the bitmap of each of its facet values."""
+        self.size = max(self.size, entry_id + 1)
+        self.all = (1 << self.size) - 1
+        bit = 1 << entry_id
+        for facet, facet_values in values.items():
+            bitmaps = self.bitmaps.setdefault(facet, {})
+            for value in facet_values:
+                value = str(value).lower()
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def remove(self, entry_id: int, values: Dict[str, Iterable[str]]) -> None:
+        """Clear an entry's bit from the bitmaps of its facet values."""
+        bit = 1 << entry_id
+        for facet, facet_values in values.items():
+            bitmaps = self.bitmaps[facet]
+            for value in facet_values:
+                value = str(value).lower()
+                bitmaps[value] &= ~bit
+                if not bitmaps[value]:
+                    del bitmaps[value]
+
+    def resize(self, size: int) -> None:
+        """Set the number of entries, after the last ones have been removed."""
+        self.size = size
+        self.all = (1 << size) - 1
+
+    def value(self, facet: str, value: str) -> int:
+        """Bitmap of one facet value (empty if no entry has it)."""
+        if facet not in self.bitmaps:
+            raise ValueError(f"Unknown facet '{facet}'. Available: {', '.join(self.bitmaps)}")
+        return self.bitmaps[facet].get(value.lower(), 0)
+
+    def evaluate(self, query: str) -> int:
+        """
+        Evaluate a filter query (see parse_filter) to a bitmap of matching entry ids.
+
+        An empty query matches everything.
+
+        Raises:
+            ValueError: If the query is malformed or names an unknown facet
+        """
+        node = parse_filter(query)
+        return self.all if node is None else self._evaluate(node)
+
+    def _evaluate(self, node: tuple) -> int:
+        kind = node[0]
+        if kind == 'term':
+            return self.value(node[1], node[2])
+        if kind == 'not':
+            return self.all & ~self._evaluate(node[1])
+        bitmaps = [self._evaluate(child) for child in node[1]]
+        return reduce(or_ if kind == 'or' else and_, bitmaps)
+
+    def counts(self, bitmap: int, facets: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """Count the entries in bitmap with each value of each facet, omitting zeros."""
+        counts = {}
+        for facet in (self.bitmaps if facets is None else facets):
+            value_counts = {}
+            for value, value_bitmap in self.bitmaps[facet].items():
+                count = _popcount(bitmap & value_bitmap)
+                if count:
+                    value_counts[value] = count
+            counts[facet] = value_counts
+        return counts
+
+
+def parse_filter(query: str) -> Optional[tuple]:
+    """
+    Parse a filter query such as 'difficulty:hard AND NOT pos:noun'.
+
+    Terms are ``facet:value``; NOT binds tighter than AND, which binds
+    tighter than OR, and adjacent terms are ANDed. Parentheses group, up
+    to MAX_FILTER_DEPTH deep; repeated NOTs cancel in pairs.
+
+    Returns:
+        A tree of ('or', [children]), ('and', [children]), ('not', child)
+        and ('term', facet, value) nodes (facet lowercased), or None for
+        an empty query
+
+    Raises:
+        ValueError: If the query is malformed or nested too deeply
+    """
+    parser = _FilterParser(_FILTER_TOKEN.findall(query))
+    if not parser.tokens:
+        return None
+    node = parser.parse_or()
+    if parser.peek() is not None:
+        raise ValueError(f"Unexpected '{parser.peek()}' in filter")
+    return node
+
+
+class _FilterParser:
+    """Recursive descent over filter tokens, producing a parse_filter tree."""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _keyword(self, keyword: str) -> bool:
+        token = self.peek()
+        if token is not None and token.upper() == keyword:
+            self.position += 1
+            return True
+        return False
+
+    def parse_or(self) -> tuple:
+        children = [self.parse_and()]
+        while self._keyword('OR'):
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def parse_and(self) -> tuple:
+        children = [self.parse_not()]
+        while True:
+            if self._keyword('AND'):
+                children.append(self.parse_not())
+                continue
+            token = self.peek()
+            # Adjacent terms are an implicit AND
+            if token is None or token == ')' or token.upper() == 'OR':
+                return children[0] if len(children) == 1 else ('and', children)
+            children.append(self.parse_not())
+
+    def parse_not(self) -> tuple:
+        negated = False
+        while self._keyword('NOT'):
+            negated = not negated
+        node = self.parse_term()
+        return ('not', node) if negated else node
+
+    def parse_term(self) -> tuple:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Filter ends where a term was expected")
+        self.position += 1
+        if token == '(':
+            if self.depth == MAX_FILTER_DEPTH:
+                raise ValueError("Filter nested too deeply")
+            self.depth += 1
+            node = self.parse_or()
+            if self.peek() != ')':
+                raise ValueError("Missing ')' in filter")
+            self.position += 1
+            self.depth -= 1
+            return node
+        facet, separator, value = token.partition(':')
+        if not separator or not value:
+            raise ValueError(f"Expected facet:value in filter, got '{token}'")
+        return ('term', facet.lower(), value)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Headword Index
+
+Symmetric-delete (SymSpell-style) index for misspelling-tolerant lookup. Every
+headword's prefix is stored under each string obtainable by deleting up to
+``max_distance`` characters from it; a query generates the same deletes of
+its own prefix, so candidates within the edit distance are found by hash
+lookups and only those few are compared with a real Levenshtein distance.
+
+Postings are kept in flat integer arrays and strings in NUL-joined blobs, so a
+saved index loads without unpickling millions of small objects.
+"""
+
+import pickle
+from array import array
+from itertools import accumulate, chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+INDEX_FORMAT = 1
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein distance between a and b, or max_distance + 1 if it is larger.
+
+    Uses Myers' bit-parallel algorithm: one column of the edit matrix is
+    updated per character of b with a handful of integer operations.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        return len(a) + len(b)
+
+    # Bit i of peq[char] is set where a[i] == char
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    positive, negative = full, 0
+    score = len(a)
+    for char in b:
+        eq = peq.get(char, 0)
+        vertical = eq | negative
+        horizontal = (((eq & positive) + positive) ^ positive) | eq
+        h_positive = negative | ~(horizontal | positive)
+        h_negative = positive & horizontal
+        if h_positive & last:
+            score += 1
+        elif h_negative & last:
+            score -= 1
+        h_positive = (h_positive << 1) | 1
+        h_negative <<= 1
+        positive = (h_negative | ~(vertical | h_positive)) & full
+        negative = h_positive & vertical & full
+    return min(score, max_distance + 1)
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """Return word and every string made by deleting up to max_distance characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {candidate[:i] + candidate[i + 1:]
+                    for candidate in frontier for i in range(len(candidate))} - found
+        found |= frontier
+    return found
+
+
+class FuzzyIndex:
+    def __init__(self, words: Iterable[str], max_distance: int = 2, prefix_length: int = 7):
+        """
+        Args:
+            words: Headwords to index (already normalized); duplicates are ignored
+            max_distance: Largest edit distance lookups can ask for
+            prefix_length: Only this many leading characters are expanded into deletes
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words: List[str] = list(dict.fromkeys(words))
+
+        # Delete -> ids of the words whose prefix produces it
+        buckets: Dict[str, List[int]] = {}
+        prefix_deletes: Dict[str, Set[str]] = {}
+        for word_id, word in enumerate(self.words):
+            prefix = word[:prefix_length]
+            keys = prefix_deletes.get(prefix)
+            if keys is None:
+                keys = prefix_deletes[prefix] = deletes(prefix, max_distance)
+            for key in keys:
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [word_id]
+                else:
+                    bucket.append(word_id)
+
+        # Delete -> slot; a slot's word ids are postings[offsets[slot]:offsets[slot + 1]]
+        self.slots: Dict[str, int] = dict(zip(buckets, range(len(buckets))))
+        self.offsets = array('I', chain([0], accumulate(map(len, buckets.values()))))
+        self.postings = array('I', chain.from_iterable(buckets.values()))
+
+    def lookup(self, term: str, max_distance: Optional[int] = None,
+               limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Find indexed words within max_distance edits of term.
+
+        Returns:
+            (word, distance) pairs, closest first, then alphabetically
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        if max_distance > self.max_distance:
+            raise ValueError(f"Index was built for distances up to {self.max_distance}")
+
+        words = self.words
+        offsets = self.offsets
+        seen: Set[int] = set()
+        matches = []
+        for key in deletes(term[:self.prefix_length], max_distance):
+            slot = self.slots.get(key)
+            if slot is None:
+                continue
+            for word_id in self.postings[offsets[slot]:offsets[slot + 1]]:
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+                distance = edit_distance(term, words[word_id], max_distance)
+                if distance <= max_distance:
+                    matches.append((words[word_id], distance))
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches[:limit] if limit is not None else matches
+
+    def save(self, path: str) -> None:
+        """Write the index to a file so it can be loaded instead of rebuilt."""
+        state = (INDEX_FORMAT, self.max_distance, self.prefix_length,
+                 len(self.words), '\0'.join(self.words),
+                 len(self.slots), '\0'.join(self.slots),
+                 self.offsets, self.postings)
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'FuzzyIndex':
+        """Read an index written by save()."""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state[0] != INDEX_FORMAT:
+            raise ValueError(f"Unsupported fuzzy index format {state[0]}")
+
+        _, max_distance, prefix_length, word_count, words, key_count, keys, offsets, postings = state
+        index = cls.__new__(cls)
+        index.max_distance = max_distance
+        index.prefix_length = prefix_length
+        index.words = words.split('\0') if word_count else []
+        keys = keys.split('\0') if key_count else []
+        index.slots = dict(zip(keys, range(len(keys))))
+        index.offsets = offsets
+        index.postings = postings
+        return index
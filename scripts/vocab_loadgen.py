@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Load Generator for the Vocabulary Query Server
+
+Opens a number of concurrent connections to vocab_server.py, each sending a
+mix of lookups, filters, random practice sets and stats requests one after
+another, and reports throughput and latency percentiles for each level of
+concurrency:
+
+    python3 vocab_server.py &
+    python3 vocab_loadgen.py --concurrency 1 4 16 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List
+
+from vocab_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def request_mix(words: List[str], count: int, seed: int) -> List[Dict]:
+    """A reproducible mix of requests, weighted toward word lookups."""
+    rng = random.Random(seed)
+    requests = []
+    for number in range(count):
+        word = rng.choice(words)
+        kind = rng.random()
+        if kind < 0.5:
+            request = {'op': 'word', 'word': word}
+        elif kind < 0.6:
+            request = {'op': 'autocomplete', 'prefix': word[:3]}
+        elif kind < 0.7:
+            request = {'op': 'fuzzy', 'word': word[:-1] + 'x', 'limit': 5}
+        elif kind < 0.8:
+            request = {'op': 'facets', 'query': 'difficulty:hard AND NOT pos:noun', 'limit': 20}
+        elif kind < 0.95:
+            request = {'op': 'random', 'count': 10, 'difficulty': rng.choice(['easy', 'medium', 'hard'])}
+        else:
+            request = {'op': 'stats'}
+        request['id'] = number
+        requests.append(request)
+    return requests
+
+
+async def run_client(host: str, port: int, requests: List[Dict], latencies: List[float]) -> int:
+    """Send requests one at a time on one connection, recording each round trip; returns errors."""
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 24)
+    errors = 0
+    try:
+        for request in requests:
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if 'error' in response or response.get('id') != request['id']:
+                errors += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return errors
+
+
+async def fetch_words(host: str, port: int, count: int) -> List[str]:
+    """Ask the server for headwords to build requests from."""
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 24)
+    writer.write(json.dumps({'op': 'random', 'count': count, 'seed': 0}).encode('utf-8') + b'\n')
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return [entry['word'] for entry in response['result']]
+
+
+async def run_level(host: str, port: int, words: List[str], concurrency: int, total: int) -> Dict:
+    """Spread total requests over concurrent connections and measure them."""
+    per_client = max(1, total // concurrency)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(run_client(host, port, request_mix(words, per_client, seed), latencies)
+                                    for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'throughput': len(latencies) / elapsed,
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)],
+    }
+
+
+async def run(host: str, port: int, levels: List[int], total: int) -> None:
+    words = await fetch_words(host, port, 500)
+    print(f"{'clients':>8}{'requests':>10}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'errors':>8}")
+    for concurrency in levels:
+        result = await run_level(host, port, words, concurrency, total)
+        print(f"{result['concurrency']:>8}{result['requests']:>10}{result['throughput']:>10.0f}"
+              f"{result['p50'] * 1000:>10.2f}{result['p99'] * 1000:>10.2f}{result['errors']:>8}")
+
+
+def main():
+    """Run the load test against a running vocab_server.py."""
+    arg_parser = argparse.ArgumentParser(description="Measure vocab_server.py throughput and latency.")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST, help="Server host")
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Server port")
+    arg_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64],
+                            help="Numbers of concurrent connections to try, in order")
+    arg_parser.add_argument('--requests', type=int, default=5000,
+                            help="Requests per concurrency level")
+    args = arg_parser.parse_args()
+
+    try:
+        asyncio.run(run(args.host, args.port, args.concurrency, args.requests))
+    except ConnectionRefusedError:
+        print(f"Error: no server on {args.host}:{args.port}. Start it with: python3 vocab_server.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Text Normalizer for SAT Vocabulary
+
+Shared character cleaning for the vocabulary scripts. Encoding artifacts from
+the PDF extraction are mapped to English equivalents with a precomputed
+str.translate table (multi-character expansions included), then leftover
+non-ASCII characters and whitespace runs are handled by one combined regex.
+"""
+
+import re
+from typing import Dict
+
+# Character mappings for common encoding issues
+PARSER_CHARACTER_REPLACEMENTS = {
+    'Õ': "'",      # Curly apostrophe/single quote
+    'Ó': '"',      # Opening double quote
+    'Ò': '"',      # Closing double quote
+    'Þ': 'fi',     # Ligature for 'fi'
+    'ß': 'fl',     # Ligature for 'fl'
+    'È': 'A',      # Accented A
+    'É': 'E',      # Accented E
+    'Í': 'I',      # Accented I
+    'Ñ': '-',      # En dash
+    'Ð': '-',      # Em dash
+    '…': '...',    # Ellipsis
+    '•': '*',      # Bullet point
+    '–': '-',      # En dash
+    '—': '-',      # Em dash
+}
+
+# The character cleaner also spells out typographic symbols
+CHARACTER_REPLACEMENTS = dict(PARSER_CHARACTER_REPLACEMENTS, **{
+    '¥': 'Y',      # Yen symbol used as Y
+    '†': '+',      # Dagger symbol
+    '‡': '++',     # Double dagger
+    '‚': ',',      # Single low quote
+    '„': '"',      # Double low quote
+    '©': '(c)',    # Copyright
+    '®': '(r)',    # Registered
+    '™': '(tm)',   # Trademark
+})
+
+# Runs of whitespace and/or non-ASCII characters left after translation
+_LEFTOVER_RUN = re.compile(r'[\s\x80-\U0010FFFF]+')
+
+# Whitespace that is not already a single space, for text that is pure ASCII
+_WHITESPACE_TO_COLLAPSE = re.compile(r'\s{2,}|[^\S ]')
+
+# Greek letters range: \u0370 to \u03FF and \u1F00 to \u1FFF for extended
+_GREEK_LETTERS = re.compile(r'[\u0370-\u03FF\u1F00-\u1FFF]')
+
+
+def _replace_leftover_run(match: 're.Match') -> str:
+    # Non-ASCII characters are dropped and any whitespace collapses to one space
+    run = match.group(0)
+    if run == ' ' or run.isascii():
+        return ' '
+    return ' ' if run.encode('ascii', 'ignore') else ''
+
+
+class TextNormalizer:
+    def __init__(self, replacements: Dict[str, str]):
+        """
+        Args:
+            replacements: Mapping of single non-ASCII characters to their replacement text
+        """
+        if any(char.isascii() for char in replacements):
+            raise ValueError("Only non-ASCII characters can be replaced")
+        self.table = str.maketrans(replacements)
+
+    def clean(self, text):
+        """
+        Replace unusual characters with their English equivalents.
+
+        Args:
+            text: String to clean
+
+        Returns:
+            Cleaned string with proper English characters
+        """
+        if not isinstance(text, str):
+            return text
+
+        # Every mapped character is non-ASCII, so plain ASCII text skips translation
+        if not text.isascii():
+            text = text.translate(self.table)
+        if text.isascii():
+            return _WHITESPACE_TO_COLLAPSE.sub(' ', text).strip()
+        return _LEFTOVER_RUN.sub(_replace_leftover_run, text).strip()
+
+
+parser_normalizer = TextNormalizer(PARSER_CHARACTER_REPLACEMENTS)
+character_normalizer = TextNormalizer(CHARACTER_REPLACEMENTS)
+
+
+def remove_greek_letters(text: str) -> str:
+    """Strip Greek and extended Greek letters from text."""
+    return _GREEK_LETTERS.sub('', text)
@@ -10,6 +10,8 @@ import json
 import re
 from typing import List, Dict, Any
 
+from vocab_tokenizer import iter_headers, iter_parentheticals, tokenize_page
+
 def parse_vocabulary_data(input_file: str, output_file: str) -> None:
     """
     Parse vocabulary data from extracted text and generate structured JSON.
@@ -70,17 +72,13 @@ def extract_vocabulary_entries(text: str) -> List[Dict[str, Any]]:
     """
     entries = []
     
-    # Pattern to match vocabulary entries with flexible whitespace and newlines
-    # Pattern: word \n (part_of_speech) \n definition \n (example)
-    pattern = r'(\w+)\s*\n\s*(\([^)]+\))\s*\n\s*([^(]+?)\s*(\([^)]+\))'
-    
-    matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL)
-    
-    for match in matches:
-        word = match.group(1).strip()
-        part_of_speech = match.group(2).strip()
-        definition = match.group(3).strip()
-        example = match.group(4).strip()
+    # Walk the page once with flexible whitespace and newlines
+    # Entry: word \n (part_of_speech) \n definition \n (example)
+    for raw in tokenize_page(text, min_example_length=1):
+        word = raw.word.strip()
+        part_of_speech = raw.part_of_speech.strip()
+        definition = raw.definition.strip()
+        example = raw.example.strip()
         
         # Clean up the extracted parts
         word = clean_word(word)
@@ -115,19 +113,15 @@ def extract_with_simple_pattern(text: str) -> List[Dict[str, Any]]:
     
     # First, let's find all potential vocabulary word starts
     # These are standalone words on their own line, followed by a part of speech
-    word_pattern = r'\n([a-z]+)\s*\n\s*(\([^)]+\))'
-    word_matches = list(re.finditer(word_pattern, text, re.IGNORECASE))
+    word_matches = list(iter_headers(text))
     
-    for i, match in enumerate(word_matches):
-        word = match.group(1).lower().strip()
-        part_of_speech = match.group(2).strip()
-        
-        # Find the start and end positions for this entry
-        start_pos = match.end()
+    for i, (word, part_of_speech, _, start_pos) in enumerate(word_matches):
+        word = word.lower().strip()
+        part_of_speech = part_of_speech.strip()
         
         # Find the end position (start of next word or end of text)
         if i + 1 < len(word_matches):
-            end_pos = word_matches[i + 1].start()
+            end_pos = word_matches[i + 1][2]
         else:
             end_pos = len(text)
         
@@ -160,13 +154,13 @@ def extract_definition_and_example(content: str) -> tuple:
     Extract definition and example from content between two vocabulary words.
     """
     # Look for the first parenthetical expression (which should be an example)
-    example_match = re.search(r'\(([^)]{20,})\)', content)
+    example_match = next(iter_parentheticals(content, min_length=20), None)
     
     if not example_match:
         return None, None
     
-    example_start = example_match.start()
-    example = example_match.group(0)
+    example_start, example_end = example_match
+    example = content[example_start:example_end]
     
     # Everything before the example (cleaned up) should be the definition
     definition_text = content[:example_start].strip()
@@ -10,6 +10,8 @@ import json
 import re
 from typing import List, Dict, Any, Tuple
 
+from vocab_tokenizer import tokenize_page
+
 def parse_vocabulary_data(input_file: str, output_file: str) -> None:
     """
     Parse vocabulary data from extracted text and generate structured JSON.
@@ -69,17 +71,12 @@ def extract_vocabulary_entries(text: str) -> List[Dict[str, Any]]:
     """
     entries = []
     
-    # More precise pattern to match vocabulary entries
-    # Look for: newline + single word + newline + (part_of_speech) + newline + definition + (example)
-    pattern = r'\n([a-z]+)\s*\n\s*(\([^)]+\))\s*\n\s*([^(]+?)\s*(\([^)]{20,}\))'
-    
-    matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL | re.IGNORECASE)
-    
-    for match in matches:
-        word = match.group(1).strip()
-        part_of_speech = match.group(2).strip()
-        definition = match.group(3).strip()
-        example = match.group(4).strip()
+    # Walk the page once: newline + single word + newline + (part_of_speech) + newline + definition + (example)
+    for raw in tokenize_page(text, min_example_length=20):
+        word = raw.word.strip()
+        part_of_speech = raw.part_of_speech.strip()
+        definition = raw.definition.strip()
+        example = raw.example.strip()
         
         # Clean up the extracted parts
         word = clean_word(word)
@@ -10,6 +10,8 @@ import json
 import re
 from typing import List, Dict, Any, Tuple
 
+from vocab_tokenizer import iter_headers, iter_parentheticals
+
 def parse_vocabulary_data(input_file: str, output_file: str) -> None:
     """
     Parse vocabulary data from extracted text and generate structured JSON.
@@ -71,23 +73,19 @@ def extract_vocabulary_entries(text: str) -> List[Dict[str, Any]]:
     
     # First, let's find all potential vocabulary word starts
     # These are standalone words on their own line, followed by a part of speech
-    word_pattern = r'\n([a-z][a-z\s]*[a-z])\s*\n\s*(\([^)]+\))'
-    word_matches = list(re.finditer(word_pattern, text, re.IGNORECASE))
+    word_matches = list(iter_headers(text, multiword=True))
     
-    for i, match in enumerate(word_matches):
-        word = match.group(1).strip()
-        part_of_speech = match.group(2).strip()
+    for i, (word, part_of_speech, _, start_pos) in enumerate(word_matches):
+        word = word.strip()
+        part_of_speech = part_of_speech.strip()
         
         # Skip if this doesn't look like a real word
         if not re.match(r'^[a-z\s]+$', word.lower()) or len(word) < 2:
             continue
         
-        # Find the start and end positions for this entry
-        start_pos = match.end()
-        
         # Find the end position (start of next word or end of text)
         if i + 1 < len(word_matches):
-            end_pos = word_matches[i + 1].start()
+            end_pos = word_matches[i + 1][2]
         else:
             end_pos = len(text)
         
@@ -123,15 +121,14 @@ def extract_definition_and_example(content: str) -> Tuple[str, str]:
         Tuple of (definition, example) or (None, None) if not found
     """
     # Look for the first substantial parenthetical expression (which should be an example)
-    example_matches = list(re.finditer(r'\(([^)]{15,})\)', content))
+    example_matches = list(iter_parentheticals(content, min_length=15))
     
     if not example_matches:
         return None, None
     
     # Find the best example (usually the longest one)
-    best_example = max(example_matches, key=lambda m: len(m.group(1)))
-    example_start = best_example.start()
-    example = best_example.group(0)
+    example_start, example_end = max(example_matches, key=lambda span: span[1] - span[0])
+    example = content[example_start:example_end]
     
     # Everything before the example should be the definition
     definition_text = content[:example_start].strip()
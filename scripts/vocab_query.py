@@ -6,86 +6,788 @@ This script provides utilities to search and filter the categorized vocabulary d
 """
 
 import json
+import math
+import os
+import random
 import sys
-from typing import List, Dict, Any
+from itertools import islice
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, defaultdict
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from vocab_columns import VocabularyColumns, complete_entry
+from vocab_facets import LENGTH_BUCKETS, SYLLABLE_BUCKETS, FacetIndex, bitmap_ids, bucket_label
+from vocab_fuzzy import FuzzyIndex
+from vocab_sampling import AliasTable
+from vocab_search import BM25Index
+from vocab_snapshot import POSTING_INDEXES, VocabularySnapshot
+from vocab_stats import VocabularyStats
+
+def normalize_word(word: str) -> str:
+    """Key used to look headwords up: case and surrounding whitespace are ignored."""
+    return word.strip().lower()
+
+# Operations a query request may name, and the VocabularyQuery method each runs
+QUERY_OPERATIONS = {
+    'word': 'search_senses',
+    'lookup': 'lookup_many',
+    'fuzzy': 'search_fuzzy',
+    'autocomplete': 'autocomplete',
+    'search': 'search_text',
+    'filter': 'search_filter',
+    'facets': 'faceted_search',
+    'difficulty': 'search_by_difficulty',
+    'category': 'search_by_category',
+    'pos': 'search_by_part_of_speech',
+    'syllables': 'search_by_syllables',
+    'length': 'search_by_word_length',
+    'random': 'random_words',
+    'stats': 'get_statistics',
+}
+
+# Sampling pools and alias tables kept for reuse; requests may name any filter or
+# weighting, so only the most recently used are kept
+SAMPLING_CACHE_SIZE = 64
+
+# Errors a malformed query can raise; batch and server callers report them per query
+QUERY_ERRORS = (ValueError, TypeError, KeyError, IndexError)
+
+def _decode_request(query: Any) -> Dict[str, Any]:
+    """Accept a request dict or one JSON line holding it."""
+    if isinstance(query, (str, bytes)):
+        try:
+            query = json.loads(query)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {e}") from None
+    if not isinstance(query, dict):
+        raise ValueError("Request must be a JSON object")
+    return query
+
+def _field_column(vocabulary: Sequence[Dict], field: str) -> Sequence:
+    """Every entry's value of one field, read straight from a columnar store's column."""
+    if isinstance(vocabulary, VocabularyColumns):
+        return vocabulary.column(field)
+    return [entry[field] for entry in vocabulary]
+
+def _remove_id(index: Dict[Any, List[int]], key: Any, entry_id: int) -> None:
+    """Remove an id from one of the sorted id lists, dropping the list once empty."""
+    entry_ids = index[key]
+    del entry_ids[bisect_left(entry_ids, entry_id)]
+    if not entry_ids:
+        del index[key]
+
+class SortedColumn:
+    """Entry ids ordered by one integer field, so value ranges are found by binary search."""
+    
+    def __init__(self, values: List[int]):
+        """
+        Args:
+            values: The field's value for every entry id
+        """
+        # Stable sort: ids with equal values stay in vocabulary order
+        self.ids = sorted(range(len(values)), key=values.__getitem__)
+        self.keys = [values[entry_id] for entry_id in self.ids]
+    
+    @classmethod
+    def from_arrays(cls, ids: Sequence[int], keys: Sequence[int]) -> 'SortedColumn':
+        """A column whose ids and keys are already in order, e.g. read back from a snapshot."""
+        column = cls.__new__(cls)
+        column.ids = ids
+        column.keys = keys
+        return column
+    
+    def span(self, low: int, high: int) -> range:
+        """Positions in self.ids of the entries with low <= value <= high."""
+        return range(bisect_left(self.keys, low), bisect_right(self.keys, high))
+    
+    def iter_ids(self, low: int, high: int) -> Iterator[int]:
+        """Lazily yield the ids with low <= value <= high, by value then id."""
+        ids = self.ids
+        return (ids[position] for position in self.span(low, high))
+    
+    def insert(self, entry_id: int, value: int) -> None:
+        """Add an entry, after the entries with the same value and a lower id."""
+        span = self.span(value, value)
+        position = bisect_left(self.ids, entry_id, span.start, span.stop)
+        self.ids.insert(position, entry_id)
+        self.keys.insert(position, value)
+    
+    def remove(self, entry_id: int, value: int) -> None:
+        """Remove an entry that was added with this value."""
+        span = self.span(value, value)
+        position = bisect_left(self.ids, entry_id, span.start, span.stop)
+        del self.ids[position]
+        del self.keys[position]
 
 class VocabularyQuery:
-    def __init__(self, vocab_file: str = 'sat_vocabulary_categorized.json'):
-        with open(vocab_file, 'r', encoding='utf-8') as f:
-            self.vocabulary = json.load(f)
+    def __init__(self, vocab_file: str = 'sat_vocabulary_categorized.json',
+                 vocabulary: Optional[List[Dict]] = None,
+                 fuzzy_index_file: Optional[str] = None,
+                 text_index_file: Optional[str] = None,
+                 columnar: bool = False,
+                 snapshot_file: Optional[str] = None):
+        """
+        Args:
+            vocab_file: Categorized vocabulary JSON file to load
+            vocabulary: Entries to query instead of loading vocab_file (a list
+                of dicts or a VocabularyColumns store)
+            fuzzy_index_file: File the misspelling index is loaded from, or
+                saved to after it is first built
+            text_index_file: File the definition/example search index is
+                loaded from, or saved to after it is first built
+            columnar: Hold entries loaded from vocab_file in a compact
+                VocabularyColumns store; results are then read-only row views
+            snapshot_file: Map entries and prebuilt indexes from a snapshot
+                written by vocab_snapshot.py instead of loading vocab_file;
+                the entries are then read-only
+        """
+        self.fuzzy_index_file = fuzzy_index_file
+        self._fuzzy_index = None
+        self.text_index_file = text_index_file
+        self._text_index = None
+        # Sampling pools per (difficulty, category) and alias tables per weighting, built on first use
+        self._sample_pools = OrderedDict()
+        self._alias_tables = OrderedDict()
+        
+        self.snapshot = None
+        if snapshot_file is not None:
+            self.snapshot = VocabularySnapshot(snapshot_file)
+            self.vocabulary = self.snapshot.vocabulary()
+            self.load_indexes(self.snapshot)
+            return
+        if vocabulary is None:
+            with open(vocab_file, 'r', encoding='utf-8') as f:
+                vocabulary = json.load(f)
+            if columnar:
+                vocabulary = VocabularyColumns(vocabulary)
+        self.vocabulary = vocabulary
+        self.build_indexes()
+    
+    def build_indexes(self) -> None:
+        """Index entry ids (positions in self.vocabulary) by each filterable field."""
+        vocabulary = self.vocabulary
+        difficulties = _field_column(vocabulary, 'difficulty')
+        categories_column = _field_column(vocabulary, 'categories')
+        parts_of_speech = _field_column(vocabulary, 'part_of_speech')
+        syllable_counts = _field_column(vocabulary, 'syllable_count')
+        word_lengths = _field_column(vocabulary, 'word_length')
+        self.difficulty_index = defaultdict(list)
+        self.category_index = defaultdict(list)
+        self.pos_index = defaultdict(list)
+        self.syllable_index = defaultdict(list)
+        
+        fields = zip(difficulties, categories_column, parts_of_speech, syllable_counts)
+        for entry_id, (difficulty, categories, pos, syllable_count) in enumerate(fields):
+            self.difficulty_index[difficulty].append(entry_id)
+            # Categories match case-insensitively, and a word is listed once per category
+            if len(categories) == 1:
+                self.category_index[categories[0].lower()].append(entry_id)
+            else:
+                for category in {c.lower() for c in categories}:
+                    self.category_index[category].append(entry_id)
+            self.pos_index[pos].append(entry_id)
+            self.syllable_index[syllable_count].append(entry_id)
+        
+        self.length_column = SortedColumn(word_lengths)
+        self.syllable_column = SortedColumn(syllable_counts)
+        
+        # Bitmaps per facet value, for compound filters and facet counts
+        self.facets = FacetIndex({
+            'difficulty': self.difficulty_index,
+            'category': self.category_index,
+            'pos': self.pos_index,
+            'syllables': {label: self.syllable_column.iter_ids(low, high)
+                          for label, low, high in SYLLABLE_BUCKETS},
+            'length': {label: self.length_column.iter_ids(low, high)
+                       for label, low, high in LENGTH_BUCKETS},
+        }, len(vocabulary))
+        
+        # Headword -> id of its first sense; words with several senses also get
+        # every sense id, ordered by definition number, in sense_index
+        self.word_index = {}
+        self.sense_index = {}
+        for entry_id, key in enumerate([normalize_word(word) for word in _field_column(vocabulary, 'word')]):
+            if key not in self.word_index:
+                self.word_index[key] = entry_id
+            elif key in self.sense_index:
+                self.sense_index[key].append(entry_id)
+            else:
+                self.sense_index[key] = [self.word_index[key], entry_id]
+        for key, entry_ids in self.sense_index.items():
+            entry_ids.sort(key=lambda entry_id: vocabulary[entry_id].get('definition_number', 0))
+            self.word_index[key] = entry_ids[0]
+        
+        # Sorted headword keys for prefix search, overall and per difficulty
+        self.headwords = sorted(self.word_index)
+        self.headwords_by_difficulty = defaultdict(list)
+        word_index = self.word_index
+        for key in self.headwords:
+            if key in self.sense_index:
+                for difficulty in {difficulties[entry_id] for entry_id in self.sense_index[key]}:
+                    self.headwords_by_difficulty[difficulty].append(key)
+            else:
+                self.headwords_by_difficulty[difficulties[word_index[key]]].append(key)
+        
+        self.stats = VocabularyStats.from_columns(difficulties, categories_column, parts_of_speech,
+                                                  word_lengths, syllable_counts)
+    
+    def load_indexes(self, snapshot: VocabularySnapshot) -> None:
+        """Use the indexes stored in a snapshot, in place of build_indexes()."""
+        for name in POSTING_INDEXES:
+            setattr(self, name, snapshot.postings(name))
+        self.length_column = SortedColumn.from_arrays(*snapshot.sorted_column('length_column'))
+        self.syllable_column = SortedColumn.from_arrays(*snapshot.sorted_column('syllable_column'))
+        self.facets = FacetIndex.from_bitmaps(snapshot.facet_bitmaps(), snapshot.size)
+        self.headwords = snapshot.headwords()
+        self.word_index = snapshot.word_index(self.headwords)
+        self.sense_index = snapshot.sense_index(self.headwords)
+        self.headwords_by_difficulty = snapshot.headwords_by_difficulty(self.headwords)
+        self.stats = VocabularyStats.from_state(snapshot.manifest['stats'])
+    
+    def _facet_values(self, entry: Dict) -> Dict[str, List[str]]:
+        """The values an entry is filed under in each facet bitmap."""
+        buckets = [('syllables', bucket_label(entry['syllable_count'], SYLLABLE_BUCKETS)),
+                   ('length', bucket_label(entry['word_length'], LENGTH_BUCKETS))]
+        values = {
+            'difficulty': [entry['difficulty']],
+            'category': list({c.lower() for c in entry['categories']}),
+            'pos': [entry['part_of_speech']],
+        }
+        values.update((facet, [label]) for facet, label in buckets if label is not None)
+        return values
+    
+    def _set_senses(self, key: str, entry_ids: List[int]) -> None:
+        """Point a headword at a new set of sense ids, updating the headword lists."""
+        vocabulary = self.vocabulary
+        old_difficulties = {vocabulary[entry_id]['difficulty'] for entry_id in self._sense_ids(key)}
+        self.sense_index.pop(key, None)
+        
+        if entry_ids:
+            if key not in self.word_index:
+                insort(self.headwords, key)
+                self._fuzzy_index = None
+            entry_ids = sorted(entry_ids)
+            entry_ids.sort(key=lambda entry_id: vocabulary[entry_id].get('definition_number', 0))
+            self.word_index[key] = entry_ids[0]
+            if len(entry_ids) > 1:
+                self.sense_index[key] = entry_ids
+        else:
+            del self.word_index[key]
+            del self.headwords[bisect_left(self.headwords, key)]
+            self._fuzzy_index = None
+        
+        new_difficulties = {vocabulary[entry_id]['difficulty'] for entry_id in entry_ids}
+        for difficulty in old_difficulties - new_difficulties:
+            headwords = self.headwords_by_difficulty[difficulty]
+            del headwords[bisect_left(headwords, key)]
+        for difficulty in new_difficulties - old_difficulties:
+            insort(self.headwords_by_difficulty[difficulty], key)
+    
+    def _index_entry(self, entry_id: int, entry: Dict) -> None:
+        """Add an entry already stored at vocabulary[entry_id] to every index."""
+        insort(self.difficulty_index[entry['difficulty']], entry_id)
+        for category in {c.lower() for c in entry['categories']}:
+            insort(self.category_index[category], entry_id)
+        insort(self.pos_index[entry['part_of_speech']], entry_id)
+        insort(self.syllable_index[entry['syllable_count']], entry_id)
+        self.length_column.insert(entry_id, entry['word_length'])
+        self.syllable_column.insert(entry_id, entry['syllable_count'])
+        self.facets.add(entry_id, self._facet_values(entry))
+        self.stats.add(entry)
+        key = normalize_word(entry['word'])
+        self._set_senses(key, self._sense_ids(key) + [entry_id])
+    
+    def _unindex_entry(self, entry_id: int, entry: Dict) -> None:
+        """Remove an entry, still stored at vocabulary[entry_id], from every index."""
+        _remove_id(self.difficulty_index, entry['difficulty'], entry_id)
+        for category in {c.lower() for c in entry['categories']}:
+            _remove_id(self.category_index, category, entry_id)
+        _remove_id(self.pos_index, entry['part_of_speech'], entry_id)
+        _remove_id(self.syllable_index, entry['syllable_count'], entry_id)
+        self.length_column.remove(entry_id, entry['word_length'])
+        self.syllable_column.remove(entry_id, entry['syllable_count'])
+        self.facets.remove(entry_id, self._facet_values(entry))
+        self.stats.remove(entry)
+        key = normalize_word(entry['word'])
+        self._set_senses(key, [sense_id for sense_id in self._sense_ids(key) if sense_id != entry_id])
+    
+    def _entries_changed(self) -> None:
+        """Drop caches derived from the entries; they are rebuilt on next use."""
+        self._text_index = None
+        self._sample_pools.clear()
+        self._alias_tables.clear()
+    
+    def _check_writable(self) -> None:
+        if self.snapshot is not None:
+            raise TypeError("Entries loaded from a snapshot are read-only")
+    
+    def _check_id(self, entry_id: int) -> None:
+        self._check_writable()
+        if not 0 <= entry_id < len(self.vocabulary):
+            raise IndexError(f"No entry with id {entry_id}")
+    
+    def add_entry(self, entry: Dict) -> int:
+        """
+        Add a categorized entry, updating indexes and statistics.
+        
+        Returns:
+            The new entry's id (its position in self.vocabulary)
+        
+        Raises:
+            ValueError: If the entry lacks a field that is not optional
+        """
+        self._check_writable()
+        entry = complete_entry(entry)
+        entry_id = len(self.vocabulary)
+        self.vocabulary.append(entry)
+        self._index_entry(entry_id, entry)
+        self._entries_changed()
+        return entry_id
+    
+    def remove_entry(self, entry_id: int) -> Dict:
+        """
+        Remove an entry, updating indexes and statistics.
+        
+        The last entry moves into the freed id, so every other id stays valid.
+        
+        Returns:
+            The removed entry's fields
+        """
+        self._check_id(entry_id)
+        vocabulary = self.vocabulary
+        last_id = len(vocabulary) - 1
+        # A copy, since a columnar store's rows are views that the move below overwrites
+        removed = dict(vocabulary[entry_id])
+        self._unindex_entry(entry_id, removed)
+        if entry_id != last_id:
+            self._unindex_entry(last_id, vocabulary[last_id])
+        last = vocabulary.pop()
+        self.facets.resize(last_id)
+        if entry_id != last_id:
+            vocabulary[entry_id] = last
+            self._index_entry(entry_id, last)
+        self._entries_changed()
+        return removed
+    
+    def update_entry(self, entry_id: int, entry: Dict) -> None:
+        """Replace the entry with this id, updating indexes and statistics."""
+        self._check_id(entry_id)
+        entry = complete_entry(entry)
+        self._unindex_entry(entry_id, self.vocabulary[entry_id])
+        self.vocabulary[entry_id] = entry
+        self._index_entry(entry_id, entry)
+        self._entries_changed()
+    
+    def _sense_ids(self, key: str) -> List[int]:
+        """Ids of every sense of a normalized headword, first sense first."""
+        if key in self.sense_index:
+            return self.sense_index[key]
+        entry_id = self.word_index.get(key)
+        return [] if entry_id is None else [entry_id]
+    
+    def _entries(self, entry_ids: List[int]) -> List[Dict]:
+        """Return the entries for ids, in vocabulary order."""
+        vocabulary = self.vocabulary
+        return [vocabulary[entry_id] for entry_id in entry_ids]
     
     def search_by_difficulty(self, difficulty: str) -> List[Dict]:
         """Get all words of a specific difficulty level."""
-        return [word for word in self.vocabulary if word['difficulty'] == difficulty.lower()]
+        return self._entries(self.difficulty_index.get(difficulty.lower(), []))
     
     def search_by_category(self, category: str) -> List[Dict]:
         """Get all words in a specific category."""
-        return [word for word in self.vocabulary if category.lower() in [c.lower() for c in word['categories']]]
+        return self._entries(self.category_index.get(category.lower(), []))
     
     def search_by_word_length(self, min_length: int = 0, max_length: int = 100) -> List[Dict]:
         """Get words within a specific length range."""
-        return [word for word in self.vocabulary 
-                if min_length <= word['word_length'] <= max_length]
+        return self._entries(sorted(self.length_column.iter_ids(min_length, max_length)))
+    
+    def iter_by_word_length(self, min_length: int = 0, max_length: int = 100) -> Iterator[Dict]:
+        """Lazily yield words within a length range, shortest first."""
+        vocabulary = self.vocabulary
+        return (vocabulary[entry_id] for entry_id in self.length_column.iter_ids(min_length, max_length))
+    
+    def iter_by_syllable_range(self, min_syllables: int = 0, max_syllables: int = 100) -> Iterator[Dict]:
+        """Lazily yield words within a syllable count range, fewest syllables first."""
+        vocabulary = self.vocabulary
+        return (vocabulary[entry_id] for entry_id in self.syllable_column.iter_ids(min_syllables, max_syllables))
+    
+    def iter_by_ranges(self, min_length: int = 0, max_length: int = 100,
+                       min_syllables: int = 0, max_syllables: int = 100) -> Iterator[Dict]:
+        """
+        Lazily yield words within both a length range and a syllable count range.
+        
+        The narrower range is walked by binary search and the other checked per
+        entry, so results come ordered by whichever field was narrower.
+        """
+        length_span = self.length_column.span(min_length, max_length)
+        syllable_span = self.syllable_column.span(min_syllables, max_syllables)
+        vocabulary = self.vocabulary
+        
+        if len(length_span) <= len(syllable_span):
+            ids = self.length_column.ids
+            return (vocabulary[ids[position]] for position in length_span
+                    if min_syllables <= vocabulary[ids[position]]['syllable_count'] <= max_syllables)
+        ids = self.syllable_column.ids
+        return (vocabulary[ids[position]] for position in syllable_span
+                if min_length <= vocabulary[ids[position]]['word_length'] <= max_length)
     
     def search_by_syllables(self, syllable_count: int) -> List[Dict]:
         """Get words with specific syllable count."""
-        return [word for word in self.vocabulary if word['syllable_count'] == syllable_count]
+        return self._entries(self.syllable_index.get(syllable_count, []))
     
     def search_by_part_of_speech(self, pos: str) -> List[Dict]:
         """Get words of a specific part of speech."""
-        return [word for word in self.vocabulary if word['part_of_speech'] == pos]
+        return self._entries(self.pos_index.get(pos, []))
+    
+    def search_filter(self, query: str) -> List[Dict]:
+        """Get entries matching a filter such as 'difficulty:hard AND NOT pos:noun'."""
+        vocabulary = self.vocabulary
+        return [vocabulary[entry_id] for entry_id in bitmap_ids(self.facets.evaluate(query))]
+    
+    def faceted_search(self, query: str,
+                       limit: Optional[int] = None) -> Tuple[List[Dict], Dict[str, Dict[str, int]]]:
+        """
+        Filter entries and count every facet value among the matches.
+        
+        Args:
+            query: Filter of facet:value terms (difficulty, category, pos,
+                syllables, length) joined by AND, OR and NOT; '' matches all
+            limit: Maximum number of entries to return (counts cover every match)
+        
+        Returns:
+            (matching entries in vocabulary order, {facet: {value: count}})
+        """
+        bitmap = self.facets.evaluate(query)
+        vocabulary = self.vocabulary
+        entries = [vocabulary[entry_id] for entry_id in islice(bitmap_ids(bitmap), limit)]
+        return entries, self.facets.counts(bitmap)
     
     def search_word(self, word: str) -> Dict:
-        """Find a specific word."""
-        for entry in self.vocabulary:
-            if entry['word'].lower() == word.lower():
-                return entry
-        return None
+        """Find a specific word (its first sense), ignoring case."""
+        entry_id = self.word_index.get(normalize_word(word))
+        return None if entry_id is None else self.vocabulary[entry_id]
     
-    def random_words(self, count: int = 10, difficulty: str = None, category: str = None) -> List[Dict]:
-        """Get random words with optional filters."""
-        import random
+    def search_senses(self, word: str) -> List[Dict]:
+        """Get every sense of a word, ignoring case, ordered by definition number."""
+        return self._entries(self._sense_ids(normalize_word(word)))
+    
+    def lookup_many(self, words: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Resolve many words at once; each maps to its senses ([] if not found).
         
-        filtered_words = self.vocabulary
+        Raises:
+            ValueError: If words is not a list of strings
+        """
+        self._check_words(words)
+        return {word: self._entries(self._sense_ids(normalize_word(word))) for word in words}
+    
+    def _check_words(self, words: List[str]) -> None:
+        # A bare string would otherwise be looked up one character at a time
+        if not isinstance(words, list) or not all(isinstance(word, str) for word in words):
+            raise ValueError(f"words must be a list of strings, got {words!r}")
+    
+    @property
+    def fuzzy_index(self) -> FuzzyIndex:
+        """Misspelling index over the headwords, loaded or built on first use."""
+        if self._fuzzy_index is None:
+            path = self.fuzzy_index_file
+            if path and os.path.exists(path):
+                index = FuzzyIndex.load(path)
+                # A saved index for a different vocabulary is rebuilt
+                if index.words == list(self.headwords):
+                    self._fuzzy_index = index
+            if self._fuzzy_index is None:
+                self._fuzzy_index = FuzzyIndex(self.headwords)
+                if path:
+                    self._fuzzy_index.save(path)
+        return self._fuzzy_index
+    
+    def search_fuzzy(self, word: str, max_distance: int = 2, limit: int = 10) -> List[Tuple[Dict, int]]:
+        """
+        Find the words closest to a possibly misspelled word.
         
-        if difficulty:
-            filtered_words = [w for w in filtered_words if w['difficulty'] == difficulty.lower()]
+        Returns:
+            (entry, edit distance) pairs for words within max_distance, closest first
+        """
+        matches = self.fuzzy_index.lookup(normalize_word(word), max_distance, limit)
+        return [(self.vocabulary[self.word_index[key]], distance) for key, distance in matches]
+    
+    @property
+    def text_index(self) -> BM25Index:
+        """Full-text index over definitions and examples, loaded or built on first use."""
+        if self._text_index is None:
+            path = self.text_index_file
+            if path and os.path.exists(path):
+                index = BM25Index.load(path)
+                # A saved index for different text is rebuilt
+                if index.digest == BM25Index.documents_digest(self.vocabulary):
+                    self._text_index = index
+            if self._text_index is None:
+                self._text_index = BM25Index(self.vocabulary)
+                if path:
+                    self._text_index.save(path)
+        return self._text_index
+    
+    def search_text(self, query: str, k: int = 10,
+                    boosts: Optional[Dict[str, float]] = None) -> List[Tuple[Dict, float]]:
+        """
+        Rank entries whose definition or example matches a query.
         
-        if category:
-            filtered_words = [w for w in filtered_words 
-                            if category.lower() in [c.lower() for c in w['categories']]]
+        Args:
+            query: Words to match, plus any "quoted phrases" that must appear
+            k: Maximum number of results
+            boosts: Weight per field (default: definition 2.0, example 1.0)
         
-        return random.sample(filtered_words, min(count, len(filtered_words)))
+        Returns:
+            (entry, BM25 score) pairs, best first
+        """
+        return [(self.vocabulary[entry_id], score)
+                for entry_id, score in self.text_index.search(query, k, boosts)]
     
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get comprehensive statistics about the vocabulary."""
-        total_words = len(self.vocabulary)
+    def autocomplete(self, prefix: str, k: int = 10, difficulty: Optional[str] = None) -> List[str]:
+        """
+        Get up to k headwords starting with prefix (ignoring case), alphabetically.
         
-        difficulty_counts = {}
-        category_counts = {}
-        pos_counts = {}
+        Args:
+            prefix: What has been typed so far
+            k: Maximum number of completions
+            difficulty: Only complete words with a sense of this difficulty
+        """
+        if difficulty is None:
+            headwords = self.headwords
+        else:
+            headwords = self.headwords_by_difficulty.get(difficulty.lower(), [])
         
-        for word in self.vocabulary:
-            # Difficulty stats
-            difficulty = word['difficulty']
-            difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
-            
-            # Category stats
-            for category in word['categories']:
-                category_counts[category] = category_counts.get(category, 0) + 1
+        key = prefix.lstrip().lower()
+        start = bisect_left(headwords, key)
+        completions = []
+        for candidate in headwords[start:start + k]:
+            if not candidate.startswith(key):
+                break
+            completions.append(self.vocabulary[self.word_index[candidate]]['word'])
+        return completions
+    
+    def _sample_pool(self, difficulty: Optional[str], category: Optional[str]) -> Sequence[int]:
+        """Ids of the entries random_words draws from for a pair of filters."""
+        if not difficulty and not category:
+            return range(len(self.vocabulary))
+        if not category:
+            return self.difficulty_index.get(difficulty.lower(), [])
+        if not difficulty:
+            return self.category_index.get(category.lower(), [])
+        
+        key = (difficulty.lower(), category.lower())
+        
+        def build() -> List[int]:
+            bitmap = self.facets.value('difficulty', key[0]) & self.facets.value('category', key[1])
+            return list(bitmap_ids(bitmap))
+        return self._sampling_cached(self._sample_pools, key, build)
+    
+    def _sampling_cached(self, cache: OrderedDict, key: tuple, build: Callable[[], Any]) -> Any:
+        """Value for key in a sampling cache, building it on a miss and evicting the least recently used."""
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = build()
+            if len(cache) > SAMPLING_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+    
+    def _entry_weight(self, entry: Dict, weights: Dict[str, Dict[str, float]]) -> float:
+        """Product of the entry's difficulty, part of speech and (largest) category weights."""
+        weight = 1.0
+        if 'difficulty' in weights:
+            weight *= weights['difficulty'].get(entry['difficulty'], 1.0)
+        if 'pos' in weights:
+            weight *= weights['pos'].get(entry['part_of_speech'], 1.0)
+        if 'category' in weights:
+            category_weights = weights['category']
+            weight *= max(category_weights.get(c.lower(), 1.0) for c in entry['categories'] or ['general'])
+        return weight
+    
+    def _check_sampling(self, count: int, weights: Optional[Dict[str, Dict[str, float]]]) -> None:
+        """Reject a count or weights that random_words cannot draw with."""
+        if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+            raise ValueError(f"count must be a non-negative integer, got {count!r}")
+        if weights is None:
+            return
+        if not isinstance(weights, dict):
+            raise ValueError(f"weights must map a facet to {{value: weight}}, got {weights!r}")
+        unknown = set(weights) - {'difficulty', 'category', 'pos'}
+        if unknown:
+            raise ValueError(f"Cannot weight by {', '.join(sorted(map(str, unknown)))}; use difficulty, category or pos")
+        for facet, values in weights.items():
+            if not isinstance(values, dict):
+                raise ValueError(f"Weights for {facet} must map a value to a weight, got {values!r}")
+            for value, weight in values.items():
+                if not isinstance(value, str):
+                    raise ValueError(f"Weighted {facet} values must be strings, got {value!r}")
+                # bool is an int subclass; NaN and infinity fail the range check
+                if (isinstance(weight, bool) or not isinstance(weight, (int, float))
+                        or not 0 <= weight < math.inf):
+                    raise ValueError(f"Weight of {facet} '{value}' must be a non-negative number, got {weight!r}")
+    
+    def _alias_table(self, difficulty: Optional[str], category: Optional[str],
+                     weights: Dict[str, Dict[str, float]]) -> AliasTable:
+        weights = {facet: {value.lower(): weight for value, weight in values.items()}
+                   for facet, values in weights.items()}
+        key = (difficulty and difficulty.lower(), category and category.lower(),
+               tuple(sorted((facet, tuple(sorted(values.items()))) for facet, values in weights.items())))
+        
+        def build() -> AliasTable:
+            pool = self._sample_pool(difficulty, category)
+            return AliasTable(pool, [self._entry_weight(entry, weights) for entry in self._entries(pool)])
+        return self._sampling_cached(self._alias_tables, key, build)
+    
+    def random_words(self, count: int = 10, difficulty: str = None, category: str = None,
+                     seed: Optional[int] = None,
+                     weights: Optional[Dict[str, Dict[str, float]]] = None) -> List[Dict]:
+        """
+        Get random words with optional filters.
+        
+        The ids matching each filter are kept between calls, so a sample of
+        count words costs O(count) after the first call.
+        
+        Args:
+            count: Number of distinct words to draw
+            difficulty: Only draw words of this difficulty
+            category: Only draw words in this category
+            seed: Seed for a reproducible sample
+            weights: Relative weights by facet value, e.g.
+                {'difficulty': {'hard': 3.0}, 'category': {'emotions_feelings': 2.0}};
+                unlisted values weigh 1.0 and a word's weight is the product
+                over difficulty, pos and its heaviest category
+        
+        Raises:
+            ValueError: If count is not a non-negative integer, or weights are not
+                {facet: {value: non-negative number}} over difficulty, category
+                and pos, or leave no word a positive weight
+        """
+        self._check_sampling(count, weights)
+        # The shared module generator avoids seeding a new one per unseeded call
+        rng = random if seed is None else random.Random(seed)
+        vocabulary = self.vocabulary
+        if not (difficulty or category or weights):
+            return rng.sample(vocabulary, min(count, len(vocabulary)))
+        
+        pool = self._sample_pool(difficulty, category)
+        if not pool:
+            return []
+        if weights:
+            sampled_ids = self._alias_table(difficulty, category, weights).sample(count, rng)
+        else:
+            sampled_ids = rng.sample(pool, min(count, len(pool)))
+        return [vocabulary[entry_id] for entry_id in sampled_ids]
+    
+    def execute(self, request: Dict[str, Any]) -> Any:
+        """
+        Run one query described as a dict, e.g. {"op": "word", "word": "abate"}.
+        
+        Args:
+            request: "op" names one of QUERY_OPERATIONS; the other keys (except
+                an optional "id" for the caller's bookkeeping) are passed to
+                the method as keyword arguments
+        
+        Returns:
+            The method's result; faceted_search's pair becomes
+            {"entries": [...], "counts": {...}}
+        
+        Raises:
+            ValueError: If the operation is unknown
+            TypeError: If the arguments do not fit the method
+        """
+        op = request.get('op')
+        if op not in QUERY_OPERATIONS:
+            raise ValueError(f"Unknown op {op!r}. Available: {', '.join(QUERY_OPERATIONS)}")
+        arguments = {key: value for key, value in request.items() if key not in ('op', 'id')}
+        result = getattr(self, QUERY_OPERATIONS[op])(**arguments)
+        if op == 'facets':
+            entries, counts = result
+            return {'entries': entries, 'counts': counts}
+        return result
+    
+    def run_batch(self, queries: Iterable[Any], chunk_size: int = 10000) -> Iterator[Dict[str, Any]]:
+        """
+        Run many queries, sharing work between them, and yield responses in input order.
+        
+        Queries are read chunk_size at a time. Within a chunk, all word and
+        lookup requests are answered by one lookup_many call, and repeated
+        requests (same op and arguments) run once; unseeded random requests
+        always run separately.
+        
+        Args:
+            queries: Request dicts as taken by execute(), or JSON lines holding them
+            chunk_size: Queries grouped together at a time
+        
+        Yields:
+            {"id": ..., "result": ...} or {"id": ..., "error": "..."} per query;
+            a query that fails gets an error without affecting the others
+        """
+        queries = iter(queries)
+        while True:
+            chunk = list(islice(queries, chunk_size))
+            if not chunk:
+                break
+            yield from self._run_chunk(chunk)
+    
+    def _run_chunk(self, chunk: List[Any]) -> List[Dict[str, Any]]:
+        """Answer one chunk of run_batch queries."""
+        responses = []
+        # Per query: (request, how it is answered, key); how is 'invalid', 'word',
+        # 'lookup', 'shared' (answered once per distinct key) or 'single'
+        plans = []
+        words = {}
+        for query in chunk:
+            try:
+                request = _decode_request(query)
+            except ValueError as e:
+                responses.append({'id': None, 'error': str(e)})
+                plans.append((None, 'invalid', None))
+                continue
+            responses.append({'id': request.get('id')})
             
-            # Part of speech stats
-            pos = word['part_of_speech']
-            pos_counts[pos] = pos_counts.get(pos, 0) + 1
-        
-        return {
-            'total_words': total_words,
-            'difficulty_distribution': difficulty_counts,
-            'category_distribution': category_counts,
-            'part_of_speech_distribution': pos_counts,
-            'average_word_length': sum(w['word_length'] for w in self.vocabulary) / total_words,
-            'average_syllables': sum(w['syllable_count'] for w in self.vocabulary) / total_words
-        }
+            arguments = {name: value for name, value in request.items() if name != 'id'}
+            op = arguments.get('op')
+            if op == 'word' and arguments.keys() == {'op', 'word'} and isinstance(arguments['word'], str):
+                words[normalize_word(arguments['word'])] = None
+                plans.append((request, 'word', None))
+            elif (op == 'lookup' and arguments.keys() == {'op', 'words'} and isinstance(arguments['words'], list)
+                  and all(isinstance(word, str) for word in arguments['words'])):
+                words.update((normalize_word(word), None) for word in arguments['words'])
+                plans.append((request, 'lookup', None))
+            elif op == 'random' and 'seed' not in arguments:
+                plans.append((request, 'single', None))
+            else:
+                plans.append((request, 'shared', json.dumps(arguments, sort_keys=True, default=repr)))
+        
+        senses = self.lookup_many(list(words))
+        shared: Dict[str, Tuple[str, Any]] = {}
+        for response, (request, how, key) in zip(responses, plans):
+            if how == 'word':
+                response['result'] = senses[normalize_word(request['word'])]
+            elif how == 'lookup':
+                response['result'] = {word: senses[normalize_word(word)] for word in request['words']}
+            elif how != 'invalid':
+                outcome = shared.get(key) if how == 'shared' else None
+                if outcome is None:
+                    try:
+                        outcome = ('result', self.execute(request))
+                    except QUERY_ERRORS as e:
+                        outcome = ('error', str(e))
+                    except Exception as e:
+                        # Arguments of the wrong type fail in many ways; one bad
+                        # query must not cost the rest of the chunk its responses
+                        outcome = ('error', f"{type(e).__name__}: {e}")
+                    if how == 'shared':
+                        shared[key] = outcome
+                response[outcome[0]] = outcome[1]
+        return responses
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get comprehensive statistics about the vocabulary, kept current as entries change."""
+        return self.stats.summary()
 
 def main():
     """Interactive command-line interface for vocabulary queries."""
@@ -100,6 +802,8 @@ def main():
         print("  syllables <count> - Show words with specific syllable count")
         print("  pos <part_of_speech> - Show words by part of speech")
         print("  word <word> - Look up specific word")
+        print("  search <terms or \"phrase\"> - Search definitions and examples")
+        print("  filter <query> - Filter by facets, e.g. difficulty:hard AND NOT pos:noun")
         print("  random [count] [difficulty] [category] - Get random words")
         print("  stats - Show vocabulary statistics")
         print("  categories - List all categories")
@@ -190,9 +894,11 @@ def main():
                         print("Usage: word <word_to_lookup>")
                         continue
                     
-                    word_data = vq.search_word(command[1])
-                    if word_data:
+                    senses = vq.search_senses(command[1])
+                    for number, word_data in enumerate(senses, 1):
                         print(f"\nWord: {word_data['word']}")
+                        if len(senses) > 1:
+                            print(f"Sense: {word_data.get('definition_number', number)}")
                         print(f"Part of Speech: {word_data['part_of_speech']}")
                         print(f"Definition: {word_data['definition']}")
                         print(f"Example: {word_data['example']}")
@@ -200,8 +906,41 @@ def main():
                         print(f"Categories: {', '.join(word_data['categories'])}")
                         print(f"Syllables: {word_data['syllable_count']}")
                         print(f"Length: {word_data['word_length']} characters")
-                    else:
+                    if not senses:
                         print(f"Word '{command[1]}' not found.")
+                        suggestions = vq.search_fuzzy(command[1], limit=5)
+                        if suggestions:
+                            print(f"Did you mean: {', '.join(entry['word'] for entry, _ in suggestions)}?")
+                
+                elif cmd == 'search':
+                    if len(command) < 2:
+                        print('Usage: search <terms or "phrase">')
+                        continue
+                    
+                    query = ' '.join(command[1:])
+                    results = vq.search_text(query)
+                    print(f"\n{len(results)} best matches for {query}:")
+                    for word, score in results:
+                        print(f"  {word['word']} ({score:.2f}) - {word['definition'][:50]}...")
+                
+                elif cmd == 'filter':
+                    if len(command) < 2:
+                        print("Usage: filter <facet:value [AND|OR|NOT ...]>")
+                        continue
+                    
+                    try:
+                        words, counts = vq.faceted_search(' '.join(command[1:]), limit=15)
+                    except ValueError as e:
+                        print(f"Invalid filter: {e}")
+                        continue
+                    total = sum(counts['difficulty'].values())
+                    print(f"\n{total} matching words:")
+                    for word in words:
+                        print(f"  {word['word']} ({word['difficulty']}) - {word['definition'][:40]}...")
+                    if total > len(words):
+                        print(f"  ... and {total - len(words)} more")
+                    for facet, values in counts.items():
+                        print(f"  {facet}: " + ', '.join(f"{value} {count}" for value, count in values.items()))
                 
                 elif cmd == 'random':
                     count = 10
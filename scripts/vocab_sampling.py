@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Weighted Sampling Without Replacement
+
+An alias table (Vose's method) draws one id with probability proportional to
+its weight in O(1), after O(n) setup. Distinct samples of k ids are drawn by
+rejecting repeats, which matches picking each next id in proportion to the
+weights of those not yet chosen; when repeats become likely the sample falls
+back to one pass of exponential keys over the remaining ids.
+"""
+
+import heapq
+import random
+from array import array
+from typing import List, Sequence
+
+
+class AliasTable:
+    def __init__(self, ids: Sequence[int], weights: Sequence[float]):
+        """
+        Args:
+            ids: Ids to draw from
+            weights: Non-negative weight of each id; ids weighing 0 are never drawn
+
+        Raises:
+            ValueError: If no id has a positive weight
+        """
+        positive = [(entry_id, weight) for entry_id, weight in zip(ids, weights) if weight > 0]
+        if not positive:
+            raise ValueError("At least one weight must be positive")
+        self.ids = array('I', [entry_id for entry_id, _ in positive])
+        self.weights = [weight for _, weight in positive]
+
+        size = len(self.weights)
+        total = sum(self.weights)
+        scaled = [weight * size / total for weight in self.weights]
+        self.probability = [1.0] * size
+        self.alias = array('I', range(size))
+
+        # Pair each under-full slot with an over-full one that tops it up
+        small = [slot for slot, value in enumerate(scaled) if value < 1.0]
+        large = [slot for slot, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            under, over = small.pop(), large.pop()
+            self.probability[under] = scaled[under]
+            self.alias[under] = over
+            scaled[over] += scaled[under] - 1.0
+            (small if scaled[over] < 1.0 else large).append(over)
+        # Whatever is left is full up to rounding error
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def draw(self, rng: random.Random) -> int:
+        """Draw one id in proportion to its weight."""
+        slot = int(rng.random() * len(self.probability))
+        if rng.random() >= self.probability[slot]:
+            slot = self.alias[slot]
+        return self.ids[slot]
+
+    def sample(self, k: int, rng: random.Random) -> List[int]:
+        """
+        Draw up to k distinct ids, each next one in proportion to the weights
+        of the ids not drawn yet.
+        """
+        k = min(k, len(self.ids))
+        chosen = {}
+        if 2 * k <= len(self.ids):
+            # Each draw costs O(1); give up on rejection if heavy ids keep repeating
+            attempts = 4 * k + 32
+            while len(chosen) < k and attempts:
+                entry_id = self.draw(rng)
+                if entry_id in chosen:
+                    attempts -= 1
+                else:
+                    chosen[entry_id] = None
+        if len(chosen) < k:
+            # Exponential keys: the k largest u ** (1 / weight) are a weighted sample
+            remaining = [(entry_id, weight) for entry_id, weight in zip(self.ids, self.weights)
+                         if entry_id not in chosen]
+            ranked = heapq.nlargest(k - len(chosen), remaining,
+                                    key=lambda item: rng.random() ** (1.0 / item[1]))
+            chosen.update((entry_id, None) for entry_id, _ in ranked)
+        return list(chosen)
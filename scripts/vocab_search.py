@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Full-Text Search over Definitions and Examples
+
+A positional inverted index with BM25 ranking. Each field (definition,
+example) has its own postings so matches can be boosted per field, and
+positions allow "quoted phrase" queries. Postings are stored in flat integer
+arrays so the index can be saved once and loaded quickly.
+"""
+
+import heapq
+import math
+import pickle
+import re
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+from itertools import accumulate, chain, count
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vocab_cache import content_hash
+from vocab_text import stem_token
+
+INDEX_FORMAT = 1
+DEFAULT_FIELDS = ('definition', 'example')
+DEFAULT_BOOSTS = {'definition': 2.0, 'example': 1.0}
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+
+# Definitions reuse a small vocabulary, so each distinct token is stemmed once
+_stem = lru_cache(maxsize=None)(stem_token)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split into words and stem, so 'Humiliated' matches 'humiliate'."""
+    return [_stem(token) for token in _TOKEN.findall(text.lower())]
+
+
+def split_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """
+    Split a query into "quoted phrases" and bare terms, without stemming.
+
+    Returns:
+        (phrases, terms) where each phrase is a list of lowercase tokens
+    """
+    phrases = []
+    terms = []
+    for phrase, word in _QUERY_PART.findall(query):
+        if phrase:
+            tokens = _TOKEN.findall(phrase.lower())
+            if tokens:
+                phrases.append(tokens)
+        else:
+            terms.extend(_TOKEN.findall(word.lower()))
+    return phrases, terms
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """
+    Split a query into required "quoted phrases" and optional bare terms.
+
+    Returns:
+        (phrases, terms) where each phrase is a list of stemmed tokens
+    """
+    phrases, terms = split_query(query)
+    return [[_stem(token) for token in phrase] for phrase in phrases], [_stem(token) for token in terms]
+
+
+class FieldIndex:
+    """Positional postings for one text field."""
+
+    def __init__(self, texts: Iterable[str]):
+        """
+        Args:
+            texts: The field's text for every document id, in order
+        """
+        term_docs: Dict[str, List[int]] = defaultdict(list)
+        term_positions: Dict[str, List[List[int]]] = defaultdict(list)
+        lengths = []
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text or '')
+            lengths.append(len(tokens))
+            positions: Dict[str, List[int]] = defaultdict(list)
+            for position, token in enumerate(tokens):
+                positions[token].append(position)
+            for token, token_positions in positions.items():
+                term_docs[token].append(doc_id)
+                term_positions[token].append(token_positions)
+
+        self.lengths = array('I', lengths)
+        self.average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        # Term -> slot; a slot's postings are docs[doc_offsets[slot]:doc_offsets[slot + 1]]
+        # and posting p's positions are positions[position_offsets[p]:position_offsets[p + 1]]
+        self.slots: Dict[str, int] = dict(zip(term_docs, count()))
+        self.doc_offsets = array('I', accumulate(map(len, term_docs.values()), initial=0))
+        self.docs = array('I', chain.from_iterable(term_docs.values()))
+        position_lists = list(chain.from_iterable(term_positions.values()))
+        self.position_offsets = array('I', accumulate(map(len, position_lists), initial=0))
+        self.positions = array('I', chain.from_iterable(position_lists))
+
+    def term_frequencies(self, term: str) -> Dict[int, int]:
+        """Return {doc_id: occurrences} for a term."""
+        slot = self.slots.get(term)
+        if slot is None:
+            return {}
+        offsets = self.position_offsets
+        start, end = self.doc_offsets[slot], self.doc_offsets[slot + 1]
+        return {self.docs[p]: offsets[p + 1] - offsets[p] for p in range(start, end)}
+
+    def _term_positions(self, term: str) -> Dict[int, List[int]]:
+        slot = self.slots.get(term)
+        if slot is None:
+            return {}
+        offsets = self.position_offsets
+        start, end = self.doc_offsets[slot], self.doc_offsets[slot + 1]
+        return {self.docs[p]: self.positions[offsets[p]:offsets[p + 1]] for p in range(start, end)}
+
+    def phrase_frequencies(self, phrase: List[str]) -> Dict[int, int]:
+        """Return {doc_id: occurrences} for consecutive tokens."""
+        if len(phrase) == 1:
+            return self.term_frequencies(phrase[0])
+
+        # Start from the rarest token's documents and check the others' positions
+        token_positions = [self._term_positions(token) for token in phrase]
+        candidates = min(token_positions, key=len).keys()
+        frequencies = {}
+        for doc_id in candidates:
+            if not all(doc_id in positions for positions in token_positions):
+                continue
+            following = [set(positions[doc_id]) for positions in token_positions[1:]]
+            occurrences = sum(1 for start in token_positions[0][doc_id]
+                              if all(start + offset in later for offset, later in enumerate(following, 1)))
+            if occurrences:
+                frequencies[doc_id] = occurrences
+        return frequencies
+
+    def to_state(self) -> tuple:
+        return (len(self.slots), '\0'.join(self.slots), self.lengths, self.average_length,
+                self.doc_offsets, self.docs, self.position_offsets, self.positions)
+
+    @classmethod
+    def from_state(cls, state: tuple) -> 'FieldIndex':
+        field = cls.__new__(cls)
+        (term_count, terms, field.lengths, field.average_length,
+         field.doc_offsets, field.docs, field.position_offsets, field.positions) = state
+        terms = terms.split('\0') if term_count else []
+        field.slots = dict(zip(terms, range(len(terms))))
+        return field
+
+
+class BM25Index:
+    def __init__(self, documents: List[Dict[str, str]], fields: Tuple[str, ...] = DEFAULT_FIELDS,
+                 k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            documents: One dict of field texts per document id
+            fields: Fields to index
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.doc_count = len(documents)
+        self.digest = self.documents_digest(documents, fields)
+        self.fields = {field: FieldIndex(document.get(field, '') for document in documents)
+                       for field in fields}
+
+    @staticmethod
+    def documents_digest(documents: List[Dict[str, str]], fields: Tuple[str, ...] = DEFAULT_FIELDS) -> str:
+        """Digest of the indexed text, to tell whether a saved index is stale."""
+        return content_hash(*(document.get(field) or '' for document in documents for field in fields))
+
+    def search(self, query: str, k: int = 10,
+               boosts: Optional[Dict[str, float]] = None) -> List[Tuple[int, float]]:
+        """
+        Rank documents for a query of bare terms and "quoted phrases".
+
+        Bare terms are optional and add to the score; every phrase must occur
+        (in any field). Field scores are BM25 weighted by ``boosts``.
+
+        Returns:
+            Up to k (doc_id, score) pairs, best first
+        """
+        boosts = DEFAULT_BOOSTS if boosts is None else boosts
+        phrases, terms = parse_query(query)
+        if not phrases and not terms:
+            return []
+        term_clauses = [[term] for term in dict.fromkeys(terms)]
+
+        scores: Dict[int, float] = defaultdict(float)
+        phrase_docs = [set() for _ in phrases]
+        for field, boost in boosts.items():
+            field_index = self.fields.get(field)
+            if field_index is None or not boost:
+                continue
+            for clause in term_clauses:
+                self._accumulate(scores, field_index, field_index.term_frequencies(clause[0]), boost)
+            for matched, phrase in zip(phrase_docs, phrases):
+                frequencies = field_index.phrase_frequencies(phrase)
+                matched.update(frequencies)
+                self._accumulate(scores, field_index, frequencies, boost)
+
+        if phrases:
+            required = set.intersection(*phrase_docs)
+            candidates = ((doc_id, score) for doc_id, score in scores.items() if doc_id in required)
+        else:
+            candidates = scores.items()
+        # Best k without sorting every match; ties go to the lower id
+        return heapq.nsmallest(k, candidates, key=lambda item: (-item[1], item[0]))
+
+    def _accumulate(self, scores: Dict[int, float], field_index: FieldIndex,
+                    frequencies: Dict[int, int], boost: float) -> None:
+        k1, b = self.k1, self.b
+        df = len(frequencies)
+        idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+        lengths = field_index.lengths
+        average = field_index.average_length or 1.0
+        for doc_id, tf in frequencies.items():
+            norm = k1 * (1 - b + b * lengths[doc_id] / average)
+            scores[doc_id] += boost * idf * tf * (k1 + 1) / (tf + norm)
+
+    def save(self, path: str) -> None:
+        """Write the index to a file so it can be loaded instead of rebuilt."""
+        state = (INDEX_FORMAT, self.k1, self.b, self.doc_count, self.digest,
+                 {field: field_index.to_state() for field, field_index in self.fields.items()})
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'BM25Index':
+        """Read an index written by save()."""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state[0] != INDEX_FORMAT:
+            raise ValueError(f"Unsupported text index format {state[0]}")
+
+        index = cls.__new__(cls)
+        _, index.k1, index.b, index.doc_count, index.digest, fields = state
+        index.fields = {field: FieldIndex.from_state(field_state) for field, field_state in fields.items()}
+        return index
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+SAT Vocabulary Query Server
+
+Loads the categorized vocabulary and builds every VocabularyQuery index once,
+then answers queries from any number of clients over TCP. The protocol is
+newline-delimited JSON: each request line is an object such as
+
+    {"id": 1, "op": "word", "word": "abate"}
+    {"id": 2, "op": "filter", "query": "difficulty:hard AND NOT pos:noun"}
+    {"id": 3, "op": "random", "count": 10, "seed": 7}
+
+and each gets one response line, in order, echoing the id:
+
+    {"id": 1, "result": [...]}  or  {"id": 1, "error": "..."}
+
+A request that cannot be answered, or a line longer than MAX_REQUEST_BYTES,
+gets an error response and the connection carries on with the next line.
+
+See QUERY_OPERATIONS in vocab_query.py for the available operations.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+from vocab_query import VocabularyQuery
+from vocab_sqlite import SQLiteVocabularyQuery
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Longest request line accepted; longer lines get an error response and are skipped
+MAX_REQUEST_BYTES = 1 << 20
+
+
+def _request_id(line: bytes) -> Any:
+    """The id of a request line, or None if it has none or cannot be parsed."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return None
+    return request.get('id') if isinstance(request, dict) else None
+
+
+class QueryServer:
+    def __init__(self, vq: VocabularyQuery):
+        """
+        Args:
+            vq: Query engine shared by every connection
+        """
+        self.vq = vq
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer a connection's requests in order until it closes."""
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial  # a last line without a newline, or b'' at end of input
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, {'id': None, 'error': f"Request longer than {MAX_REQUEST_BYTES} bytes"})
+                    await self._skip_line(reader)
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Queries take microseconds to milliseconds, so they run inline
+                # rather than in a thread pool that would only add handoff cost
+                try:
+                    response = next(self.vq.run_batch([line]))
+                    await self._send(writer, response)
+                except ConnectionError:
+                    raise
+                except Exception as e:
+                    # One bad request must not end the connection or the server
+                    await self._send(writer, {'id': _request_id(line), 'error': f"{type(e).__name__}: {e}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, response: dict) -> None:
+        writer.write(json.dumps(response, ensure_ascii=False, default=dict).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    @staticmethod
+    async def _skip_line(reader: asyncio.StreamReader) -> None:
+        """Discard input up to and including the next newline, however far away it is."""
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.LimitOverrunError as e:
+                # The unterminated data is left buffered; drop it and keep looking
+                await reader.readexactly(e.consumed)
+
+    async def serve(self, host: str, port: int) -> None:
+        """Listen until cancelled."""
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_REQUEST_BYTES)
+        async with server:
+            print(f"Serving vocabulary queries on {host}:{port}")
+            await server.serve_forever()
+
+
+def main():
+    """Load the vocabulary and indexes once, then serve queries until interrupted."""
+    arg_parser = argparse.ArgumentParser(description="Serve SAT vocabulary queries over TCP (newline-delimited JSON).")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST, help="Interface to listen on")
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    arg_parser.add_argument('--vocab-file', default='sat_vocabulary_categorized.json',
+                            help="Categorized vocabulary to serve")
+    arg_parser.add_argument('--columnar', action='store_true',
+                            help="Hold the vocabulary in a compact columnar store")
+    arg_parser.add_argument('--snapshot', help="Snapshot from vocab_snapshot.py to map instead of the vocabulary file")
+    arg_parser.add_argument('--database', help="SQLite database from vocab_sqlite.py to query instead")
+    arg_parser.add_argument('--fuzzy-index', help="File to load or save the misspelling index")
+    arg_parser.add_argument('--text-index', help="File to load or save the full-text index")
+    args = arg_parser.parse_args()
+
+    try:
+        start_time = time.time()
+        if args.database:
+            vq = SQLiteVocabularyQuery(args.database, fuzzy_index_file=args.fuzzy_index)
+        else:
+            vq = VocabularyQuery(args.vocab_file, fuzzy_index_file=args.fuzzy_index,
+                                 text_index_file=args.text_index, columnar=args.columnar,
+                                 snapshot_file=args.snapshot)
+            # Build the lazily created indexes now, not on the first client's request
+            # (a database answers text search with its own full-text index)
+            vq.text_index
+        vq.fuzzy_index
+        print(f"Loaded {vq.get_statistics()['total_words']} entries in {time.time() - start_time:.2f}s")
+        asyncio.run(QueryServer(vq).serve(args.host, args.port))
+    except FileNotFoundError as e:
+        print(f"Error: {e.filename} not found.")
+        print("Please run vocab_categorizer.py first to generate the categorized vocabulary.")
+    except json.JSONDecodeError as e:
+        print(f"Error parsing {args.vocab_file}: {e}")
+    except ValueError as e:
+        print(f"Error: {e}")
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
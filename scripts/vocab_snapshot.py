@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Vocabulary Snapshots
+
+Writes a categorized vocabulary together with every index VocabularyQuery
+builds for it into one binary file, and opens such a file again by memory
+mapping it. Nothing is parsed or rebuilt at startup: integer columns and id
+lists are used in place as memoryviews over the mapping, facet bitmaps are
+copied straight out of it, and strings (words, definitions, examples) are
+decoded only when an entry is read.
+
+    python3 vocab_snapshot.py -o sat_vocabulary.snap
+    python3 vocab_server.py --snapshot sat_vocabulary.snap
+
+File layout: MAGIC, a fixed header (format, manifest offset and length),
+8-byte aligned sections of native-order arrays, then a JSON manifest naming
+each section's offset, typecode and length along with the small tables
+(coded values, index keys, statistics). A snapshot's entries are read-only.
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from itertools import accumulate
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+from vocab_columns import CodedColumn, VocabularyColumns
+
+MAGIC = b'VOCSNAP\0'
+# Bump when the layout changes; older snapshots are then rejected, not misread
+SNAPSHOT_FORMAT = 1
+_HEADER = struct.Struct('<IQQ')
+
+# Posting lists VocabularyQuery keeps per field value
+POSTING_INDEXES = ('difficulty_index', 'category_index', 'pos_index', 'syllable_index')
+SORTED_COLUMNS = ('length_column', 'syllable_column')
+
+
+class StringColumn(Sequence):
+    """UTF-8 strings stored back to back, each decoded when it is read."""
+
+    __slots__ = ('_data', '_base', '_offsets')
+
+    def __init__(self, data: mmap.mmap, base: int, offsets: Sequence[int]):
+        """
+        Args:
+            data: Buffer holding the encoded strings
+            base: Position of the first string in data
+            offsets: Start of every string relative to base, plus the end of the last
+        """
+        self._data = data
+        self._base = base
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string index out of range")
+        offsets = self._offsets
+        return self._data[self._base + offsets[index]:self._base + offsets[index + 1]].decode('utf-8')
+
+
+class GatheredColumn(Sequence):
+    """The items of a sequence at a list of positions."""
+
+    __slots__ = ('_items', '_positions')
+
+    def __init__(self, items: Sequence, positions: Sequence[int]):
+        self._items = items
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._items[position] for position in self._positions[index]]
+        return self._items[self._positions[index]]
+
+
+class JsonColumn(Sequence):
+    """JSON objects stored as strings ('' for none), decoded when read."""
+
+    __slots__ = ('_texts',)
+
+    def __init__(self, texts: StringColumn):
+        self._texts = texts
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __getitem__(self, index: int) -> Any:
+        text = self._texts[index]
+        return json.loads(text) if text else None
+
+    def get(self, index: int, default: Any = None) -> Any:
+        value = self[index] if 0 <= index < len(self._texts) else None
+        return default if value is None else value
+
+
+class HeadwordIndex(Mapping):
+    """Sorted headword keys mapped to entry ids, looked up by binary search."""
+
+    def __init__(self, headwords: Sequence[str], entry_ids: Sequence[int]):
+        self.headwords = headwords
+        self.entry_ids = entry_ids
+
+    def _position(self, key: str) -> int:
+        position = bisect_left(self.headwords, key)
+        if position == len(self.headwords) or self.headwords[position] != key:
+            raise KeyError(key)
+        return position
+
+    def __getitem__(self, key: str) -> int:
+        return self.entry_ids[self._position(key)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.headwords)
+
+    def __len__(self) -> int:
+        return len(self.headwords)
+
+
+class SenseIndex(HeadwordIndex):
+    """Headwords with several senses mapped to their sense ids, first sense first."""
+
+    def __init__(self, headwords: Sequence[str], offsets: Sequence[int], sense_ids: Sequence[int], count: int):
+        """
+        Args:
+            headwords: Every sorted headword key
+            offsets: Start of each headword's ids in sense_ids, plus the end of the last
+            sense_ids: Sense ids of every headword, concatenated
+            count: Number of headwords with more than one sense
+        """
+        super().__init__(headwords, sense_ids)
+        self.offsets = offsets
+        self.count = count
+
+    def __getitem__(self, key: str) -> List[int]:
+        position = self._position(key)
+        start, stop = self.offsets[position], self.offsets[position + 1]
+        if stop - start < 2:
+            raise KeyError(key)
+        return self.entry_ids[start:stop].tolist()
+
+    def __iter__(self) -> Iterator[str]:
+        offsets = self.offsets
+        return (key for position, key in enumerate(self.headwords)
+                if offsets[position + 1] - offsets[position] > 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class SnapshotVocabulary(VocabularyColumns):
+    """A VocabularyColumns store whose columns are read in place from a snapshot."""
+
+    def __init__(self, columns: Dict[str, Any]):
+        """
+        Args:
+            columns: Column attribute name -> column read from the snapshot
+        """
+        self.__dict__.update(columns)
+
+    def append(self, entry: Dict) -> None:
+        raise TypeError("Snapshot entries are read-only")
+
+    def __setitem__(self, index: int, entry: Dict) -> None:
+        raise TypeError("Snapshot entries are read-only")
+
+    def pop(self) -> Dict:
+        raise TypeError("Snapshot entries are read-only")
+
+
+class _SectionWriter:
+    """Appends aligned sections to a snapshot file, recording where each one went."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.sections: Dict[str, Tuple[int, str, int]] = {}
+
+    def add(self, name: str, values: array) -> None:
+        self.f.write(b'\0' * (-self.f.tell() % 8))
+        self.sections[name] = (self.f.tell(), values.typecode, len(values))
+        self.f.write(values.tobytes())
+
+    def add_strings(self, name: str, strings: Iterable[str]) -> None:
+        encoded = [string.encode('utf-8') for string in strings]
+        self.add(name + '.offsets', array('Q', accumulate(map(len, encoded), initial=0)))
+        self.add(name, array('B', b''.join(encoded)))
+
+
+def _postings(writer: _SectionWriter, name: str, index: Dict[Any, Sequence[int]]) -> List[Tuple[Any, int, int]]:
+    """Write an index's id lists as one section; returns (key, start, stop) per key."""
+    keys = []
+    ids = array('I')
+    for key, entry_ids in index.items():
+        keys.append((key, len(ids), len(ids) + len(entry_ids)))
+        ids.extend(entry_ids)
+    writer.add(name, ids)
+    return keys
+
+
+def write_snapshot(query, path: str) -> None:
+    """
+    Write a VocabularyQuery's entries and indexes to a snapshot file.
+
+    Args:
+        query: A VocabularyQuery, over any kind of vocabulary store
+        path: File to write
+    """
+    vocabulary = query.vocabulary
+    if not isinstance(vocabulary, VocabularyColumns):
+        vocabulary = VocabularyColumns(vocabulary)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC + _HEADER.pack(0, 0, 0))
+        writer = _SectionWriter(f)
+        manifest: Dict[str, Any] = {'byteorder': sys.byteorder, 'size': len(vocabulary)}
+
+        writer.add_strings('words', vocabulary.words)
+        writer.add_strings('definitions', vocabulary.definitions)
+        writer.add_strings('examples', vocabulary.examples)
+        extras = map(vocabulary.extras.get, range(len(vocabulary)))
+        writer.add_strings('extras', (json.dumps(extra) if extra else '' for extra in extras))
+        writer.add('pages', array('i', vocabulary.pages))
+        writer.add('syllable_counts', array('H', vocabulary.syllable_counts))
+        writer.add('word_lengths', array('H', vocabulary.word_lengths))
+        manifest['values'] = {}
+        for name in ('parts_of_speech', 'difficulties', 'categories'):
+            column = getattr(vocabulary, name)
+            writer.add(name, array('H', column.codes))
+            manifest['values'][name] = column.values
+
+        manifest['postings'] = {name: _postings(writer, name, getattr(query, name)) for name in POSTING_INDEXES}
+        for name in SORTED_COLUMNS:
+            column = getattr(query, name)
+            writer.add(name + '.ids', array('I', column.ids))
+            writer.add(name + '.keys', array('H', column.keys))
+
+        manifest['facets'] = {}
+        for facet, bitmaps in query.facets.bitmaps.items():
+            manifest['facets'][facet] = []
+            for value, bitmap in bitmaps.items():
+                name = f'facets.{facet}.{value}'
+                writer.add(name, array('B', bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')))
+                manifest['facets'][facet].append((value, name))
+
+        # Headwords with their first sense and every sense id, in sorted order
+        headwords = query.headwords
+        positions = {key: position for position, key in enumerate(headwords)}
+        writer.add_strings('headwords', headwords)
+        writer.add('first_senses', array('I', (query.word_index[key] for key in headwords)))
+        senses = [query.sense_index.get(key) or [query.word_index[key]] for key in headwords]
+        writer.add('sense_offsets', array('Q', accumulate(map(len, senses), initial=0)))
+        writer.add('sense_ids', array('I', (entry_id for entry_ids in senses for entry_id in entry_ids)))
+        manifest['sense_count'] = len(query.sense_index)
+        manifest['headwords_by_difficulty'] = _postings(writer, 'headwords_by_difficulty', {
+            difficulty: [positions[key] for key in keys]
+            for difficulty, keys in query.headwords_by_difficulty.items()})
+
+        manifest['stats'] = query.stats.to_state()
+        manifest['sections'] = writer.sections
+
+        manifest_offset = f.tell()
+        encoded = json.dumps(manifest).encode('utf-8')
+        f.write(encoded)
+        f.seek(len(MAGIC))
+        f.write(_HEADER.pack(SNAPSHOT_FORMAT, manifest_offset, len(encoded)))
+
+
+class VocabularySnapshot:
+    def __init__(self, path: str):
+        """
+        Map a snapshot file into memory.
+
+        Args:
+            path: File written by write_snapshot()
+
+        Raises:
+            ValueError: If the file is not a snapshot, or was written in
+                another format version or byte order
+        """
+        with open(path, 'rb') as f:
+            # The mapping stays valid after the file is closed
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a vocabulary snapshot")
+        snapshot_format, manifest_offset, manifest_length = _HEADER.unpack_from(self.data, len(MAGIC))
+        if snapshot_format != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {snapshot_format}")
+        self.manifest = json.loads(self.data[manifest_offset:manifest_offset + manifest_length])
+        if self.manifest['byteorder'] != sys.byteorder:
+            raise ValueError(f"Snapshot was written on a {self.manifest['byteorder']}-endian machine")
+        self.size = self.manifest['size']
+        self._buffer = memoryview(self.data)
+
+    def array(self, name: str) -> memoryview:
+        """A section as a read-only memoryview of its typecode."""
+        offset, typecode, length = self.manifest['sections'][name]
+        return self._buffer[offset:offset + length * array(typecode).itemsize].cast(typecode)
+
+    def strings(self, name: str) -> StringColumn:
+        return StringColumn(self.data, self.manifest['sections'][name][0], self.array(name + '.offsets'))
+
+    def postings(self, name: str) -> Dict[Any, memoryview]:
+        """An index's id lists by key."""
+        ids = self.array(name)
+        return {key: ids[start:stop] for key, start, stop in self.manifest['postings'][name]}
+
+    def vocabulary(self) -> SnapshotVocabulary:
+        values = self.manifest['values']
+        return SnapshotVocabulary({
+            'words': self.strings('words'),
+            'definitions': self.strings('definitions'),
+            'examples': self.strings('examples'),
+            'extras': JsonColumn(self.strings('extras')),
+            'pages': self.array('pages'),
+            'syllable_counts': self.array('syllable_counts'),
+            'word_lengths': self.array('word_lengths'),
+            'parts_of_speech': CodedColumn(values['parts_of_speech'], self.array('parts_of_speech')),
+            'difficulties': CodedColumn(values['difficulties'], self.array('difficulties')),
+            'categories': CodedColumn(map(tuple, values['categories']), self.array('categories')),
+        })
+
+    def sorted_column(self, name: str) -> Tuple[memoryview, memoryview]:
+        """(ids, keys) of one of SORTED_COLUMNS."""
+        return self.array(name + '.ids'), self.array(name + '.keys')
+
+    def facet_bitmaps(self) -> Dict[str, Dict[str, int]]:
+        return {facet: {value: int.from_bytes(self.array(name), 'little') for value, name in values}
+                for facet, values in self.manifest['facets'].items()}
+
+    def headwords(self) -> StringColumn:
+        return self.strings('headwords')
+
+    def word_index(self, headwords: StringColumn) -> HeadwordIndex:
+        return HeadwordIndex(headwords, self.array('first_senses'))
+
+    def sense_index(self, headwords: StringColumn) -> SenseIndex:
+        return SenseIndex(headwords, self.array('sense_offsets'), self.array('sense_ids'),
+                          self.manifest['sense_count'])
+
+    def headwords_by_difficulty(self, headwords: StringColumn) -> Dict[str, GatheredColumn]:
+        positions = self.array('headwords_by_difficulty')
+        return {difficulty: GatheredColumn(headwords, positions[start:stop])
+                for difficulty, start, stop in self.manifest['headwords_by_difficulty']}
+
+
+def main():
+    """Build a snapshot of the categorized vocabulary and its indexes."""
+    from vocab_query import VocabularyQuery
+
+    arg_parser = argparse.ArgumentParser(description="Write a memory-mappable SAT vocabulary snapshot.")
+    arg_parser.add_argument('--vocab-file', default='sat_vocabulary_categorized.json',
+                            help="Categorized vocabulary to snapshot")
+    arg_parser.add_argument('-o', '--output', default='sat_vocabulary.snap', help="Snapshot file to write")
+    args = arg_parser.parse_args()
+
+    try:
+        vq = VocabularyQuery(args.vocab_file)
+        write_snapshot(vq, args.output)
+        print(f"Wrote {len(vq.vocabulary)} entries and their indexes to {args.output}")
+    except FileNotFoundError as e:
+        print(f"Error: {e.filename} not found.")
+    except json.JSONDecodeError as e:
+        print(f"Error parsing {args.vocab_file}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+SQLite Vocabulary Backend
+
+Stores categorized vocabulary in an SQLite database instead of a JSON file:
+headwords, their senses (one row per entry) and categories are separate
+tables, the filterable fields are indexed, and an FTS5 table over
+definitions and examples serves full-text search. SQLiteVocabularyQuery
+answers the same queries as VocabularyQuery, with the same method
+signatures, straight from the database.
+
+    python3 vocab_sqlite.py -o sat_vocabulary.db
+    python3 vocab_server.py --database sat_vocabulary.db
+"""
+
+import argparse
+import errno
+import json
+import os
+import random
+import sqlite3
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from vocab_columns import ENTRY_FIELDS, complete_entry
+from vocab_facets import FACETS, LENGTH_BUCKETS, SYLLABLE_BUCKETS, parse_filter
+from vocab_query import VocabularyQuery, normalize_word
+from vocab_search import DEFAULT_BOOSTS, split_query
+
+# Entries inserted per executemany call while bulk loading
+BATCH_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    headword TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS senses (
+    id INTEGER PRIMARY KEY,
+    word_id INTEGER NOT NULL REFERENCES words(id),
+    word TEXT NOT NULL,
+    part_of_speech TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    example TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    difficulty TEXT NOT NULL,
+    syllable_count INTEGER NOT NULL,
+    word_length INTEGER NOT NULL,
+    extras TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sense_categories (
+    sense_id INTEGER NOT NULL REFERENCES senses(id),
+    position INTEGER NOT NULL,
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    PRIMARY KEY (sense_id, position)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS senses_word ON senses(word_id);
+CREATE INDEX IF NOT EXISTS senses_difficulty ON senses(difficulty);
+CREATE INDEX IF NOT EXISTS senses_part_of_speech ON senses(part_of_speech);
+CREATE INDEX IF NOT EXISTS senses_syllable_count ON senses(syllable_count);
+CREATE INDEX IF NOT EXISTS senses_word_length ON senses(word_length);
+CREATE INDEX IF NOT EXISTS sense_categories_category ON sense_categories(category_id, sense_id);
+
+-- Full-text index over the senses table's own text
+CREATE VIRTUAL TABLE IF NOT EXISTS senses_fts USING fts5(
+    definition, example, content='senses', content_rowid='id', tokenize='porter unicode61'
+);
+"""
+
+# Keep senses_fts in step with later changes to senses
+FTS_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS senses_fts_insert AFTER INSERT ON senses BEGIN
+    INSERT INTO senses_fts (rowid, definition, example) VALUES (new.id, new.definition, new.example);
+END;
+CREATE TRIGGER IF NOT EXISTS senses_fts_delete AFTER DELETE ON senses BEGIN
+    INSERT INTO senses_fts (senses_fts, rowid, definition, example)
+    VALUES ('delete', old.id, old.definition, old.example);
+END;
+"""
+
+# An entry's fields, in ENTRY_FIELDS order, then its extra fields as JSON
+_ENTRY_COLUMNS = """
+    s.word, s.part_of_speech, s.definition, s.example, s.page,
+    (SELECT json_group_array(name) FROM (
+        SELECT c.name FROM sense_categories sc JOIN categories c ON c.id = sc.category_id
+        WHERE sc.sense_id = s.id ORDER BY sc.position)),
+    s.difficulty, s.syllable_count, s.word_length, s.extras"""
+
+# Senses of one headword, first sense first
+_SENSE_ORDER = "coalesce(json_extract(s.extras, '$.definition_number'), 0), s.id"
+
+_IN_CATEGORY = """s.id IN (
+    SELECT sc.sense_id FROM sense_categories sc JOIN categories c ON c.id = sc.category_id
+    WHERE lower(c.name) = ?)"""
+
+# Facets a filter can name: the SQL value compared, or the column bucketed
+_FACET_COLUMNS = {'difficulty': 'lower(s.difficulty)', 'pos': 'lower(s.part_of_speech)'}
+_BUCKETED_COLUMNS = {'syllables': ('s.syllable_count', SYLLABLE_BUCKETS),
+                     'length': ('s.word_length', LENGTH_BUCKETS)}
+
+
+def _entry(row: Sequence) -> Dict[str, Any]:
+    """Rebuild an entry dict from the _ENTRY_COLUMNS of a row."""
+    entry = dict(zip(ENTRY_FIELDS, row))
+    entry['categories'] = json.loads(entry['categories'])
+    extras = row[len(ENTRY_FIELDS)]
+    if extras:
+        entry.update(json.loads(extras))
+    return entry
+
+
+def _bucket_label(column: str, buckets: Sequence[Tuple[str, int, int]]) -> str:
+    """SQL naming the bucket a column's value falls in (NULL if none)."""
+    cases = ' '.join(f"WHEN {column} BETWEEN {low} AND {high} THEN '{label}'" for label, low, high in buckets)
+    return f"CASE {cases} END"
+
+
+def _filter_sql(node: Optional[tuple], params: List[Any]) -> str:
+    """
+    Translate a parse_filter tree to a WHERE condition on senses s.
+
+    Raises:
+        ValueError: If the filter names an unknown facet
+    """
+    if node is None:
+        return '1'
+    kind = node[0]
+    if kind == 'not':
+        return f"NOT ({_filter_sql(node[1], params)})"
+    if kind in ('and', 'or'):
+        return '(' + f' {kind.upper()} '.join(_filter_sql(child, params) for child in node[1]) + ')'
+
+    _, facet, value = node
+    value = value.lower()
+    if facet == 'category':
+        params.append(value)
+        return _IN_CATEGORY
+    if facet in _FACET_COLUMNS:
+        params.append(value)
+        return f"{_FACET_COLUMNS[facet]} = ?"
+    if facet in _BUCKETED_COLUMNS:
+        column, buckets = _BUCKETED_COLUMNS[facet]
+        for label, low, high in buckets:
+            if label == value:
+                params.extend((low, high))
+                return f"{column} BETWEEN ? AND ?"
+        return '0'
+    raise ValueError(f"Unknown facet '{facet}'. Available: {', '.join(FACETS)}")
+
+
+def _fts_phrase(tokens: List[str]) -> str:
+    return '"' + ' '.join(tokens) + '"'
+
+
+def _insert_entries(connection: sqlite3.Connection, numbered: List[Tuple[int, Dict]]) -> None:
+    """
+    Insert (id, entry) pairs, adding headwords and categories not seen before.
+
+    Raises:
+        ValueError: If an entry lacks a field that is not optional
+    """
+    numbered = [(entry_id, complete_entry(entry)) for entry_id, entry in numbered]
+    keys = list(dict.fromkeys(normalize_word(entry['word']) for _, entry in numbered))
+    word_ids = dict(connection.execute(
+        "SELECT headword, id FROM words WHERE headword IN (SELECT value FROM json_each(?))", (json.dumps(keys),)))
+    next_word_id = connection.execute("SELECT coalesce(max(id), 0) + 1 FROM words").fetchone()[0]
+    new_words = []
+    for key in keys:
+        if key not in word_ids:
+            word_ids[key] = next_word_id
+            new_words.append((next_word_id, key))
+            next_word_id += 1
+
+    category_ids = dict(connection.execute("SELECT name, id FROM categories"))
+    new_categories = []
+    senses = []
+    links = []
+    for entry_id, entry in numbered:
+        extras = {key: value for key, value in entry.items() if key not in ENTRY_FIELDS}
+        senses.append((entry_id, word_ids[normalize_word(entry['word'])], entry['word'], entry['part_of_speech'],
+                       entry['definition'], entry['example'], entry['page'], entry['difficulty'],
+                       entry['syllable_count'], entry['word_length'], json.dumps(extras) if extras else None))
+        for position, category in enumerate(entry['categories']):
+            if category not in category_ids:
+                category_ids[category] = len(category_ids) + 1
+                new_categories.append((category_ids[category], category))
+            links.append((entry_id, position, category_ids[category]))
+
+    connection.executemany("INSERT INTO words (id, headword) VALUES (?, ?)", new_words)
+    connection.executemany("INSERT INTO categories (id, name) VALUES (?, ?)", new_categories)
+    connection.executemany("INSERT INTO senses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", senses)
+    connection.executemany("INSERT INTO sense_categories VALUES (?, ?, ?)", links)
+
+
+def _delete_entry(connection: sqlite3.Connection, entry_id: int) -> None:
+    """Delete a sense, and its headword once no sense is left."""
+    word_id = connection.execute("SELECT word_id FROM senses WHERE id = ?", (entry_id,)).fetchone()[0]
+    connection.execute("DELETE FROM sense_categories WHERE sense_id = ?", (entry_id,))
+    connection.execute("DELETE FROM senses WHERE id = ?", (entry_id,))
+    connection.execute("DELETE FROM words WHERE id = ? AND NOT EXISTS (SELECT 1 FROM senses WHERE word_id = ?)",
+                       (word_id, word_id))
+
+
+def load_entries(connection: sqlite3.Connection, entries: Iterable[Dict],
+                 batch_size: int = BATCH_SIZE) -> range:
+    """
+    Bulk insert entries in one transaction, batch_size rows per statement.
+
+    Returns:
+        The ids given to the entries, after any already stored
+
+    Raises:
+        ValueError: If an entry lacks a field that is not optional; nothing is inserted
+    """
+    first_id = connection.execute("SELECT coalesce(max(id) + 1, 0) FROM senses").fetchone()[0]
+    next_id = first_id
+    entries = iter(entries)
+    with connection:
+        while True:
+            batch = list(islice(entries, batch_size))
+            if not batch:
+                break
+            _insert_entries(connection, list(enumerate(batch, next_id)))
+            next_id += len(batch)
+    return range(first_id, next_id)
+
+
+def create_database(path: str, entries: Iterable[Dict], batch_size: int = BATCH_SIZE) -> None:
+    """Write entries to a new database file (replacing any file at path)."""
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(SCHEMA)
+        load_entries(connection, entries, batch_size)
+        # Indexing all text at once is several times faster than row by row through the triggers
+        with connection:
+            connection.execute("INSERT INTO senses_fts (senses_fts) VALUES ('rebuild')")
+        connection.executescript(FTS_TRIGGERS)
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+
+class SQLiteVocabularyQuery(VocabularyQuery):
+    """
+    VocabularyQuery answered from an SQLite database.
+
+    Entry ids are the senses table's ids. Unlike the in-memory store, removing
+    an entry leaves a gap; no other id changes.
+    """
+
+    def __init__(self, database: str, fuzzy_index_file: Optional[str] = None):
+        """
+        Args:
+            database: Database file written by create_database()
+            fuzzy_index_file: File the misspelling index is loaded from, or
+                saved to after it is first built
+
+        Raises:
+            FileNotFoundError: If the database does not exist
+        """
+        if not os.path.exists(database):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), database)
+        self.connection = sqlite3.connect(database)
+        self.fuzzy_index_file = fuzzy_index_file
+        self._fuzzy_index = None
+        self._text_index = None
+        # Ids random_words draws from per (difficulty, category), and alias tables per weighting
+        self._sample_pools = OrderedDict()
+        self._alias_tables = OrderedDict()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """
+        Run a query with bound parameters.
+
+        Raises:
+            ValueError: If a parameter cannot be bound, e.g. a list, or an int
+                too large for SQLite's 64-bit integers
+        """
+        try:
+            return self.connection.execute(sql, params)
+        except (sqlite3.InterfaceError, sqlite3.ProgrammingError, OverflowError) as e:
+            raise ValueError(f"Invalid query argument: {e}") from None
+
+    def _select(self, where: str, params: Sequence[Any] = (), order: str = 's.id',
+                limit: Optional[int] = None) -> List[Dict]:
+        """Entries of the senses s matching a WHERE condition."""
+        rows = self._execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM senses s WHERE {where} ORDER BY {order} LIMIT ?",
+            (*params, -1 if limit is None else limit))
+        return [_entry(row) for row in rows]
+
+    def _iter_select(self, where: str, params: Sequence[Any], order: str) -> Iterator[Dict]:
+        rows = self._execute(f"SELECT {_ENTRY_COLUMNS} FROM senses s WHERE {where} ORDER BY {order}", params)
+        return (_entry(row) for row in rows)
+
+    def _entries(self, entry_ids: Sequence[int]) -> List[Dict]:
+        """Return the entries for ids, in the order given."""
+        rows = self._execute(
+            f"SELECT s.id, {_ENTRY_COLUMNS} FROM senses s WHERE s.id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(entry_ids)),))
+        entries = {row[0]: _entry(row[1:]) for row in rows}
+        return [entries[entry_id] for entry_id in entry_ids]
+
+    def _count(self, where: str, params: Sequence[Any]) -> int:
+        return self._execute(f"SELECT count(*) FROM senses s WHERE {where}", params).fetchone()[0]
+
+    def search_by_difficulty(self, difficulty: str) -> List[Dict]:
+        """Get all words of a specific difficulty level."""
+        return self._select("s.difficulty = ?", (difficulty.lower(),))
+
+    def search_by_category(self, category: str) -> List[Dict]:
+        """Get all words in a specific category."""
+        return self._select(_IN_CATEGORY, (category.lower(),))
+
+    def search_by_word_length(self, min_length: int = 0, max_length: int = 100) -> List[Dict]:
+        """Get words within a specific length range."""
+        return self._select("s.word_length BETWEEN ? AND ?", (min_length, max_length))
+
+    def iter_by_word_length(self, min_length: int = 0, max_length: int = 100) -> Iterator[Dict]:
+        """Lazily yield words within a length range, shortest first."""
+        return self._iter_select("s.word_length BETWEEN ? AND ?", (min_length, max_length), "s.word_length, s.id")
+
+    def iter_by_syllable_range(self, min_syllables: int = 0, max_syllables: int = 100) -> Iterator[Dict]:
+        """Lazily yield words within a syllable count range, fewest syllables first."""
+        return self._iter_select("s.syllable_count BETWEEN ? AND ?", (min_syllables, max_syllables),
+                                 "s.syllable_count, s.id")
+
+    def iter_by_ranges(self, min_length: int = 0, max_length: int = 100,
+                       min_syllables: int = 0, max_syllables: int = 100) -> Iterator[Dict]:
+        """
+        Lazily yield words within both a length range and a syllable count range.
+
+        Results come ordered by whichever field's range matches fewer entries.
+        """
+        where = "s.word_length BETWEEN ? AND ? AND s.syllable_count BETWEEN ? AND ?"
+        params = (min_length, max_length, min_syllables, max_syllables)
+        if (self._count("s.word_length BETWEEN ? AND ?", params[:2])
+                <= self._count("s.syllable_count BETWEEN ? AND ?", params[2:])):
+            return self._iter_select(where, params, "s.word_length, s.id")
+        return self._iter_select(where, params, "s.syllable_count, s.id")
+
+    def search_by_syllables(self, syllable_count: int) -> List[Dict]:
+        """Get words with specific syllable count."""
+        return self._select("s.syllable_count = ?", (syllable_count,))
+
+    def search_by_part_of_speech(self, pos: str) -> List[Dict]:
+        """Get words of a specific part of speech."""
+        return self._select("s.part_of_speech = ?", (pos,))
+
+    def search_filter(self, query: str) -> List[Dict]:
+        """Get entries matching a filter such as 'difficulty:hard AND NOT pos:noun'."""
+        params = []
+        return self._select(_filter_sql(parse_filter(query), params), params)
+
+    def faceted_search(self, query: str,
+                       limit: Optional[int] = None) -> Tuple[List[Dict], Dict[str, Dict[str, int]]]:
+        """
+        Filter entries and count every facet value among the matches.
+
+        Args:
+            query: Filter of facet:value terms (difficulty, category, pos,
+                syllables, length) joined by AND, OR and NOT; '' matches all
+            limit: Maximum number of entries to return (counts cover every match)
+
+        Returns:
+            (matching entries in id order, {facet: {value: count}})
+        """
+        params = []
+        where = _filter_sql(parse_filter(query), params)
+        entries = self._select(where, params, limit=limit)
+
+        values = {
+            'difficulty': ("lower(s.difficulty)", "senses s"),
+            'category': ("lower(c.name)", "senses s JOIN sense_categories sc ON sc.sense_id = s.id "
+                                          "JOIN categories c ON c.id = sc.category_id"),
+            'pos': ("lower(s.part_of_speech)", "senses s"),
+            'syllables': (_bucket_label('s.syllable_count', SYLLABLE_BUCKETS), "senses s"),
+            'length': (_bucket_label('s.word_length', LENGTH_BUCKETS), "senses s"),
+        }
+        counts = {}
+        for facet, (value, tables) in values.items():
+            rows = self._execute(
+                f"SELECT {value} AS value, count(DISTINCT s.id) FROM {tables} WHERE {where} "
+                f"GROUP BY value HAVING value IS NOT NULL ORDER BY min(s.id)", params)
+            counts[facet] = dict(rows)
+        return entries, counts
+
+    def search_word(self, word: str) -> Dict:
+        """Find a specific word (its first sense), ignoring case."""
+        entries = self._select("s.word_id = (SELECT id FROM words WHERE headword = ?)",
+                               (normalize_word(word),), _SENSE_ORDER, 1)
+        return entries[0] if entries else None
+
+    def search_senses(self, word: str) -> List[Dict]:
+        """Get every sense of a word, ignoring case, ordered by definition number."""
+        return self._select("s.word_id = (SELECT id FROM words WHERE headword = ?)",
+                            (normalize_word(word),), _SENSE_ORDER)
+
+    def lookup_many(self, words: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Resolve many words at once; each maps to its senses ([] if not found).
+
+        Raises:
+            ValueError: If words is not a list of strings
+        """
+        self._check_words(words)
+        keys = list(dict.fromkeys(normalize_word(word) for word in words))
+        senses: Dict[str, List[Dict]] = {}
+        rows = self._execute(
+            f"SELECT w.headword, {_ENTRY_COLUMNS} FROM words w JOIN senses s ON s.word_id = w.id "
+            f"WHERE w.headword IN (SELECT value FROM json_each(?)) ORDER BY w.id, {_SENSE_ORDER}",
+            (json.dumps(keys),))
+        for row in rows:
+            senses.setdefault(row[0], []).append(_entry(row[1:]))
+        return {word: list(senses.get(normalize_word(word), [])) for word in words}
+
+    @property
+    def headwords(self) -> List[str]:
+        """Every normalized headword, sorted."""
+        return [key for key, in self._execute("SELECT headword FROM words ORDER BY headword")]
+
+    def search_fuzzy(self, word: str, max_distance: int = 2, limit: int = 10) -> List[Tuple[Dict, int]]:
+        """
+        Find the words closest to a possibly misspelled word.
+
+        Returns:
+            (entry, edit distance) pairs for words within max_distance, closest first
+        """
+        matches = self.fuzzy_index.lookup(normalize_word(word), max_distance, limit)
+        senses = self.lookup_many([key for key, _ in matches])
+        return [(senses[key][0], distance) for key, distance in matches]
+
+    def search_text(self, query: str, k: int = 10,
+                    boosts: Optional[Dict[str, float]] = None) -> List[Tuple[Dict, float]]:
+        """
+        Rank entries whose definition or example matches a query, using FTS5.
+
+        Args:
+            query: Words to match, plus any "quoted phrases" that must appear
+            k: Maximum number of results
+            boosts: Weight per field (default: definition 2.0, example 1.0)
+
+        Returns:
+            (entry, BM25 score) pairs, best first
+        """
+        boosts = DEFAULT_BOOSTS if boosts is None else boosts
+        phrases, terms = split_query(query)
+        if not phrases and not terms:
+            return []
+        # Every phrase and term adds to the score; only the phrases are required
+        scored = ' OR '.join([_fts_phrase(phrase) for phrase in phrases] + [_fts_phrase([term]) for term in terms])
+        rank = "bm25(senses_fts, ?, ?)"
+        params: List[Any] = [boosts.get('definition', 0.0), boosts.get('example', 0.0), scored]
+        where = "senses_fts MATCH ?"
+        if phrases:
+            where += " AND senses_fts.rowid IN (SELECT rowid FROM senses_fts WHERE senses_fts MATCH ?)"
+            params.append(' AND '.join(_fts_phrase(phrase) for phrase in phrases))
+        rows = self._execute(
+            f"SELECT senses_fts.rowid, -{rank} AS score FROM senses_fts WHERE {where} "
+            f"ORDER BY score DESC, senses_fts.rowid LIMIT ?", (*params, k)).fetchall()
+        entries = self._entries([entry_id for entry_id, _ in rows])
+        return [(entry, score) for entry, (_, score) in zip(entries, rows)]
+
+    def autocomplete(self, prefix: str, k: int = 10, difficulty: Optional[str] = None) -> List[str]:
+        """
+        Get up to k headwords starting with prefix (ignoring case), alphabetically.
+
+        Args:
+            prefix: What has been typed so far
+            k: Maximum number of completions
+            difficulty: Only complete words with a sense of this difficulty
+        """
+        key = prefix.lstrip().lower()
+        where = "w.headword >= ? AND w.headword < ?"
+        params: List[Any] = [key, key + '\U0010ffff']
+        if difficulty is not None:
+            where += " AND EXISTS (SELECT 1 FROM senses s WHERE s.word_id = w.id AND s.difficulty = ?)"
+            params.append(difficulty.lower())
+        rows = self._execute(
+            f"SELECT (SELECT s.word FROM senses s WHERE s.word_id = w.id ORDER BY {_SENSE_ORDER} LIMIT 1) "
+            f"FROM words w WHERE {where} ORDER BY w.headword LIMIT ?", (*params, k))
+        return [word for word, in rows]
+
+    def _sample_pool(self, difficulty: Optional[str], category: Optional[str]) -> Sequence[int]:
+        """Ids of the entries random_words draws from for a pair of filters."""
+        key = (difficulty and difficulty.lower(), category and category.lower())
+
+        def build() -> List[int]:
+            conditions = ['1']
+            params = []
+            if difficulty:
+                conditions.append("s.difficulty = ?")
+                params.append(key[0])
+            if category:
+                conditions.append(_IN_CATEGORY)
+                params.append(key[1])
+            rows = self._execute(
+                f"SELECT s.id FROM senses s WHERE {' AND '.join(conditions)} ORDER BY s.id", params)
+            return [entry_id for entry_id, in rows]
+        return self._sampling_cached(self._sample_pools, key, build)
+
+    def random_words(self, count: int = 10, difficulty: str = None, category: str = None,
+                     seed: Optional[int] = None,
+                     weights: Optional[Dict[str, Dict[str, float]]] = None) -> List[Dict]:
+        """
+        Get random words with optional filters; see VocabularyQuery.random_words.
+
+        Raises:
+            ValueError: If count or weights are malformed, or weights leave no
+                word a positive weight
+        """
+        self._check_sampling(count, weights)
+        rng = random if seed is None else random.Random(seed)
+        pool = self._sample_pool(difficulty, category)
+        if not pool:
+            return []
+        if weights:
+            sampled_ids = self._alias_table(difficulty, category, weights).sample(count, rng)
+        else:
+            sampled_ids = rng.sample(pool, min(count, len(pool)))
+        return self._entries(sampled_ids)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get comprehensive statistics about the vocabulary."""
+        execute = self.connection.execute
+        total_words, length_sum, syllable_sum = execute(
+            "SELECT count(*), coalesce(sum(word_length), 0), coalesce(sum(syllable_count), 0) FROM senses").fetchone()
+        return {
+            'total_words': total_words,
+            'difficulty_distribution': dict(execute(
+                "SELECT difficulty, count(*) FROM senses GROUP BY difficulty ORDER BY min(id)")),
+            'category_distribution': dict(execute(
+                "SELECT c.name, count(*) FROM sense_categories sc JOIN categories c ON c.id = sc.category_id "
+                "GROUP BY c.id ORDER BY min(sc.sense_id)")),
+            'part_of_speech_distribution': dict(execute(
+                "SELECT part_of_speech, count(*) FROM senses GROUP BY part_of_speech ORDER BY min(id)")),
+            'average_word_length': length_sum / total_words if total_words else 0.0,
+            'average_syllables': syllable_sum / total_words if total_words else 0.0
+        }
+
+    def _entries_changed(self) -> None:
+        """Drop caches derived from the entries; they are rebuilt on next use."""
+        super()._entries_changed()
+        self._fuzzy_index = None
+
+    def _check_id(self, entry_id: int) -> None:
+        if self._execute("SELECT 1 FROM senses WHERE id = ?", (entry_id,)).fetchone() is None:
+            raise IndexError(f"No entry with id {entry_id}")
+
+    def add_entry(self, entry: Dict) -> int:
+        """
+        Add a categorized entry.
+
+        Returns:
+            The new entry's id
+
+        Raises:
+            ValueError: If the entry lacks a field that is not optional
+        """
+        entry_id = load_entries(self.connection, [entry])[0]
+        self._entries_changed()
+        return entry_id
+
+    def remove_entry(self, entry_id: int) -> Dict:
+        """
+        Remove an entry; every other id stays the same.
+
+        Returns:
+            The removed entry's fields
+        """
+        self._check_id(entry_id)
+        removed = self._entries([entry_id])[0]
+        with self.connection:
+            _delete_entry(self.connection, entry_id)
+        self._entries_changed()
+        return removed
+
+    def update_entry(self, entry_id: int, entry: Dict) -> None:
+        """Replace the entry with this id."""
+        self._check_id(entry_id)
+        with self.connection:
+            _delete_entry(self.connection, entry_id)
+            _insert_entries(self.connection, [(entry_id, entry)])
+        self._entries_changed()
+
+
+def main():
+    """Load the categorized vocabulary JSON into a new SQLite database."""
+    arg_parser = argparse.ArgumentParser(description="Build an SQLite database of SAT vocabulary.")
+    arg_parser.add_argument('--vocab-file', default='sat_vocabulary_categorized.json',
+                            help="Categorized vocabulary to load")
+    arg_parser.add_argument('-o', '--output', default='sat_vocabulary.db', help="Database file to write")
+    arg_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Entries per insert batch")
+    args = arg_parser.parse_args()
+
+    try:
+        with open(args.vocab_file, 'r', encoding='utf-8') as f:
+            vocabulary = json.load(f)
+        create_database(args.output, vocabulary, args.batch_size)
+        print(f"Loaded {len(vocabulary)} entries into {args.output}")
+    except FileNotFoundError:
+        print(f"Error: {args.vocab_file} not found.")
+    except json.JSONDecodeError as e:
+        print(f"Error parsing {args.vocab_file}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Incremental Vocabulary Statistics
+
+Running counts and sums behind VocabularyQuery.get_statistics. Entries are
+added and removed one at a time, so statistics stay current as the
+vocabulary changes without rescanning it, and the counters of separate
+shards can be merged into statistics for the whole dataset.
+"""
+
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict, Iterable, Sequence
+
+
+class VocabularyStats:
+    def __init__(self, entries: Iterable[Dict] = ()):
+        """
+        Args:
+            entries: Categorized vocabulary entries to count
+        """
+        self.total_words = 0
+        self.difficulty_counts = Counter()
+        self.category_counts = Counter()
+        self.pos_counts = Counter()
+        self.word_length_sum = 0
+        self.syllable_sum = 0
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def from_columns(cls, difficulties: Sequence[str], categories: Sequence[Sequence[str]],
+                     parts_of_speech: Sequence[str], word_lengths: Sequence[int],
+                     syllable_counts: Sequence[int]) -> 'VocabularyStats':
+        """Count a whole vocabulary given as one sequence per field, in bulk."""
+        stats = cls()
+        stats.total_words = len(difficulties)
+        stats.difficulty_counts = Counter(difficulties)
+        stats.category_counts = Counter(chain.from_iterable(categories))
+        stats.pos_counts = Counter(parts_of_speech)
+        stats.word_length_sum = sum(word_lengths)
+        stats.syllable_sum = sum(syllable_counts)
+        return stats
+
+    def to_state(self) -> Dict[str, Any]:
+        """Counts and sums as JSON-serializable data, for from_state()."""
+        return {
+            'total_words': self.total_words,
+            'difficulty_counts': dict(self.difficulty_counts),
+            'category_counts': dict(self.category_counts),
+            'pos_counts': dict(self.pos_counts),
+            'word_length_sum': self.word_length_sum,
+            'syllable_sum': self.syllable_sum,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'VocabularyStats':
+        """Statistics saved by to_state()."""
+        stats = cls()
+        stats.total_words = state['total_words']
+        stats.difficulty_counts = Counter(state['difficulty_counts'])
+        stats.category_counts = Counter(state['category_counts'])
+        stats.pos_counts = Counter(state['pos_counts'])
+        stats.word_length_sum = state['word_length_sum']
+        stats.syllable_sum = state['syllable_sum']
+        return stats
+
+    def add(self, entry: Dict) -> None:
+        """Count one entry."""
+        self.total_words += 1
+        self.difficulty_counts[entry['difficulty']] += 1
+        for category in entry['categories']:
+            self.category_counts[category] += 1
+        self.pos_counts[entry['part_of_speech']] += 1
+        self.word_length_sum += entry['word_length']
+        self.syllable_sum += entry['syllable_count']
+
+    def remove(self, entry: Dict) -> None:
+        """Uncount an entry previously added; values no entry has any more are dropped."""
+        self.total_words -= 1
+        _decrement(self.difficulty_counts, entry['difficulty'])
+        for category in entry['categories']:
+            _decrement(self.category_counts, category)
+        _decrement(self.pos_counts, entry['part_of_speech'])
+        self.word_length_sum -= entry['word_length']
+        self.syllable_sum -= entry['syllable_count']
+
+    def merge(self, other: 'VocabularyStats') -> 'VocabularyStats':
+        """Add another shard's counts to these, returning self."""
+        self.total_words += other.total_words
+        self.difficulty_counts.update(other.difficulty_counts)
+        self.category_counts.update(other.category_counts)
+        self.pos_counts.update(other.pos_counts)
+        self.word_length_sum += other.word_length_sum
+        self.syllable_sum += other.syllable_sum
+        return self
+
+    def __add__(self, other: 'VocabularyStats') -> 'VocabularyStats':
+        return VocabularyStats().merge(self).merge(other)
+
+    def summary(self) -> Dict[str, Any]:
+        """Statistics in the shape returned by VocabularyQuery.get_statistics."""
+        total_words = self.total_words
+        return {
+            'total_words': total_words,
+            'difficulty_distribution': dict(self.difficulty_counts),
+            'category_distribution': dict(self.category_counts),
+            'part_of_speech_distribution': dict(self.pos_counts),
+            'average_word_length': self.word_length_sum / total_words if total_words else 0.0,
+            'average_syllables': self.syllable_sum / total_words if total_words else 0.0
+        }
+
+
+def _decrement(counts: Counter, key: str) -> None:
+    if counts[key] <= 1:
+        del counts[key]
+    else:
+        counts[key] -= 1
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Streaming Page Reader for extracted_text.json
+
+Decodes the page array incrementally so that only one page (plus a read
+buffer) is held in memory at a time, instead of the whole corpus, and offers
+a JSON array writer so results can be written out as they are produced.
+"""
+
+import json
+from typing import Any, Dict, IO, Iterable, Iterator, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_pages(input_file: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield page dicts ({'page': ..., 'text': ...}) from a JSON array file.
+
+    Args:
+        input_file: Path to the extracted text JSON file
+        chunk_size: Number of characters read from disk at a time
+
+    Raises:
+        json.JSONDecodeError: If the file is not a JSON array of objects
+    """
+    decoder = json.JSONDecoder()
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        buffer = ''
+        index = 0
+        eof = False
+        expect = '['
+
+        while True:
+            # Skip whitespace and the separators between array items
+            while index < len(buffer) and buffer[index] in _WHITESPACE:
+                index += 1
+
+            if index >= len(buffer):
+                if eof:
+                    raise json.JSONDecodeError("Unterminated page array", buffer, index)
+                buffer = f.read(chunk_size)
+                index = 0
+                eof = not buffer
+                continue
+
+            char = buffer[index]
+            if expect == '[':
+                if char != '[':
+                    raise json.JSONDecodeError("Expected a page array", buffer, index)
+                index += 1
+                expect = 'item'
+                continue
+
+            if char == ']' and expect in ('item', 'separator'):
+                return
+            if expect == 'separator':
+                if char != ',':
+                    raise json.JSONDecodeError("Expected ',' between pages", buffer, index)
+                index += 1
+                expect = 'page'
+                continue
+
+            try:
+                page, end = decoder.raw_decode(buffer, index)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The page is split across reads; grow the buffer geometrically
+                # so a large page is decoded in amortized linear time.
+                more = f.read(max(chunk_size, len(buffer) - index))
+                eof = not more
+                buffer = buffer[index:] + more
+                index = 0
+                continue
+
+            if not isinstance(page, dict):
+                raise json.JSONDecodeError("Expected a page object", buffer, index)
+
+            # Drop the decoded page from the buffer before handing it out
+            buffer = buffer[end:]
+            index = 0
+            expect = 'separator'
+            yield page
+
+
+def iter_page_lines(pages: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_number, line) for every line of every page, in order.
+
+    Equivalent to splitting the newline-joined text of all pages, without
+    ever building that combined string.
+    """
+    for page_data in pages:
+        page_number = page_data.get('page', 0)
+        for line in page_data.get('text', '').split('\n'):
+            yield page_number, line
+
+
+class JsonArrayWriter:
+    """
+    Write a JSON array one item at a time.
+
+    The output matches ``json.dump(items, f, indent=2, ensure_ascii=False)``
+    for an array written at the top level or nested ``depth`` levels deep.
+    """
+
+    def __init__(self, f: IO[str], indent: int = 2, depth: int = 0):
+        self.f = f
+        self.indent = indent
+        self.depth = depth
+        self.count = 0
+
+    def write(self, item: Any) -> None:
+        item_prefix = '\n' + ' ' * (self.indent * (self.depth + 1))
+        encoded = json.dumps(item, indent=self.indent, ensure_ascii=False)
+        self.f.write(('[' if self.count == 0 else ',') + item_prefix)
+        self.f.write(encoded.replace('\n', item_prefix))
+        self.count += 1
+
+    def close(self) -> None:
+        if self.count == 0:
+            self.f.write('[]')
+        else:
+            self.f.write('\n' + ' ' * (self.indent * self.depth) + ']')
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Shared Text Utilities
+
+Small, dependency-free helpers for comparing words across modules. Kept apart
+from the categorizer so that search and other lightweight tools can stem
+tokens without importing the whole categorization pipeline.
+"""
+
+_STEM_SUFFIXES = ('ing', 'ed', 'es', 's')
+
+
+def stem_token(token: str) -> str:
+    """
+    Reduce a lowercase word to a crude stem so inflected forms compare equal
+    (move/moves/moved/moving -> mov, running -> run).
+    """
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    for suffix in _STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == 's' and token.endswith(('ss', 'us', 'is')):
+                break
+            token = token[:-len(suffix)]
+            # Undo a doubled final consonant (running -> runn -> run)
+            if suffix in ('ing', 'ed') and token[-1] == token[-2] and token[-1] not in 'aeiouls':
+                token = token[:-1]
+            break
+    if len(token) > 3 and token.endswith('e'):
+        token = token[:-1]
+    return token
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Vocabulary Entry Tokenizer
+
+Shared by the extracted_text.json parsers. A page is walked once from left to
+right and raw vocabulary records are emitted in the same order, and with the
+same boundaries, as the original pattern
+
+    \\n([a-z]+)\\s*\\n\\s*(\\([^)]+\\))\\s*\\n\\s*([^(]+?)\\s*(\\([^)]{20,}\\))
+
+but without regex backtracking, so malformed PDF text can never make a page
+cost more than O(n). Well-formed entries are read by one compiled pattern whose
+groups cannot backtrack; around any header that is not a complete entry, a
+single-pass state machine takes over until it is past the text the pattern
+scanned. Cleaning and validation are left to the calling parser.
+"""
+
+import re
+from typing import Generator, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+
+class RawEntry(NamedTuple):
+    """An unvalidated vocabulary record as it appears in the page text."""
+    word: str
+    part_of_speech: str
+    definition: str
+    example: str
+    page: int
+    start: int  # index of the newline before the headword
+    end: int    # index just past the example's closing parenthesis
+
+
+# Each (?=(...))\N pair below matches its group atomically: a failed attempt is
+# never retried with a shorter headword, whitespace run or parenthetical, so
+# every search stays linear.
+_HEADWORD = r'[A-Za-z]+'
+_MULTIWORD_HEADWORD = r'[A-Za-z]+(?:[ \t][A-Za-z]+)*'
+# A headword line, then whitespace holding a line break, before the part of speech's "("
+_HEADER_LINE = r'\n(?=({headword}))\1(?=([^\S\n]*\n\s*))\2(?=\()'
+_HEADER = _HEADER_LINE + r'\('
+# The rest of a complete entry, if there is one: part of speech, definition and
+# example. A line break must come before any definition text, and must not be
+# the last character before the example when there is no definition.
+_ENTRY = _HEADER_LINE + r'(?:(?=(\([^)]+\)))\3(?=[^\S\n]*\n(?!\())(?=([^(]*))\4(?=(\([^)]*\)))\5)?'
+
+_HEADERS = {False: re.compile(_HEADER.format(headword=_HEADWORD)),
+            True: re.compile(_HEADER.format(headword=_MULTIWORD_HEADWORD))}
+_ENTRIES = {False: re.compile(_ENTRY.format(headword=_HEADWORD)),
+            True: re.compile(_ENTRY.format(headword=_MULTIWORD_HEADWORD))}
+
+
+class _ForwardFinder:
+    """
+    Memoized ``str.find`` for a single character.
+
+    The tokenizer only ever queries in non-decreasing order, so a previous hit
+    that is still ahead of the query is reused and no character is scanned twice.
+    """
+
+    def __init__(self, text: str, char: str):
+        self.text = text
+        self.char = char
+        self.query = -1
+        self.hit = -1
+
+    def find(self, start: int) -> int:
+        if self.query != -1 and self.query <= start and (self.hit == -1 or start <= self.hit):
+            self.query = start
+            return self.hit
+        self.query = start
+        self.hit = self.text.find(self.char, start)
+        return self.hit
+
+
+def _next_header(text: str, start: int, header) -> Optional[Tuple[int, int, int]]:
+    """
+    Find the first header (see _HEADER) whose newline is at or after ``start``.
+
+    Returns:
+        (newline, word_end, pos_start) or None if there is no further header
+    """
+    match = header.search(text, start)
+    if match is None:
+        return None
+    return match.start(), match.end(1), match.end() - 1
+
+
+def tokenize_page(text: str, page: int = 0, min_example_length: int = 20,
+                  multiword: bool = False) -> Iterator[RawEntry]:
+    """
+    Yield raw vocabulary records from one page of extracted text.
+
+    Args:
+        text: The page text
+        page: Page number attached to every record
+        min_example_length: Minimum characters inside the example parentheses
+        multiword: Accept headwords made of several space-separated words
+
+    Yields:
+        RawEntry tuples in page order
+    """
+    entry_pattern = _ENTRIES[multiword]
+    # Example lengths below count its parentheses
+    min_example_span = min_example_length + 2
+    position = 0
+    while position is not None:
+        for match in entry_pattern.finditer(text, position):
+            word, _, part_of_speech, between, example = match.groups()
+            if example is None or len(example) < min_example_span:
+                # Not a complete entry. The state machine reads on past everything
+                # the failed match scanned, so no text is scanned twice.
+                position = yield from _tokenize_span(text, match.start(), _scan_end(text, match.end(2)),
+                                                     page, min_example_length, _HEADERS[multiword])
+                break
+            start, end = match.span()
+            yield RawEntry(word, part_of_speech, between.strip(), example, page, start, end)
+        else:
+            return
+
+
+def _scan_end(text: str, pos_start: int) -> int:
+    """How far an _ENTRY match whose part of speech opens at pos_start can scan."""
+    end = pos_start
+    for char in ')()':
+        end = text.find(char, end + 1)
+        if end == -1:
+            return len(text)
+    return end
+
+
+def _tokenize_span(text: str, start: int, stop: int, page: int, min_example_length: int,
+                   header_pattern) -> Generator[RawEntry, None, Optional[int]]:
+    """
+    The tokenize_page state machine, from the first header at or after ``start``.
+
+    Returns:
+        The newline of the first header at or after ``stop``, where reading can
+        go on, or None if the page has no further entries
+    """
+    open_finder = _ForwardFinder(text, '(')
+    close_finder = _ForwardFinder(text, ')')
+
+    # The tail of an entry (definition and example) only depends on where the
+    # part of speech closes, so remember the last evaluation.
+    tail_key = -1
+    tail: Optional[Tuple[str, int, int]] = None
+
+    header = _next_header(text, start, header_pattern)
+    while header is not None:
+        newline, word_end, pos_start = header
+        if newline >= stop:
+            return newline
+        word_start = newline + 1
+
+        if pos_start < tail_key:
+            # Opened inside the previous part of speech, so it closes there too
+            pos_end = tail_key
+        else:
+            pos_end = close_finder.find(pos_start + 1)
+            if pos_end == -1:
+                # No closing parenthesis anywhere ahead, so nothing else can match
+                return None
+            if pos_end == pos_start + 1:
+                # An empty "()" is not a part of speech
+                header = _next_header(text, word_start, header_pattern)
+                continue
+
+        if pos_end != tail_key:
+            tail_key = pos_end
+            tail = _read_tail(text, pos_end, open_finder, close_finder,
+                              min_example_length)
+        if tail is None:
+            header = _next_header(text, word_start, header_pattern)
+            continue
+
+        definition, example_start, example_end = tail
+        yield RawEntry(
+            word=text[word_start:word_end],
+            part_of_speech=text[pos_start:pos_end + 1],
+            definition=definition,
+            example=text[example_start:example_end + 1],
+            page=page,
+            start=newline,
+            end=example_end + 1
+        )
+        header = _next_header(text, example_end + 1, header_pattern)
+
+
+def _read_tail(text: str, pos_end: int, open_finder: _ForwardFinder,
+               close_finder: _ForwardFinder,
+               min_example_length: int) -> Optional[Tuple[str, int, int]]:
+    """
+    Read the definition and example that follow a closed part of speech.
+
+    Returns:
+        (definition, example_start, example_end) or None if the entry is incomplete
+    """
+    example_start = open_finder.find(pos_end + 1)
+    if example_start == -1:
+        return None
+
+    between = text[pos_end + 1:example_start]
+    definition = between.strip()
+    if definition:
+        # The part of speech has to be followed by a line break
+        leading = between[:len(between) - len(between.lstrip())]
+        if '\n' not in leading:
+            return None
+    elif '\n' not in between[:-1]:
+        return None
+
+    example_end = close_finder.find(example_start + 1)
+    if example_end == -1 or example_end - example_start - 1 < min_example_length:
+        return None
+
+    return definition, example_start, example_end
+
+
+def tokenize_pages(pages: Iterable[dict], min_example_length: int = 20,
+                   multiword: bool = False) -> Iterator[RawEntry]:
+    """Yield raw records for every page dict ({'page': ..., 'text': ...})."""
+    for page_data in pages:
+        yield from tokenize_page(page_data.get('text', ''), page_data.get('page', 0),
+                                 min_example_length, multiword)
+
+
+def iter_headers(text: str, multiword: bool = False) -> Iterator[Tuple[str, str, int, int]]:
+    """
+    Yield (word, part_of_speech, start, end) for every headword line and the
+    parenthesized part of speech that follows it.
+
+    ``start`` is the index of the newline before the headword and ``end`` the
+    index just past the closing parenthesis, so the text between consecutive
+    headers is the body of an entry.
+    """
+    header_pattern = _HEADERS[multiword]
+    close_finder = _ForwardFinder(text, ')')
+
+    header = _next_header(text, 0, header_pattern)
+    while header is not None:
+        newline, word_end, pos_start = header
+        pos_end = close_finder.find(pos_start + 1)
+        if pos_end == -1:
+            return
+        if pos_end == pos_start + 1:
+            header = _next_header(text, newline + 1, header_pattern)
+            continue
+
+        yield text[newline + 1:word_end], text[pos_start:pos_end + 1], newline, pos_end + 1
+        header = _next_header(text, pos_end + 1, header_pattern)
+
+
+def iter_parentheticals(text: str, min_length: int = 1) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) spans of parenthesized text holding at least
+    ``min_length`` characters, scanning left to right without overlap.
+    """
+    close_finder = _ForwardFinder(text, ')')
+
+    start = text.find('(')
+    while start != -1:
+        end = close_finder.find(start + 1)
+        if end == -1:
+            return
+        if end - start - 1 >= min_length:
+            yield start, end + 1
+            start = text.find('(', end + 1)
+        else:
+            start = text.find('(', start + 1)